@@ -1,81 +1,150 @@
 from Sampling.KFoldCrossValidation import KFoldCrossValidation
 
 from NGram.NGram import NGram
+from NGram.NGramCounter import NGramCounter
 from NGram.TrainedSmoothing import TrainedSmoothing
 import math
 
+import numpy
+
 
 class AdditiveSmoothing(TrainedSmoothing):
 
     __delta: float
 
-    def __learnBestDelta(self,
-                         nGrams: list,
-                         kFoldCrossValidation: KFoldCrossValidation,
-                         lowerBound: float) -> float:
+    def __perplexity(self,
+                     statistics: tuple,
+                     pseudoCount: float) -> float:
+        """
+        Calculates the perplexity of a test fold for the given pseudocount, from the counts of its N-Grams and the
+        child sums of their contexts. The probabilities are the ones NGram.setProbabilityWithPseudoCount sets.
+
+        PARAMETERS
+        ----------
+        statistics : tuple
+            counts, child sums, whether each context is missing, and the vocabulary size of the fold model.
+        pseudoCount : float
+            pseudocount added to all N-Grams.
+
+        RETURNS
+        -------
+        float
+            perplexity of the test fold.
+        """
+        counts, child_sums, unseen, vocabulary_size = statistics
+        if pseudoCount != 0:
+            vocabulary_size = vocabulary_size + 1
+            probability_of_unseen = 1.0 / vocabulary_size
+        else:
+            probability_of_unseen = 0.0
+        probabilities = (counts + pseudoCount) / (child_sums + pseudoCount * vocabulary_size)
+        probabilities[unseen] = probability_of_unseen
+        with numpy.errstate(divide="ignore"):
+            return math.exp(-float(numpy.log(probabilities).sum()) / len(probabilities))
+
+    def getFoldPerplexity(self,
+                          statistics: list,
+                          parameters: list) -> float:
         """
-        The algorithm tries to optimize the best delta for a given corpus. The algorithm uses perplexity on the
-        validation set as the optimization criterion.
+        Calculates the sum of the perplexities of the test folds for the given delta.
 
         PARAMETERS
         ----------
-        nGrams : list
-            10 N-Grams learned for different folds of the corpus. nGrams[i] is the N-Gram trained with i'th train fold
-            of the corpus.
-        kFoldCrossValidation: KFoldCrossValidation
-            Cross-validation data used in training and testing the N-grams.
-        lowerBound : float
-            Initial lower bound for optimizing the best delta.
+        statistics : list
+            count statistics of the test folds, see getFoldStatistics.
+        parameters : list
+            delta, the pseudocount added to all N-Grams.
 
         RETURNS
         -------
         float
-            Best delta optimized with k-fold crossvalidation.
-        """
-        best_previous = -1
-        upper_bound = 1
-        best_delta = (lowerBound + upper_bound) / 2
-        number_of_parts = 5
-        while True:
-            best_perplexity = 100000000
-            value = lowerBound
-            while value <= upper_bound:
-                perplexity = 0
-                for i in range(0, 10):
-                    nGrams[i].setProbabilityWithPseudoCount(value, nGrams[i].getN())
-                    perplexity += nGrams[i].getPerplexity(kFoldCrossValidation.getTestFold(i))
-                if perplexity < best_perplexity:
-                    best_perplexity = perplexity
-                    best_delta = value
-                value += (upper_bound - lowerBound) / number_of_parts
-            lowerBound = self.newLowerBound(best_delta, lowerBound, upper_bound, number_of_parts)
-            upper_bound = self.newUpperBound(best_delta, lowerBound, upper_bound, number_of_parts)
-            if best_previous != -1:
-                if math.fabs(best_previous - best_perplexity) / best_perplexity < 0.001:
-                    break
-            best_previous = best_perplexity
-        return best_delta
+            sum of the perplexities of the test folds.
+        """
+        perplexity = 0
+        for fold_statistics in statistics:
+            perplexity += self.__perplexity(fold_statistics, parameters[0])
+        return perplexity
+
+    def sampleFoldStatistics(self,
+                             statistics: tuple,
+                             fraction: float,
+                             generator: numpy.random.Generator) -> tuple:
+        """
+        Gets the count statistics of a random sample of the N-Grams of a test fold.
+
+        PARAMETERS
+        ----------
+        statistics : tuple
+            count statistics of the test fold, see getFoldStatistics.
+        fraction : float
+            fraction of the N-Grams in the sample.
+        generator : numpy.random.Generator
+            random number generator.
+
+        RETURNS
+        -------
+        tuple
+            count statistics of the sampled N-Grams, at least one.
+        """
+        counts, child_sums, unseen, vocabulary_size = statistics
+        size = max(1, round(fraction * len(counts)))
+        rows = numpy.sort(generator.choice(len(counts), size, replace=False))
+        return counts[rows], child_sums[rows], unseen[rows], vocabulary_size
 
     def learnParameters(self,
                         corpus: list,
                         N: int):
         """
         Wrapper function to learn the parameter (delta) in additive smoothing. The function first creates K NGrams
-        with the train folds of the corpus. Then optimizes delta with respect to the test folds of the corpus.
+        with the train folds of the corpus, counted with countTrainFolds, and finds the count statistics of their test
+        folds with learnFoldStatistics. Then optimizes delta with respect to the test folds of the corpus, with
+        optimizeParameters. If a parameter cache is set with setParameterCache and delta is already learned from the
+        same corpus, it is read from the cache.
 
         PARAMETERS
         ----------
-        corpus : list
-            Train corpus used to optimize delta parameter
+        corpus
+            Train corpus, a list or any other iterable of sentences, used to optimize delta parameter
         N : int
             N in N-Gram.
         """
         K = 10
-        n_grams = []
+        # KFoldCrossValidation shuffles the sentences in place, the caller's list is left unchanged.
+        corpus = list(corpus)
+        cached = self.getCachedParameters(corpus, N)
+        if cached is not None:
+            (self.__delta,) = cached
+            return
         k_fold_cross_validation = KFoldCrossValidation(corpus, K, 0)
-        for i in range(K):
-            n_grams.append(NGram(N, k_fold_cross_validation.getTrainFold(i)))
-        self.__delta = self.__learnBestDelta(n_grams, k_fold_cross_validation, 0.1)
+        (self.__delta,) = self.optimizeParameters(self.learnFoldStatistics(k_fold_cross_validation, K, N), [0.1], [1])
+        self.cacheParameters(N, [self.__delta])
+
+    def getFoldStatistics(self,
+                          trainCounter: NGramCounter,
+                          testFold: list,
+                          N: int) -> tuple:
+        """
+        Builds the N-Gram of a train fold and gets the count statistics of the N-Grams of the test fold, from which
+        their probabilities are found for any pseudocount.
+
+        PARAMETERS
+        ----------
+        trainCounter : NGramCounter
+            N-Gram counts of the train fold.
+        testFold : list
+            sentences of the test fold.
+        N : int
+            N in N-Gram.
+
+        RETURNS
+        -------
+        tuple
+            counts, child sums, whether each context is missing, and the vocabulary size of the train fold N-Gram.
+        """
+        n_gram = NGram(N)
+        n_gram.addNGramCounter(trainCounter)
+        counts, child_sums = n_gram.getCountStatistics(testFold)
+        return counts, child_sums, numpy.isnan(child_sums), n_gram.vocabularySize()
 
     def setProbabilities(self,
                          nGram: NGram,
@@ -94,6 +163,23 @@ class AdditiveSmoothing(TrainedSmoothing):
         """
         nGram.setProbabilityWithPseudoCount(self.__delta, level)
 
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Wrapper function to set the N-gram probabilities of the given levels with additive smoothing, in a single
+        traversal of the N-Gram.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        nGram.setProbabilityWithPseudoCounts([self.__delta if level in levels else None
+                                              for level in range(1, nGram.getN() + 1)])
+
     def getDelta(self) -> float:
         """
         Gets the best delta.
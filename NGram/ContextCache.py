@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+
+class ContextCache:
+
+    __entries: OrderedDict
+    __maximum_size: int
+    __hits: int
+    __misses: int
+
+    def __init__(self, maximumSize: int):
+        """
+        Constructor of ContextCache. A context cache maps the contexts of N-Gram queries, tuples of vocabulary
+        indexes, to the nodes of the N-Gram tree they resolve to. When the number of contexts exceeds the maximum
+        size, the least recently used context is evicted.
+
+        PARAMETERS
+        ----------
+        maximumSize : int
+            maximum number of contexts kept in the cache.
+        """
+        self.__entries = OrderedDict()
+        self.__maximum_size = maximumSize
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, context: tuple, default=None):
+        """
+        Gets the node of the given context and marks the context as the most recently used one. Hits and misses are
+        counted.
+
+        PARAMETERS
+        ----------
+        context : tuple
+            vocabulary indexes of the context.
+        default
+            value returned if the context is not in the cache.
+
+        RETURNS
+        -------
+        object
+            node of the context, default if the context is not in the cache.
+        """
+        entries = self.__entries
+        if context in entries:
+            entries.move_to_end(context)
+            self.__hits = self.__hits + 1
+            return entries[context]
+        self.__misses = self.__misses + 1
+        return default
+
+    def put(self, context: tuple, node):
+        """
+        Adds the node of the given context to the cache, evicting the least recently used context if the cache is
+        full.
+
+        PARAMETERS
+        ----------
+        context : tuple
+            vocabulary indexes of the context.
+        node
+            node the context resolves to, None if the context is not in the tree.
+        """
+        self.__entries[context] = node
+        if len(self.__entries) > self.__maximum_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all contexts from the cache. The hit and miss counters are kept.
+        """
+        self.__entries.clear()
+
+    def size(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of contexts in the cache.
+        """
+        return len(self.__entries)
+
+    def getMaximumSize(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            maximum number of contexts kept in the cache.
+        """
+        return self.__maximum_size
+
+    def getHits(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of lookups that found their context in the cache.
+        """
+        return self.__hits
+
+    def getMisses(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of lookups that did not find their context in the cache.
+        """
+        return self.__misses
@@ -0,0 +1,33 @@
+class CorpusFile:
+
+    __file_name: str
+    __encoding: str
+
+    def __init__(self,
+                 fileName: str,
+                 encoding: str = "utf-8"):
+        """
+        Constructor of CorpusFile class. A CorpusFile is an iterable over the sentences of a text file, one sentence
+        per line with the words separated by whitespace. The file is read line by line each time the corpus is
+        iterated, so a corpus file can be used wherever a list of sentences is expected, such as NGram constructor
+        or getPerplexity, without keeping the sentences in memory.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the corpus file.
+        encoding : str
+            Encoding of the corpus file.
+        """
+        self.__file_name = fileName
+        self.__encoding = encoding
+
+    def __iter__(self):
+        """
+        Reads the corpus file line by line and yields the words of each non-empty line.
+        """
+        with open(self.__file_name, mode="r", encoding=self.__encoding) as input_file:
+            for line in input_file:
+                words = line.split()
+                if len(words) > 0:
+                    yield words
@@ -0,0 +1,96 @@
+import math
+
+import numpy
+
+from NGram.ParameterOptimizer import ParameterOptimizer
+
+
+class EMOptimizer(ParameterOptimizer):
+
+    __maximum_iterations: int
+
+    def __init__(self, maximumIterations: int = 100):
+        """
+        Constructor of EMOptimizer. The optimizer learns interpolation weights with deleted interpolation, that is
+        with the expectation maximization algorithm for mixture weights: each N-Gram of the test folds is assigned to
+        the orders in proportion to their weighted probabilities, and each weight is set to the average share of its
+        order. The optimizer can only be used with InterpolatedSmoothing, whose fold statistics are the component
+        probabilities of the N-Grams, TrainedSmoothing.setOptimizer rejects it for other smoothing methods.
+
+        PARAMETERS
+        ----------
+        maximumIterations : int
+            maximum number of iterations.
+        """
+        super().__init__()
+        self.__maximum_iterations = maximumIterations
+
+    def canOptimize(self, smoothing) -> bool:
+        """
+        Checks if the fold statistics of the given smoothing method are component probabilities, which the
+        interpolation weights are learned from.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+
+        RETURNS
+        -------
+        bool
+            True if the smoothing method interpolates its components.
+        """
+        return smoothing.hasComponentProbabilities()
+
+    def optimize(self,
+                 smoothing,
+                 statistics: list,
+                 lowerBounds: list,
+                 upperBounds: list,
+                 sampledStatistics: list = None) -> list:
+        """
+        Learns the interpolation weights that maximize the likelihood of the test folds, starting with equal weights
+        for all orders. The perplexity of the weights of each iteration is evaluated, and the iterations stop when the
+        sum of the perplexities of the test folds improves by less than 0.1 percent. The bounds are only used for the
+        number of weights, since the weights found by the algorithm are always feasible. If statistics of samples of
+        the test folds are given, the first iterations use the samples, and the iterations continue on the whole test
+        folds once the improvement on the samples is less than 0.1 percent.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+        statistics : list
+            component probabilities of the test folds, see NGram.getComponentProbabilities.
+        lowerBounds : list
+            lower bounds of the interpolation weights, except the weight of the unigrams.
+        upperBounds : list
+            upper bounds of the interpolation weights, except the weight of the unigrams.
+        sampledStatistics : list
+            optional component probabilities of random samples of the test folds.
+
+        RETURNS
+        -------
+        list
+            interpolation weights, except the weight of the unigrams.
+        """
+        current_statistics = statistics if sampledStatistics is None else sampledStatistics
+        components = numpy.concatenate(current_statistics)
+        weights = numpy.full(components.shape[1], 1.0 / components.shape[1])
+        best_previous = -1
+        for iteration in range(self.__maximum_iterations):
+            perplexity = self.evaluate(smoothing, current_statistics, weights[:-1].tolist(),
+                                       current_statistics is not statistics)
+            if best_previous != -1 and math.fabs(best_previous - perplexity) / perplexity < 0.001:
+                if current_statistics is statistics:
+                    break
+                current_statistics = statistics
+                components = numpy.concatenate(statistics)
+                best_previous = -1
+            else:
+                best_previous = perplexity
+            weighted = components * weights
+            probabilities = weighted.sum(axis=1)
+            seen = probabilities > 0
+            weights = (weighted[seen] / probabilities[seen, None]).mean(axis=0)
+        return weights[:-1].tolist()
@@ -0,0 +1,539 @@
+from __future__ import annotations
+
+import bisect
+import numpy
+
+from NGram.NGramNode import NGramNode
+
+
+class FrozenNGramTree:
+
+    UNKNOWN = -2
+
+    __symbols: list
+    __counts: list
+    __probabilities: list
+    __probabilities_of_unseen: list
+    __child_starts: list
+    __symbol_views: list
+    __child_start_views: list
+    __keys: list
+    __key_stride: int
+
+    def constructor1(self, rootNode: NGramNode):
+        self.__symbols = []
+        self.__counts = []
+        self.__probabilities = []
+        self.__probabilities_of_unseen = []
+        self.__child_starts = []
+        level_nodes = [rootNode]
+        level_symbols = [-1]
+        while len(level_nodes) > 0:
+            self.__symbols.append(numpy.array(level_symbols, dtype=numpy.int32))
+            self.__counts.append(numpy.array([node.getCount() for node in level_nodes], dtype=numpy.int64))
+            self.__probabilities.append(numpy.array([node.getProbability() for node in level_nodes],
+                                                    dtype=numpy.float64))
+            self.__probabilities_of_unseen.append(numpy.array([node.getProbabilityOfUnseen() for node in level_nodes],
+                                                              dtype=numpy.float64))
+            next_nodes = []
+            next_symbols = []
+            starts = [0]
+            for node in level_nodes:
+                unknown = node.getUnknown()
+                if unknown is not None:
+                    next_nodes.append(unknown)
+                    next_symbols.append(FrozenNGramTree.UNKNOWN)
+                for child in node.getChildren():
+                    next_nodes.append(child)
+                    next_symbols.append(child.getSymbol())
+                starts.append(len(next_nodes))
+            if len(next_nodes) > 0:
+                self.__child_starts.append(numpy.array(starts, dtype=numpy.int64))
+            level_nodes = next_nodes
+            level_symbols = next_symbols
+        self.__createViews()
+
+    def constructor2(self, levels: list):
+        self.__symbols = [level[0] for level in levels]
+        self.__counts = [level[1] for level in levels]
+        self.__probabilities = [level[2] for level in levels]
+        self.__probabilities_of_unseen = [level[3] for level in levels]
+        self.__child_starts = [level[4] for level in levels[:-1]]
+        self.__createViews()
+
+    def __createViews(self):
+        """
+        Creates memoryviews of the symbol and child start arrays. Single elements of a memoryview are read as Python
+        ints without creating NumPy scalars, which makes the binary search of a single lookup much faster.
+        """
+        self.__symbol_views = [memoryview(symbols) for symbols in self.__symbols]
+        self.__child_start_views = [memoryview(starts) for starts in self.__child_starts]
+        self.__keys = None
+        self.__key_stride = 0
+
+    def __init__(self, rootNodeOrLevels):
+        """
+        Constructor of FrozenNGramTree. A frozen tree stores a read-only NGram tree level by level in NumPy arrays.
+        Level 0 contains only the root node, level i contains the nodes of the i'th symbols of the N-Grams. For each
+        node there is a symbol, a count, a probability and a probability of unseen children. The children of the
+        node j at level i are the nodes childStarts[i][j], ..., childStarts[i][j + 1] - 1 at level i + 1, sorted by
+        their symbols, so that a child is found by binary search. The unknown child of a node, if there is any, is
+        stored as its first child with the symbol UNKNOWN.
+
+        PARAMETERS
+        ----------
+        rootNodeOrLevels
+            Either the root node of the NGram tree to be frozen, or a list of (symbols, counts, probabilities,
+            probabilitiesOfUnseen, childStarts) arrays for each level.
+        """
+        if isinstance(rootNodeOrLevels, NGramNode):
+            self.constructor1(rootNodeOrLevels)
+        else:
+            self.constructor2(rootNodeOrLevels)
+
+    def getLevels(self) -> list:
+        """
+        RETURNS
+        -------
+        list
+            (symbols, counts, probabilities, probabilitiesOfUnseen, childStarts) arrays for each level. childStarts is
+            None for the last level.
+        """
+        result = []
+        for i in range(len(self.__symbols)):
+            result.append((self.__symbols[i], self.__counts[i], self.__probabilities[i],
+                           self.__probabilities_of_unseen[i],
+                           self.__child_starts[i] if i < len(self.__child_starts) else None))
+        return result
+
+    def numberOfLevels(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of levels including the root level.
+        """
+        return len(self.__symbols)
+
+    def nbytes(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            total size of the arrays of this tree in bytes.
+        """
+        total = 0
+        for arrays in (self.__symbols, self.__counts, self.__probabilities, self.__probabilities_of_unseen,
+                       self.__child_starts):
+            for array in arrays:
+                total += array.nbytes
+        return total
+
+    def findChild(self,
+                  level: int,
+                  index: int,
+                  symbol: int) -> int:
+        """
+        Searches the child of the given node with the given symbol.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the parent node.
+        index : int
+            index of the parent node in its level.
+        symbol : int
+            symbol of the child.
+
+        RETURNS
+        -------
+        int
+            index of the child in level + 1, -1 if there is no such child.
+        """
+        if level >= len(self.__child_start_views):
+            return -1
+        starts = self.__child_start_views[level]
+        end = starts[index + 1]
+        symbols = self.__symbol_views[level + 1]
+        position = bisect.bisect_left(symbols, symbol, starts[index], end)
+        if position < end and symbols[position] == symbol:
+            return position
+        return -1
+
+    def findChildOrUnknown(self,
+                           level: int,
+                           index: int,
+                           symbol: int) -> int:
+        """
+        Searches the child of the given node with the given symbol. If there is no such child, the unknown child of
+        the node is returned.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the parent node.
+        index : int
+            index of the parent node in its level.
+        symbol : int
+            symbol of the child.
+
+        RETURNS
+        -------
+        int
+            index of the child or the unknown child in level + 1, -1 if there is neither.
+        """
+        position = self.findChild(level, index, symbol)
+        if position == -1 and symbol != FrozenNGramTree.UNKNOWN:
+            return self.findChild(level, index, FrozenNGramTree.UNKNOWN)
+        return position
+
+    def __levelKeys(self, level: int) -> numpy.ndarray:
+        """
+        Gets the composite keys of the nodes of the given level, parentIndex * stride + symbol + 2, where stride is
+        larger than symbol + 2 for every symbol in the tree. Since the children of a node are sorted by their symbols
+        and the children of consecutive nodes are next to each other, the keys of a level are sorted, so the children
+        of many nodes can be searched with a single searchsorted call. The keys are computed on first use.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the nodes, at least 1.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            composite keys of the nodes of the level.
+        """
+        if self.__keys is None:
+            maximum = 0
+            for symbols in self.__symbols:
+                if len(symbols) > 0:
+                    maximum = max(maximum, int(symbols.max()))
+            self.__key_stride = maximum + 3
+            self.__keys = [None] * len(self.__symbols)
+        if self.__keys[level] is None:
+            starts = self.__child_starts[level - 1]
+            parents = numpy.repeat(numpy.arange(len(starts) - 1, dtype=numpy.int64), numpy.diff(starts))
+            self.__keys[level] = parents * self.__key_stride + self.__symbols[level].astype(numpy.int64) + 2
+        return self.__keys[level]
+
+    def findChildren(self,
+                     level: int,
+                     indexes: numpy.ndarray,
+                     symbols: numpy.ndarray) -> numpy.ndarray:
+        """
+        Vectorized version of findChild, searches the child with symbols[i] of the node indexes[i] for every i. The
+        queries are searched in sorted order, which keeps consecutive binary searches in the same part of the keys.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the parent nodes.
+        indexes : numpy.ndarray
+            indexes of the parent nodes in their level.
+        symbols : numpy.ndarray
+            symbols of the children.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            indexes of the children in level + 1, -1 for the children that do not exist.
+        """
+        if level + 1 >= len(self.__symbols) or len(indexes) == 0:
+            return numpy.full(len(indexes), -1, dtype=numpy.int64)
+        keys = self.__levelKeys(level + 1)
+        symbols = numpy.asarray(symbols, dtype=numpy.int64)
+        symbols = numpy.where((symbols >= FrozenNGramTree.UNKNOWN) & (symbols < self.__key_stride - 2), symbols, -1)
+        queries = indexes * self.__key_stride + symbols + 2
+        order = numpy.argsort(queries)
+        positions = numpy.empty(len(queries), dtype=numpy.int64)
+        positions[order] = keys.searchsorted(queries[order])
+        clipped = numpy.minimum(positions, len(keys) - 1)
+        found = (positions < len(keys)) & (keys[clipped] == queries)
+        return numpy.where(found, clipped, -1)
+
+    def findChildrenOrUnknown(self,
+                              level: int,
+                              indexes: numpy.ndarray,
+                              symbols: numpy.ndarray) -> numpy.ndarray:
+        """
+        Vectorized version of findChildOrUnknown.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the parent nodes.
+        indexes : numpy.ndarray
+            indexes of the parent nodes in their level.
+        symbols : numpy.ndarray
+            symbols of the children.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            indexes of the children, or of the unknown children if the children do not exist, in level + 1, -1 if
+            there is neither.
+        """
+        children = self.findChildren(level, indexes, symbols)
+        missing = children == -1
+        if missing.any():
+            children[missing] = self.findChildren(level, indexes[missing],
+                                                  numpy.full(int(missing.sum()), FrozenNGramTree.UNKNOWN))
+        return children
+
+    def getProbabilities(self, ngrams: numpy.ndarray) -> numpy.ndarray:
+        """
+        Gets the probabilities of many N-Grams of the same length at once. The tree is descended one level at a time
+        for all N-Grams together, each level with a single binary search over its composite keys.
+
+        PARAMETERS
+        ----------
+        ngrams : numpy.ndarray
+            2-D array of symbols, each row is an N-Gram.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            probabilities of the N-Grams, NaN for the N-Grams whose context (all symbols but the last) is not found.
+        """
+        count, length = ngrams.shape
+        rows = numpy.arange(count)
+        nodes = numpy.zeros(count, dtype=numpy.int64)
+        for j in range(length - 1):
+            children = self.findChildrenOrUnknown(j, nodes, ngrams[rows, j])
+            found = children != -1
+            rows = rows[found]
+            nodes = children[found]
+        result = numpy.full(count, numpy.nan)
+        children = self.findChildrenOrUnknown(length - 1, nodes, ngrams[rows, length - 1])
+        found = children != -1
+        probabilities = self.__probabilities_of_unseen[length - 1][nodes]
+        if found.any():
+            probabilities[found] = self.__probabilities[length][children[found]]
+        result[rows] = probabilities
+        return result
+
+    def getCount(self, level: int, index: int) -> int:
+        """
+        Gets count of the given node.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the node.
+        index : int
+            index of the node in its level.
+
+        RETURNS
+        -------
+        int
+            count of the node.
+        """
+        return int(self.__counts[level][index])
+
+    def getProbability(self, level: int, index: int) -> float:
+        """
+        Gets probability of the given node.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the node.
+        index : int
+            index of the node in its level.
+
+        RETURNS
+        -------
+        float
+            probability of the node.
+        """
+        return float(self.__probabilities[level][index])
+
+    def getProbabilityOfUnseen(self, level: int, index: int) -> float:
+        """
+        Gets probability of the unseen children of the given node.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the node.
+        index : int
+            index of the node in its level.
+
+        RETURNS
+        -------
+        float
+            probability of the unseen children of the node.
+        """
+        return float(self.__probabilities_of_unseen[level][index])
+
+    def getChildProbability(self,
+                            level: int,
+                            index: int,
+                            symbol: int) -> float:
+        """
+        Gets the probability of the given symbol after the context of the given node, that is the probability of
+        its child with the symbol, of its unknown child if there is no such child, or of its unseen children if
+        there is neither.
+
+        PARAMETERS
+        ----------
+        level : int
+            level of the node.
+        index : int
+            index of the node in its level.
+        symbol : int
+            symbol of the child.
+
+        RETURNS
+        -------
+        float
+            probability of the symbol after the node.
+        """
+        child = self.findChildOrUnknown(level, index, symbol)
+        if child != -1:
+            return self.getProbability(level + 1, child)
+        return self.getProbabilityOfUnseen(level, index)
+
+    def getUniGramProbability(self, w1: int) -> float:
+        """
+        Gets unigram probability of given symbol.
+
+        PARAMETERS
+        ----------
+        w1 : int
+            unigram.
+
+        RETURNS
+        -------
+        float
+            unigram probability of given symbol.
+        """
+        return self.getChildProbability(0, 0, w1)
+
+    def getBiGramProbability(self,
+                             w1: int,
+                             w2: int) -> float:
+        """
+        Gets bigram probability of given symbols w1 and w2
+
+        PARAMETERS
+        ----------
+        w1 : int
+            first gram of bigram.
+        w2 : int
+            second gram of bigram.
+
+        RETURNS
+        -------
+        float
+            probability of given bigram, None if w1 is not found.
+        """
+        child = self.findChildOrUnknown(0, 0, w1)
+        if child == -1:
+            return None
+        return self.getChildProbability(1, child, w2)
+
+    def getTriGramProbability(self,
+                              w1: int,
+                              w2: int,
+                              w3: int) -> float:
+        """
+        Gets trigram probability of given symbols w1, w2 and w3.
+
+        PARAMETERS
+        ----------
+        w1 : int
+            first gram of trigram
+        w2 : int
+            second gram of trigram
+        w3 : int
+            third gram of trigram
+
+        RETURNS
+        -------
+        float
+            probability of given trigram, None if w1 w2 context is not found.
+        """
+        child = self.findChildOrUnknown(0, 0, w1)
+        if child == -1:
+            return None
+        child = self.findChildOrUnknown(1, child, w2)
+        if child == -1:
+            return None
+        return self.getChildProbability(2, child, w3)
+
+    def getNGramProbability(self, symbols: list) -> float:
+        """
+        Gets the probability of the last symbol of the given sequence after the other symbols, for a sequence of any
+        length.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of symbols.
+
+        RETURNS
+        -------
+        float
+            probability of the last symbol after the others, None if the context is not found.
+        """
+        child = 0
+        for level in range(len(symbols) - 1):
+            child = self.findChildOrUnknown(level, child, symbols[level])
+            if child == -1:
+                return None
+        return self.getChildProbability(len(symbols) - 1, child, symbols[-1])
+
+    def getInterpolationProbabilities(self, symbols: list) -> list:
+        """
+        Gets the probabilities of the last symbol of the given sequence after every suffix of its context in one
+        call, as NGramNode.getInterpolationProbabilities does.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of k symbols.
+
+        RETURNS
+        -------
+        list
+            k probabilities, the i'th being the probability of the last symbol after symbols[i:k - 1]. None for the
+            contexts that are not found.
+        """
+        last = len(symbols) - 1
+        symbol = symbols[last]
+        if last == 2:
+            return [self.getTriGramProbability(symbols[0], symbols[1], symbol),
+                    self.getBiGramProbability(symbols[1], symbol),
+                    self.getChildProbability(0, 0, symbol)]
+        if last == 1:
+            return [self.getBiGramProbability(symbols[0], symbol), self.getChildProbability(0, 0, symbol)]
+        return [self.getNGramProbability(symbols[i:]) for i in range(last + 1)]
+
+    def getCountForListItem(self,
+                            s: list,
+                            index: int) -> int:
+        """
+        Gets count of the sequence of symbols starting at the given index.
+
+        PARAMETERS
+        ----------
+        s : list
+            array of symbols
+        index : int
+            index of the first symbol
+
+        RETURNS
+        -------
+        int
+            count of the sequence, 0 if it does not exist.
+        """
+        level = 0
+        node = 0
+        for i in range(index, len(s)):
+            node = self.findChild(level, node, s[i])
+            if node == -1:
+                return 0
+            level = level + 1
+        return self.getCount(level, node)
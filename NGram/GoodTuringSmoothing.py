@@ -8,29 +8,29 @@ import math
 
 class GoodTuringSmoothing(SimpleSmoothing):
 
-    def __linearRegressionOnCountsOfCounts(self, countsOfCounts: list) -> list:
+    def __linearRegressionOnCountsOfCounts(self, countsOfCounts: dict) -> list:
         """
         Given counts of counts, this function will calculate the estimated counts of counts c$^*$ with
-        Good-Turing smoothing. First, the algorithm filters the non-zero counts from counts of counts array and constructs
-        c and r arrays. Then it constructs Z_n array with Z_n = (2C_n / (r_{n+1} - r_{n-1})). The algorithm then uses
-        simple linear regression on Z_n values to estimate w_1 and w_0, where log(N[i]) = w_1log(i) + w_0
+        Good-Turing smoothing. First, the algorithm sorts the non-zero counts of the sparse counts of counts and
+        constructs c and r arrays. Then it constructs Z_n array with Z_n = (2C_n / (r_{n+1} - r_{n-1})). The algorithm
+        then uses simple linear regression on Z_n values to estimate w_1 and w_0, where log(N[i]) = w_1log(i) + w_0.
+        Only the estimates up to N[6] are calculated, since the adjusted counts are used for counts up to 5.
 
         PARAMETERS
         ----------
-        countsOfCounts : list
-            Counts of counts. countsOfCounts[1] is the number of words occurred once in the corpus. countsOfCounts[i] is
-            the number of words occurred i times in the corpus.
+        countsOfCounts : dict
+            Sparse counts of counts. countsOfCounts[1] is the number of words occurred once in the corpus.
+            countsOfCounts[i] is the number of words occurred i times in the corpus.
 
         RETURNS
         ------
         list
             Estimated counts of counts array. N[1] is the estimated count for out of vocabulary words.
         """
-        N = [0.0] * len(countsOfCounts)
         r = []
         c = []
-        for i in range(1, len(countsOfCounts)):
-            if countsOfCounts[i] != 0:
+        for i in sorted(countsOfCounts):
+            if i > 0 and countsOfCounts[i] != 0:
                 r.append(i)
                 c.append(countsOfCounts[i])
         A = Matrix(2, 2)
@@ -54,10 +54,38 @@ class GoodTuringSmoothing(SimpleSmoothing):
         w = A.multiplyWithVectorFromRight(y)
         w0 = w.getValue(0)
         w1 = w.getValue(1)
-        for i in range(1, len(countsOfCounts)):
+        N = [0.0] * (min(max(countsOfCounts, default=0), 5) + 2)
+        for i in range(1, len(N)):
             N[i] = math.exp(math.log(i) * w1 + w0)
         return N
 
+    def __adjustedCounts(self,
+                         nGram: NGram,
+                         level: int) -> tuple:
+        """
+        Estimates the counts of counts of the given level with linear regression, and calculates the out of
+        vocabulary probability N[1] / sum_{i=1}^infinity N_i. The counts of counts are read from the sparse counts of
+        counts kept by the N-Gram, in time proportional to the number of distinct counts.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        level : int
+            Level for which N-Gram probabilities will be set.
+
+        RETURNS
+        -------
+        tuple
+            estimated counts of counts and the out of vocabulary probability.
+        """
+        counts_of_counts = nGram.getCountsOfCounts(level)
+        N = self.__linearRegressionOnCountsOfCounts(counts_of_counts)
+        total = 0.0
+        for r in sorted(counts_of_counts):
+            total += counts_of_counts[r] * r
+        return N, N[1] / total
+
     def setProbabilities(self,
                          nGram: NGram,
                          level: int):
@@ -74,9 +102,25 @@ class GoodTuringSmoothing(SimpleSmoothing):
             set with this function. If level = 1, N-Gram is treated as UniGram, if level = 2, N-Gram is treated as
             Bigram, etc.
         """
-        counts_of_counts = nGram.calculateCountsOfCounts(level)
-        N = self.__linearRegressionOnCountsOfCounts(counts_of_counts)
-        total = 0.0
-        for r in range(1, len(counts_of_counts)):
-            total += counts_of_counts[r] * r
-        nGram.setAdjustedProbability(N, level, N[1] / total)
+        N, p_zero = self.__adjustedCounts(nGram, level)
+        nGram.setAdjustedProbability(N, level, p_zero)
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Wrapper function to set the N-gram probabilities of the given levels with Good-Turing smoothing, in a single
+        traversal of the N-Gram.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        counts_of_counts = nGram.getN() * [None]
+        p_zeros = nGram.getN() * [0.0]
+        for level in levels:
+            counts_of_counts[level - 1], p_zeros[level - 1] = self.__adjustedCounts(nGram, level)
+        nGram.setAdjustedProbabilities(counts_of_counts, p_zeros)
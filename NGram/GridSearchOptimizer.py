@@ -0,0 +1,119 @@
+import math
+
+from NGram.ParameterOptimizer import ParameterOptimizer
+
+
+class GridSearchOptimizer(ParameterOptimizer):
+
+    __number_of_parts: int
+
+    def __init__(self, numberOfParts: int = 5):
+        """
+        Constructor of GridSearchOptimizer. The optimizer evaluates a grid of equally spaced values between the lower
+        and upper bounds of each parameter, narrows the bounds around the best point, and repeats until the best
+        perplexity improves by less than 0.1 percent.
+
+        PARAMETERS
+        ----------
+        numberOfParts : int
+            number of parts between the lower and upper bound of a parameter.
+        """
+        super().__init__()
+        self.__number_of_parts = numberOfParts
+
+    def __searchGrid(self,
+                     smoothing,
+                     statistics: list,
+                     lowerBounds: list,
+                     upperBounds: list,
+                     parameters: list,
+                     best: list,
+                     sampled: bool):
+        """
+        Evaluates the grid points whose first parameters are the given ones, and keeps the best one. Every
+        parameter advances with the step of the first parameter, and stops advancing when the point is not feasible
+        for the smoothing method.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+        statistics : list
+            statistics of the test folds.
+        lowerBounds : list
+            current lower bounds of the parameters.
+        upperBounds : list
+            current upper bounds of the parameters.
+        parameters : list
+            values of the first parameters of the grid points.
+        best : list
+            best perplexity and best parameters found so far, updated in place.
+        sampled : bool
+            True if the statistics are of samples of the test folds.
+        """
+        index = len(parameters)
+        if index == len(lowerBounds):
+            perplexity = self.evaluate(smoothing, statistics, parameters, sampled)
+            if perplexity < best[0]:
+                best[0] = perplexity
+                best[1] = list(parameters)
+            return
+        value = lowerBounds[index]
+        while value <= upperBounds[index] and smoothing.isFeasible(parameters + [value]):
+            self.__searchGrid(smoothing, statistics, lowerBounds, upperBounds, parameters + [value], best, sampled)
+            value += (upperBounds[0] - lowerBounds[0]) / self.__number_of_parts
+
+    def optimize(self,
+                 smoothing,
+                 statistics: list,
+                 lowerBounds: list,
+                 upperBounds: list,
+                 sampledStatistics: list = None) -> list:
+        """
+        Searches the parameters that minimize the sum of the perplexities of the test folds with grid refinement. The
+        bounds are narrowed with TrainedSmoothing.newLowerBound and TrainedSmoothing.newUpperBound. If statistics of
+        samples of the test folds are given, the coarse rounds are evaluated on the samples, and the search switches
+        to the whole test folds for the last rounds, once the improvement on the samples is less than 0.1 percent.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+        statistics : list
+            statistics of the test folds, see TrainedSmoothing.learnFoldStatistics.
+        lowerBounds : list
+            initial lower bounds of the parameters.
+        upperBounds : list
+            initial upper bounds of the parameters.
+        sampledStatistics : list
+            optional statistics of random samples of the test folds.
+
+        RETURNS
+        -------
+        list
+            best parameters.
+        """
+        lower_bounds = list(lowerBounds)
+        upper_bounds = list(upperBounds)
+        best_parameters = [(lower_bounds[i] + upper_bounds[i]) / 2 for i in range(len(lower_bounds))]
+        best_previous = -1
+        current_statistics = statistics if sampledStatistics is None else sampledStatistics
+        while True:
+            best = [math.inf, best_parameters]
+            self.__searchGrid(smoothing, current_statistics, lower_bounds, upper_bounds, [], best,
+                              current_statistics is not statistics)
+            best_perplexity, best_parameters = best
+            for i in range(len(lower_bounds)):
+                lower_bounds[i] = smoothing.newLowerBound(best_parameters[i], lower_bounds[i], upper_bounds[i],
+                                                          self.__number_of_parts)
+                upper_bounds[i] = smoothing.newUpperBound(best_parameters[i], lower_bounds[i], upper_bounds[i],
+                                                          self.__number_of_parts)
+            if math.isinf(best_perplexity) or \
+                    (best_previous != -1 and math.fabs(best_previous - best_perplexity) / best_perplexity < 0.001):
+                if current_statistics is statistics:
+                    break
+                current_statistics = statistics
+                best_previous = -1
+            else:
+                best_previous = best_perplexity
+        return best_parameters
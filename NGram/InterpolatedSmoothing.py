@@ -2,10 +2,13 @@ from Sampling.KFoldCrossValidation import KFoldCrossValidation
 
 from NGram.GoodTuringSmoothing import GoodTuringSmoothing
 from NGram.NGram import NGram
+from NGram.NGramCounter import NGramCounter
 from NGram.SimpleSmoothing import SimpleSmoothing
 from NGram.TrainedSmoothing import TrainedSmoothing
 import math
 
+import numpy
+
 
 class InterpolatedSmoothing(TrainedSmoothing):
 
@@ -22,151 +25,183 @@ class InterpolatedSmoothing(TrainedSmoothing):
         simpleSmoothing : SimpleSmoothing
             smoothing method.
         """
+        super().__init__()
         if simpleSmoothing is None:
             self.__simple_smoothing = GoodTuringSmoothing()
         else:
             self.__simple_smoothing = simpleSmoothing
 
-    def __learnBestLambda(self,
-                          nGrams: list,
-                          kFoldCrossValidation: KFoldCrossValidation,
-                          lowerBound: float) -> float:
+    def __perplexity(self,
+                     components: numpy.ndarray,
+                     weights: numpy.ndarray) -> float:
         """
-        The algorithm tries to optimize the best lambda for a given corpus. The algorithm uses perplexity on the
-        validation set as the optimization criterion.
+        Calculates the perplexity of a test fold for given interpolation weights, from the component probabilities of
+        its N-Grams found once with NGram.getComponentProbabilities.
 
         PARAMETERS
         ----------
-        nGrams : list
-            10 N-Grams learned for different folds of the corpus. nGrams[i] is the N-Gram trained with i'th train fold
-            of the corpus.
-        kFoldCrossValidation : KFoldCrossvalidation
-            Cross-validation data used in training and testing the N-grams.
-        lowerBound : float
-            Initial lower bound for optimizing the best lambda.
+        components : numpy.ndarray
+            component probabilities of the N-Grams of the test fold, the highest order first.
+        weights : numpy.ndarray
+            interpolation weight of each order, the highest order first. The last weight is the unigram weight.
 
         RETURNS
         -------
         float
-            Best lambda optimized with k-fold crossvalidation.
-        """
-        best_previous = -1
-        upper_bound = 0.999
-        best_lambda = (lowerBound + upper_bound) / 2
-        number_of_parts = 5
-        test_folds = []
-        for i in range(10):
-            test_folds.append(kFoldCrossValidation.getTestFold(i))
-        while True:
-            best_perplexity = 1000000000
-            value = lowerBound
-            while value <= upper_bound:
-                perplexity = 0
-                for i in range(10):
-                    nGrams[i].setLambda2(value)
-                    perplexity += nGrams[i].getPerplexity(test_folds[i])
-                if perplexity < best_perplexity:
-                    best_perplexity = perplexity
-                    best_lambda = value
-                value += (upper_bound - lowerBound) / number_of_parts
-            lowerBound = self.newLowerBound(best_lambda, lowerBound, upper_bound, number_of_parts)
-            upper_bound = self.newUpperBound(best_lambda, lowerBound, upper_bound, number_of_parts)
-            if best_previous != -1:
-                if math.fabs(best_previous - best_perplexity) / best_perplexity < 0.001:
-                    break
-            best_previous = best_perplexity
-        return best_lambda
-
-    def __learnBestLambdas(self,
-                           nGrams: list,
-                           kFoldCrossValidation: KFoldCrossValidation,
-                           lowerBound1: float,
-                           lowerBound2: float) -> tuple:
-        """
-        The algorithm tries to optimize the best lambdas (lambda1, lambda2) for a given corpus. The algorithm uses
-        perplexity on the validation set as the optimization criterion.
+            perplexity of the test fold.
+        """
+        with numpy.errstate(divide="ignore"):
+            return math.exp(-float(numpy.log(components @ weights).sum()) / len(components))
+
+    def getFoldPerplexity(self,
+                          statistics: list,
+                          parameters: list) -> float:
+        """
+        Calculates the sum of the perplexities of the test folds for the given interpolation ratios.
 
         PARAMETERS
         ----------
-        nGrams : list
-            10 N-Grams learned for different folds of the corpus. nGrams[i] is the N-Gram trained with i'th train fold
-            of the corpus.
-        kFoldCrossValidation : KFoldCrossValidation
-            Cross-validation data used in training and testing the N-grams.
-        lowerBound1 : float
-            Initial lower bound for optimizing the best lambda1.
-        lowerBound2 : float
-            Initial lower bound for optimizing the best lambda2.
+        statistics : list
+            component probabilities of the test folds, see getFoldStatistics.
+        parameters : list
+            interpolation ratios of the orders from N to 2, the rest is the unigram weight.
 
         RETURNS
         -------
-        tuple
-            bestLambda1 and bestLambda2
-        """
-        upper_bound1 = 0.999
-        upper_bound2 = 0.999
-        best_previous = -1
-        best_lambda1 = (lowerBound1 + upper_bound1) / 2
-        best_lambda2 = (lowerBound2 + upper_bound2) / 2
-        number_of_parts = 5
-        test_folds = []
-        for i in range(10):
-            test_folds.append(kFoldCrossValidation.getTestFold(i))
-        while True:
-            best_perplexity = 1000000000
-            value1 = lowerBound1
-            while value1 <= upper_bound1:
-                value2 = lowerBound2
-                while value2 <= upper_bound2 and value1 + value2 < 1:
-                    perplexity = 0
-                    for i in range(10):
-                        nGrams[i].setLambda3(value1, value2)
-                        perplexity += nGrams[i].getPerplexity(test_folds[i])
-                    if perplexity < best_perplexity:
-                        best_perplexity = perplexity
-                        best_lambda1 = value1
-                        best_lambda2 = value2
-                    value2 += (upper_bound1 - lowerBound1) / number_of_parts
-                value1 += (upper_bound1 - lowerBound1) / number_of_parts
-            lowerBound1 = self.newLowerBound(best_lambda1, lowerBound1, upper_bound1, number_of_parts)
-            upper_bound1 = self.newUpperBound(best_lambda1, lowerBound1, upper_bound1, number_of_parts)
-            lowerBound2 = self.newLowerBound(best_lambda2, lowerBound2, upper_bound2, number_of_parts)
-            upper_bound2 = self.newUpperBound(best_lambda2, lowerBound2, upper_bound2, number_of_parts)
-            if best_previous != -1:
-                if math.fabs(best_previous - best_perplexity) / best_perplexity < 0.001:
-                    break
-            best_previous = best_perplexity
-        return best_lambda1, best_lambda2
+        float
+            sum of the perplexities of the test folds.
+        """
+        rest = 1.0
+        for ratio in parameters:
+            rest -= ratio
+        weights = numpy.array(list(parameters) + [rest])
+        perplexity = 0
+        for components in statistics:
+            perplexity += self.__perplexity(components, weights)
+        return perplexity
+
+    def sampleFoldStatistics(self,
+                             statistics: numpy.ndarray,
+                             fraction: float,
+                             generator: numpy.random.Generator) -> numpy.ndarray:
+        """
+        Gets the component probabilities of a random sample of the N-Grams of a test fold.
+
+        PARAMETERS
+        ----------
+        statistics : numpy.ndarray
+            component probabilities of the test fold, see getFoldStatistics.
+        fraction : float
+            fraction of the N-Grams in the sample.
+        generator : numpy.random.Generator
+            random number generator.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            component probabilities of the sampled N-Grams, at least one.
+        """
+        size = max(1, round(fraction * len(statistics)))
+        return statistics[numpy.sort(generator.choice(len(statistics), size, replace=False))]
+
+    def getConfiguration(self) -> str:
+        """
+        RETURNS
+        -------
+        str
+            configuration of the smoothing method, including the simple smoothing method of the components.
+        """
+        return super().getConfiguration() + "," + type(self.__simple_smoothing).__name__
+
+    def isFeasible(self, parameters: list) -> bool:
+        """
+        Checks if the given interpolation ratios leave a positive weight for the unigrams.
+
+        PARAMETERS
+        ----------
+        parameters : list
+            values of the first interpolation ratios.
+
+        RETURNS
+        -------
+        bool
+            True if the sum of the ratios is less than 1.
+        """
+        return sum(parameters) < 1
+
+    def hasComponentProbabilities(self) -> bool:
+        """
+        RETURNS
+        -------
+        bool
+            True, the fold statistics are the component probabilities of the N-Grams of the test folds.
+        """
+        return True
 
     def learnParameters(self,
                         corpus: list,
                         N: int):
         """
         Wrapper function to learn the parameters (lambda1 and lambda2) in interpolated smoothing. The function first
-        creates K NGrams with the train folds of the corpus. Then optimizes lambdas with respect to the test folds of
-        the corpus depending on given N.
+        creates K NGrams with the train folds of the corpus, counted with countTrainFolds, and finds the component
+        probabilities of their test folds with learnFoldStatistics. Then optimizes lambdas with respect to the test
+        folds of the corpus depending on given N, with optimizeParameters. If a parameter cache is set with
+        setParameterCache and the lambdas are already learned from the same corpus, they are read from the cache.
 
         PARAMETERS
         ----------
-        corpus : list
-            Train corpus used to optimize lambda parameters
+        corpus
+            Train corpus, a list or any other iterable of sentences, used to optimize lambda parameters
         N : int
             N in N-Gram.
         """
         if N <= 1:
             return
         K = 10
-        n_grams = []
+        # KFoldCrossValidation shuffles the sentences in place, the caller's list is left unchanged.
+        corpus = list(corpus)
+        cached = self.getCachedParameters(corpus, N)
+        if cached is not None:
+            if N == 2:
+                (self.__lambda1,) = cached
+            elif N == 3:
+                (self.__lambda1, self.__lambda2) = cached
+            return
         k_fold_cross_validation = KFoldCrossValidation(corpus, K, 0)
-        for i in range(K):
-            n_grams.append(NGram(N, k_fold_cross_validation.getTrainFold(i)))
-            for j in range(2, N + 1):
-                n_grams[i].calculateNGramProbabilitiesSimpleLevel(self.__simple_smoothing, j)
-            n_grams[i].calculateNGramProbabilitiesSimpleLevel(self.__simple_smoothing, 1)
+        components = self.learnFoldStatistics(k_fold_cross_validation, K, N)
         if N == 2:
-            self.__lambda1 = self.__learnBestLambda(n_grams, k_fold_cross_validation, 0.1)
+            (self.__lambda1,) = self.optimizeParameters(components, [0.1], [0.999])
+            self.cacheParameters(N, [self.__lambda1])
         elif N == 3:
-            (self.__lambda1, self.__lambda2) = self.__learnBestLambdas(n_grams, k_fold_cross_validation, 0.1, 0.1)
+            (self.__lambda1, self.__lambda2) = self.optimizeParameters(components, [0.1, 0.1], [0.999, 0.999])
+            self.cacheParameters(N, [self.__lambda1, self.__lambda2])
+
+    def getFoldStatistics(self,
+                          trainCounter: NGramCounter,
+                          testFold: list,
+                          N: int) -> numpy.ndarray:
+        """
+        Builds the N-Gram of a train fold, sets its probabilities of all levels with the simple smoothing, and gets the
+        component probabilities of the N-Grams of the test fold.
+
+        PARAMETERS
+        ----------
+        trainCounter : NGramCounter
+            N-Gram counts of the train fold.
+        testFold : list
+            sentences of the test fold.
+        N : int
+            N in N-Gram.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            component probabilities of the test fold, see NGram.getComponentProbabilities.
+        """
+        n_gram = NGram(N)
+        n_gram.addNGramCounter(trainCounter)
+        n_gram.calculateNGramProbabilitiesSimpleLevels(self.__simple_smoothing, list(range(2, N + 1)) + [1])
+        return n_gram.getComponentProbabilities(testFold)
 
     def setProbabilities(self,
                          nGram: NGram,
@@ -183,9 +218,8 @@ class InterpolatedSmoothing(TrainedSmoothing):
             set with this function. If level = 1, N-Gram is treated as UniGram, if level = 2, N-Gram is treated as
             Bigram, etc.
         """
-        for j in range(2, nGram.getN() + 1):
-            nGram.calculateNGramProbabilitiesSimpleLevel(self.__simple_smoothing, j)
-        nGram.calculateNGramProbabilitiesSimpleLevel(self.__simple_smoothing, 1)
+        nGram.calculateNGramProbabilitiesSimpleLevels(self.__simple_smoothing,
+                                                      list(range(2, nGram.getN() + 1)) + [1])
         if nGram.getN() == 2:
             nGram.setLambda2(self.__lambda1)
         elif nGram.getN() == 3:
@@ -28,3 +28,20 @@ class LaplaceSmoothing(SimpleSmoothing):
             as Bigram, etc.
         """
         nGram.setProbabilityWithPseudoCount(self.__delta, level)
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Wrapper function to set the N-gram probabilities of the given levels with laplace smoothing, in a single
+        traversal of the N-Gram.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        nGram.setProbabilityWithPseudoCounts([self.__delta if level in levels else None
+                                              for level in range(1, nGram.getN() + 1)])
@@ -0,0 +1,305 @@
+from collections import OrderedDict
+
+import numpy
+
+from NGram.FrozenNGramTree import FrozenNGramTree
+from NGram.NGramBinaryFile import NGramBinaryFile
+
+
+class LazyNGramTree:
+
+    __input_file: object
+    __layout: list
+    __top: FrozenNGramTree
+    __subtrees: OrderedDict
+    __maximum_subtrees: int
+    __loads: int
+
+    def __init__(self,
+                 binaryFile: NGramBinaryFile,
+                 layout: list,
+                 maximumSubtrees: int = None):
+        """
+        Constructor of LazyNGramTree. A lazy tree reads only the root and the first level of a binary N-Gram file
+        when it is opened, together with the child start index of the first level. Since the file stores the tree
+        level by level with the children of consecutive nodes next to each other, all descendants of a first level
+        node occupy one contiguous range in each deeper level. The subtree of a first word is read with one slice per
+        array and level the first time a lookup needs it, and kept as a FrozenNGramTree whose root is that first word.
+
+        PARAMETERS
+        ----------
+        binaryFile : NGramBinaryFile
+            binary N-Gram file.
+        layout : list
+            array positions of each level, as returned by NGramBinaryFile.readHeader.
+        maximumSubtrees : int
+            maximum number of resident subtrees. When a new subtree is loaded and the limit is exceeded, the least
+            recently used subtree is evicted. If None, loaded subtrees are never evicted.
+        """
+        self.__input_file = open(binaryFile.getFileName(), mode="rb")
+        self.__layout = layout
+        self.__subtrees = OrderedDict()
+        self.__maximum_subtrees = maximumSubtrees
+        self.__loads = 0
+        levels = []
+        for k in range(min(2, len(layout))):
+            size = layout[k][0][2]
+            arrays = [self.__readArray(layout[k][i], 0, size) for i in range(4)]
+            arrays.append(self.__readArray(layout[k][4], 0, size + 1) if k == 0 and layout[k][4] is not None
+                          else None)
+            levels.append(arrays)
+        self.__top = FrozenNGramTree(levels)
+
+    def __readArray(self,
+                    item: tuple,
+                    start: int,
+                    end: int) -> numpy.ndarray:
+        """
+        Reads the elements start, ..., end - 1 of an array of the binary file.
+
+        PARAMETERS
+        ----------
+        item : tuple
+            (dtype, offset, length) of the array.
+        start : int
+            index of the first element to be read.
+        end : int
+            index after the last element to be read.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            elements read.
+        """
+        dtype = numpy.dtype(item[0])
+        self.__input_file.seek(item[1] + start * dtype.itemsize)
+        return numpy.frombuffer(self.__input_file.read((end - start) * dtype.itemsize), dtype=dtype)
+
+    def __loadSubtree(self, index: int) -> FrozenNGramTree:
+        """
+        Reads the subtree of the given first level node from the file.
+
+        PARAMETERS
+        ----------
+        index : int
+            index of the node in the first level.
+
+        RETURNS
+        -------
+        FrozenNGramTree
+            subtree whose root is the given node.
+        """
+        layout = self.__layout
+        start = index
+        end = index + 1
+        levels = []
+        for k in range(1, len(layout)):
+            arrays = [self.__readArray(layout[k][i], start, end) for i in range(4)]
+            if layout[k][4] is not None and end > start:
+                starts = self.__readArray(layout[k][4], start, end + 1)
+                arrays.append(starts - starts[0])
+                levels.append(arrays)
+                start = int(starts[0])
+                end = int(starts[-1])
+            else:
+                arrays.append(None)
+                levels.append(arrays)
+                break
+        self.__loads = self.__loads + 1
+        return FrozenNGramTree(levels)
+
+    def __getSubtree(self, index: int) -> FrozenNGramTree:
+        """
+        Gets the subtree of the given first level node, loading it if it is not resident.
+
+        PARAMETERS
+        ----------
+        index : int
+            index of the node in the first level.
+
+        RETURNS
+        -------
+        FrozenNGramTree
+            subtree whose root is the given node.
+        """
+        subtree = self.__subtrees.get(index)
+        if subtree is not None:
+            self.__subtrees.move_to_end(index)
+            return subtree
+        subtree = self.__loadSubtree(index)
+        self.__subtrees[index] = subtree
+        if self.__maximum_subtrees is not None and len(self.__subtrees) > self.__maximum_subtrees:
+            self.__subtrees.popitem(last=False)
+        return subtree
+
+    def residentSubtrees(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of subtrees currently in memory.
+        """
+        return len(self.__subtrees)
+
+    def subtreeLoads(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of times a subtree has been read from the file, including the subtrees read again after eviction.
+        """
+        return self.__loads
+
+    def close(self):
+        """
+        Closes the binary file. No subtree can be loaded afterwards.
+        """
+        self.__input_file.close()
+
+    def getLevels(self) -> list:
+        """
+        Reads all levels of the tree from the file.
+
+        RETURNS
+        -------
+        list
+            (symbols, counts, probabilities, probabilitiesOfUnseen, childStarts) arrays for each level. childStarts is
+            None for the last level.
+        """
+        levels = []
+        for level in self.__layout:
+            size = level[0][2]
+            arrays = [self.__readArray(level[i], 0, size) for i in range(4)]
+            arrays.append(self.__readArray(level[4], 0, size + 1) if level[4] is not None else None)
+            levels.append(tuple(arrays))
+        return levels
+
+    def getUniGramProbability(self, w1: int) -> float:
+        """
+        Gets unigram probability of given symbol.
+
+        PARAMETERS
+        ----------
+        w1 : int
+            unigram.
+
+        RETURNS
+        -------
+        float
+            unigram probability of given symbol.
+        """
+        return self.__top.getUniGramProbability(w1)
+
+    def getBiGramProbability(self,
+                             w1: int,
+                             w2: int) -> float:
+        """
+        Gets bigram probability of given symbols w1 and w2
+
+        PARAMETERS
+        ----------
+        w1 : int
+            first gram of bigram.
+        w2 : int
+            second gram of bigram.
+
+        RETURNS
+        -------
+        float
+            probability of given bigram, None if w1 is not found.
+        """
+        child = self.__top.findChildOrUnknown(0, 0, w1)
+        if child == -1:
+            return None
+        return self.__getSubtree(child).getUniGramProbability(w2)
+
+    def getTriGramProbability(self,
+                              w1: int,
+                              w2: int,
+                              w3: int) -> float:
+        """
+        Gets trigram probability of given symbols w1, w2 and w3.
+
+        PARAMETERS
+        ----------
+        w1 : int
+            first gram of trigram
+        w2 : int
+            second gram of trigram
+        w3 : int
+            third gram of trigram
+
+        RETURNS
+        -------
+        float
+            probability of given trigram, None if w1 w2 context is not found.
+        """
+        child = self.__top.findChildOrUnknown(0, 0, w1)
+        if child == -1:
+            return None
+        return self.__getSubtree(child).getBiGramProbability(w2, w3)
+
+    def getNGramProbability(self, symbols: list) -> float:
+        """
+        Gets the probability of the last symbol of the given sequence after the other symbols, for a sequence of any
+        length.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of symbols.
+
+        RETURNS
+        -------
+        float
+            probability of the last symbol after the others, None if the context is not found.
+        """
+        if len(symbols) == 1:
+            return self.__top.getUniGramProbability(symbols[0])
+        child = self.__top.findChildOrUnknown(0, 0, symbols[0])
+        if child == -1:
+            return None
+        return self.__getSubtree(child).getNGramProbability(symbols[1:])
+
+    def getInterpolationProbabilities(self, symbols: list) -> list:
+        """
+        Gets the probabilities of the last symbol of the given sequence after every suffix of its context. Each
+        suffix starts with a different first word, so each one is looked up in the subtree of its first word.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of k symbols.
+
+        RETURNS
+        -------
+        list
+            k probabilities, the i'th being the probability of the last symbol after symbols[i:k - 1]. None for the
+            contexts that are not found.
+        """
+        return [self.getNGramProbability(symbols[i:]) for i in range(len(symbols))]
+
+    def getCountForListItem(self,
+                            s: list,
+                            index: int) -> int:
+        """
+        Gets count of the sequence of symbols starting at the given index.
+
+        PARAMETERS
+        ----------
+        s : list
+            array of symbols
+        index : int
+            index of the first symbol
+
+        RETURNS
+        -------
+        int
+            count of the sequence, 0 if it does not exist.
+        """
+        if index + 1 >= len(s):
+            return self.__top.getCountForListItem(s, index)
+        child = self.__top.findChild(0, 0, s[index])
+        if child == -1:
+            return 0
+        return self.__getSubtree(child).getCountForListItem(s, index + 1)
@@ -0,0 +1,194 @@
+from collections import Counter
+
+import numpy
+
+from NGram.CorpusFile import CorpusFile
+from NGram.Vocabulary import Vocabulary
+
+
+class LossyNGramCounter:
+
+    __N: int
+    __maximum_size: int
+    __minimum_count: int
+    __vocabulary: Vocabulary
+    __counts: Counter
+    __deltas: dict
+    __threshold: int
+    __total: int
+    __dictionary: set
+
+    def __init__(self,
+                 N: int,
+                 maximumSize: int,
+                 corpus=None,
+                 minimumCount: int = 1,
+                 dictionary: set = None):
+        """
+        Constructor of LossyNGramCounter class. A LossyNGramCounter counts the N-Grams of a corpus approximately with
+        lossy counting, keeping at most maximumSize distinct N-Grams in memory. When the N-Grams exceed the budget,
+        the deletion threshold is raised so that at most half of the budget is kept, and the N-Grams whose count,
+        together with the count they may have lost before, is not above the threshold are deleted. An N-Gram added
+        after the threshold is raised remembers the threshold as the count it may have lost. The counts are therefore
+        never more than the true counts and at most getErrorBound less than them, and every N-Gram occurring more
+        than getErrorBound times is kept. An NGram tree of the kept N-Grams can be built with NGram.addNGramCounter,
+        and smoothed like any other NGram.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        maximumSize : int
+            maximum number of distinct N-Grams kept in memory.
+        corpus
+            optional iterable of sentences whose ngrams are counted.
+        minimumCount : int
+            minimum true count of the N-Grams returned by getCounts. The N-Grams whose counts are at least
+            minimumCount - getErrorBound are returned, so that no N-Gram occurring at least minimumCount times is
+            missed.
+        dictionary : set
+            optional set of known words, words not in the dictionary are counted as the unknown word, see NGramCounter.
+        """
+        self.__N = N
+        self.__maximum_size = maximumSize
+        self.__minimum_count = minimumCount
+        self.__vocabulary = Vocabulary()
+        self.__counts = Counter()
+        self.__deltas = {}
+        self.__threshold = 0
+        self.__total = 0
+        self.__dictionary = dictionary
+        if corpus is not None:
+            for sentence in corpus:
+                self.addSentence(sentence)
+
+    def getN(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            size of ngram.
+        """
+        return self.__N
+
+    def getVocabulary(self) -> Vocabulary:
+        """
+        RETURNS
+        -------
+        Vocabulary
+            vocabulary of the counted sentences, including the words whose N-Grams are deleted. The N-Gram keys are
+            tuples of indexes in this vocabulary.
+        """
+        return self.__vocabulary
+
+    def getDictionary(self) -> set:
+        """
+        RETURNS
+        -------
+        set
+            set of known words, None if the vocabulary is not closed.
+        """
+        return self.__dictionary
+
+    def getCounts(self) -> Counter:
+        """
+        RETURNS
+        -------
+        Counter
+            approximate counts of the kept N-Grams whose counts are at least minimumCount - getErrorBound, keyed by
+            the tuples of the vocabulary indexes of their symbols.
+        """
+        if self.__minimum_count - self.__threshold <= 1:
+            return self.__counts
+        return Counter({ngram: count for ngram, count in self.__counts.items()
+                        if count >= self.__minimum_count - self.__threshold})
+
+    def size(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of distinct N-Grams kept.
+        """
+        return len(self.__counts)
+
+    def getErrorBound(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            maximum difference between the true count and the count of an N-Gram. N-Grams occurring more than this
+            many times are never deleted. The bound is 0 if the N-Grams never exceeded the budget, in which case the
+            counts are exact.
+        """
+        return self.__threshold
+
+    def getTotal(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of N-Grams counted, the relative error of the counts is at most getErrorBound / getTotal.
+        """
+        return self.__total
+
+    def __prune(self):
+        """
+        Raises the deletion threshold to the sum of the count and the lost count of the N-Gram, which leaves at most
+        half of the budget above the threshold, and deletes the N-Grams not above the threshold. The N-Grams are
+        deleted in place, so that no second copy of the counts is built while pruning.
+        """
+        counts = self.__counts
+        deltas = self.__deltas
+        values = numpy.fromiter((count + deltas.get(ngram, 0) for ngram, count in counts.items()),
+                                dtype=numpy.int64, count=len(counts))
+        index = len(values) - self.__maximum_size // 2 - 1
+        self.__threshold = max(self.__threshold, int(numpy.partition(values, index)[index]))
+        threshold = self.__threshold
+        for ngram in [ngram for ngram, count in counts.items() if count + deltas.get(ngram, 0) <= threshold]:
+            del counts[ngram]
+            deltas.pop(ngram, None)
+
+    def addCorpusFile(self, fileName: str):
+        """
+        Counts the N-Grams of all sentences of the given corpus file, reading the file line by line.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the corpus file.
+        """
+        for sentence in CorpusFile(fileName):
+            self.addSentence(sentence)
+
+    def addSentence(self,
+                    symbols: list,
+                    sentenceCount: int = 1):
+        """
+        Adds all words of the given sentence to the vocabulary and counts all N-Grams of the sentence. If the kept
+        N-Grams exceed the budget afterwards, the rare N-Grams are deleted.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            Sentence whose ngrams are counted.
+        sentenceCount : int
+            Number of times this sentence is added.
+        """
+        indexes = self.__vocabulary.addWords(symbols, self.__dictionary)
+        if len(indexes) < self.__N:
+            return
+        ngrams = list(zip(*[indexes[i:] for i in range(self.__N)]))
+        counts = self.__counts
+        if self.__threshold > 0:
+            for ngram in ngrams:
+                if ngram not in counts:
+                    self.__deltas[ngram] = self.__threshold
+        if sentenceCount == 1:
+            counts.update(ngrams)
+        else:
+            for ngram in ngrams:
+                counts[ngram] += sentenceCount
+        self.__total = self.__total + len(ngrams) * sentenceCount
+        if len(counts) > self.__maximum_size:
+            self.__prune()
@@ -1,72 +1,129 @@
 from __future__ import annotations
-from DataStructure.CounterHashMap import CounterHashMap
 
+from NGram.ContextCache import ContextCache
+from NGram.CorpusFile import CorpusFile
+from NGram.FrozenNGramTree import FrozenNGramTree
+from NGram.LazyNGramTree import LazyNGramTree
+from NGram.NGramBinaryFile import NGramBinaryFile
+from NGram.NGramCounter import NGramCounter
 from NGram.NGramNode import NGramNode
+from NGram.NGramState import NGramState
 from NGram.SimpleSmoothing import SimpleSmoothing
 from NGram.TrainedSmoothing import TrainedSmoothing
 from NGram.MultipleFile import MultipleFile
+from NGram.Vocabulary import Vocabulary
+import gc
 import math
+import numpy
 
 
 class NGram:
 
     rootNode: NGramNode
+    __frozen_tree: object
+    __context_cache: ContextCache
     __N: int
-    __lambda1: float
-    __lambda2: float
+    __lambdas: list
     __interpolated: bool
-    __vocabulary: set
+    __vocabulary: Vocabulary
     __probability_of_unseen: list
-
-    def constructor1(self, N: int, corpus: list):
+    __counts_of_counts: list
+    __dictionary: set
+
+    def constructor1(self,
+                     N: int,
+                     corpus,
+                     dictionary: set,
+                     minimumFrequency: int):
         self.__N = N
-        self.__vocabulary = set()
+        self.__vocabulary = Vocabulary()
         self.__probability_of_unseen = self.__N * [0.0]
-        self.__lambda1 = 0.0
-        self.__lambda2 = 0.0
+        self.__lambdas = max(self.__N - 1, 0) * [0.0]
         self.__interpolated = False
+        self.__frozen_tree = None
+        self.__context_cache = None
         self.rootNode = NGramNode(None)
+        self.__counts_of_counts = [{} for _ in range(self.__N)]
+        if dictionary is None and minimumFrequency is not None and corpus is not None:
+            dictionary = NGramCounter.constructDictionaryWithMinimumFrequency(corpus, minimumFrequency)
+        self.__dictionary = dictionary
         if corpus is not None:
-            for i in range(len(corpus)):
-                self.addNGramSentence(corpus[i])
+            self.addNGramCounter(NGramCounter(N, corpus, dictionary))
 
     def constructor2(self, fileName: str):
+        self.__context_cache = None
+        self.__dictionary = None
+        self.__counts_of_counts = None
+        binary_file = NGramBinaryFile(fileName)
+        if binary_file.isBinary():
+            self.__N, lambdas, self.__probability_of_unseen, self.__vocabulary, self.__frozen_tree = binary_file.load()
+            self.__readLambdas(lambdas)
+            self.__interpolated = False
+            self.rootNode = None
+            return
         inputFile = open(fileName, mode="r", encoding="utf-8")
         line = inputFile.readline().strip()
         items = line.split()
         self.__N = int(items[0])
-        self.__lambda1 = float(items[1])
-        self.__lambda2 = float(items[2])
+        self.__readLambdas([float(item) for item in items[1:]])
         self.__probability_of_unseen = self.__N * [0.0]
         self.__interpolated = False
         line = inputFile.readline().strip()
         items = line.split()
         for i in range(len(items)):
             self.__probability_of_unseen[i] = float(items[i])
-        self.__vocabulary = set()
+        self.__vocabulary = Vocabulary()
         vocabulary_size = int(inputFile.readline().strip())
         for i in range(vocabulary_size):
-            self.__vocabulary.add(inputFile.readline().strip())
-        self.rootNode = NGramNode(True, inputFile)
+            self.__vocabulary.addWord(inputFile.readline().strip())
+        self.rootNode = NGramNode(True, inputFile, self.__vocabulary)
+        self.__frozen_tree = None
         inputFile.close()
 
+    def __readLambdas(self, lambdas: list):
+        """
+        Sets the interpolation ratios read from a file. Files store at least two ratios, the ones beyond N - 1 are
+        ignored.
+
+        PARAMETERS
+        ----------
+        lambdas : list
+            interpolation ratios read from the file.
+        """
+        self.__lambdas = (list(lambdas) + self.__N * [0.0])[:max(self.__N - 1, 0)]
+
     def __init__(self,
                  NorFileName,
-                 corpus=None):
+                 corpus=None,
+                 dictionary: set = None,
+                 minimumFrequency: int = None):
         """
-        Constructor of NGram class which takes a list corpus and Integer size of ngram as input.
-        It adds all sentences of corpus as ngrams.
+        Constructor of NGram class which takes a corpus and Integer size of ngram as input.
+        It counts all ngrams of the sentences of corpus with an NGramCounter and builds the NGram tree once from the
+        aggregated counts. The corpus is iterated only once, so it can be a list of sentences as well as a generator
+        or a CorpusFile, in which case the sentences are never kept in memory together.
+        If a dictionary, or a minimum frequency, is given, the vocabulary is closed. Words not in the dictionary are
+        replaced with the unknown word while the ngrams are counted, so the NGram tree is the one replaceUnknownWords
+        would give, without ever keeping the ngrams of the unknown words separately. With a minimum frequency, the
+        dictionary is the words occurring at least that many times in the corpus, found in a first pass over it, so
+        the corpus must be a list or a CorpusFile.
+        If a file name is given, the NGram is loaded from a file saved with saveAsText or saveAsBinary. A binary file
+        is memory mapped and the loaded NGram is frozen.
 
         PARAMETERS
         ----------
         NorFileName
             size of ngram.
             fileName
-        corpus : list
-            list of sentences whose ngrams are added.
+        corpus
+            list, or any other iterable, of sentences whose ngrams are added.
+        dictionary : set
+            optional set of known words.
+        minimumFrequency : int
+            optional minimum number of occurrences of a known word in the corpus, used if no dictionary is given.
         """
         if isinstance(NorFileName, int):
-            self.constructor1(NorFileName, corpus)
+            self.constructor1(NorFileName, corpus, dictionary, minimumFrequency)
         else:
             self.constructor2(NorFileName)
 
@@ -75,30 +132,175 @@ class NGram:
         line = multiple_file.readLine().strip()
         items = line.split()
         self.__N = int(items[0])
-        self.__lambda1 = float(items[1])
-        self.__lambda2 = float(items[2])
+        self.__readLambdas([float(item) for item in items[1:]])
         self.__probability_of_unseen = self.__N * [0.0]
         self.__interpolated = False
         line = multiple_file.readLine().strip()
         items = line.split()
         for i in range(len(items)):
             self.__probability_of_unseen[i] = float(items[i])
-        self.__vocabulary = set()
+        self.__vocabulary = Vocabulary()
         vocabulary_size = int(multiple_file.readLine().strip())
         for i in range(vocabulary_size):
-            self.__vocabulary.add(multiple_file.readLine().strip())
-        self.rootNode = NGramNode(True, multiple_file)
+            self.__vocabulary.addWord(multiple_file.readLine().strip())
+        self.rootNode = NGramNode(True, multiple_file, self.__vocabulary)
+        self.__frozen_tree = None
+        self.__counts_of_counts = None
+        self.__clearContextCache()
+
+    def initWithLazyFile(self,
+                         fileName: str,
+                         maximumSubtrees: int = None):
+        """
+        Opens an NGram saved with saveAsBinary in lazy mode. Only the header, the vocabulary, the root and the first
+        level of the NGram tree are read. The subtree of a first word is read from the file when getProbability or
+        getCount first needs it, so startup time and memory depend on the contexts actually queried instead of on
+        the size of the model. The NGram is frozen. The file is kept open until close is called, or the NGram is
+        used in a with statement.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the binary NGram file.
+        maximumSubtrees : int
+            maximum number of first word subtrees kept in memory, the least recently used subtree is evicted when
+            the limit is exceeded. If None, loaded subtrees are never evicted.
+        """
+        self.close()
+        binary_file = NGramBinaryFile(fileName)
+        self.__N, lambdas, self.__probability_of_unseen, words, layout = binary_file.readHeader()
+        self.__readLambdas(lambdas)
+        self.__interpolated = False
+        self.__vocabulary = Vocabulary(words)
+        self.__frozen_tree = LazyNGramTree(binary_file, layout, maximumSubtrees)
+        self.__context_cache = None
+        self.__counts_of_counts = None
+        self.__dictionary = None
+        self.rootNode = None
 
     def merge(self, toBeMerged: NGram):
         """
         Merges current NGram with the given NGram. If N of the two NGram's are not same, it does not
-        merge. Merges first the vocabulary, then the NGram trees.
+        merge. Merges first the vocabulary, then the NGram trees. Since the two NGram's index their words differently,
+        the symbols of the given NGram tree are translated to the indexes of this NGram while merging. If the
+        vocabulary of this NGram is closed, words of the given NGram not in its dictionary are merged into the unknown
+        word.
         :param toBeMerged: NGram to be merged with.
         """
+        self.__requireMutable()
+        toBeMerged.__requireMutable()
         if self.__N != toBeMerged.getN():
             return
-        self.__vocabulary.update(toBeMerged.__vocabulary)
-        self.rootNode.merge(toBeMerged.rootNode)
+        # The last item translates the unknown word -1 to itself.
+        symbol_map = self.__vocabulary.addWords(list(toBeMerged.__vocabulary), self.__dictionary) + [-1]
+        self.rootNode.merge(toBeMerged.rootNode, symbol_map, self.__counts_of_counts)
+        self.__clearContextCache()
+
+    def freeze(self):
+        """
+        Converts the NGram tree into a read-only FrozenNGramTree, which keeps the counts and probabilities of each
+        level in NumPy arrays instead of NGramNode objects. The NGram tree is discarded afterwards, getProbability,
+        getCount and getPerplexity continue to work on the frozen tree, but counts and probabilities can no longer be
+        changed, the methods changing them raise a ValueError.
+        """
+        if self.__frozen_tree is None:
+            self.__frozen_tree = FrozenNGramTree(self.rootNode)
+            self.rootNode = None
+            self.__clearContextCache()
+
+    def isFrozen(self) -> bool:
+        """
+        RETURNS
+        -------
+        bool
+            True if the NGram tree is frozen, false otherwise.
+        """
+        return self.__frozen_tree is not None
+
+    def close(self):
+        """
+        Closes the binary file of an NGram opened with initWithLazyFile, no subtree can be loaded afterwards. Other
+        NGram's keep no file open, so nothing is done for them.
+        """
+        if isinstance(self.__frozen_tree, LazyNGramTree):
+            self.__frozen_tree.close()
+
+    def __enter__(self) -> NGram:
+        """
+        RETURNS
+        -------
+        NGram
+            this NGram, which is closed when the with statement is left.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes this NGram when the with statement is left.
+        """
+        self.close()
+
+    def __requireMutable(self):
+        """
+        Checks that the NGram tree can be changed. Frozen NGram's, and NGram's loaded from binary files or in lazy
+        mode, keep only a read-only tree.
+        """
+        if self.__frozen_tree is not None:
+            raise ValueError("NGram is frozen/read-only, its NGram tree can not be changed")
+
+    def __lookupTree(self):
+        """
+        RETURNS
+        -------
+        NGramNode or FrozenNGramTree
+            the tree used for probability and count lookups.
+        """
+        if self.__frozen_tree is not None:
+            return self.__frozen_tree
+        return self.rootNode
+
+    def setContextCacheSize(self, maximumSize: int):
+        """
+        Enables or disables the context cache. When enabled, getProbability keeps the tree nodes its contexts resolve
+        to in a ContextCache, so a repeated context, such as the sentence start or a common pair of function words,
+        is not searched in the tree again. Every call that changes the tree or its probabilities clears the cache.
+        The cache is not used by a lazy NGram, which keeps its own cache of subtrees.
+
+        PARAMETERS
+        ----------
+        maximumSize : int
+            maximum number of contexts kept in the cache, the least recently used context is evicted when the limit
+            is exceeded. If None or 0, the cache is disabled.
+        """
+        if maximumSize is None or maximumSize <= 0 or isinstance(self.__frozen_tree, LazyNGramTree):
+            self.__context_cache = None
+        else:
+            self.__context_cache = ContextCache(maximumSize)
+
+    def getContextCache(self) -> ContextCache:
+        """
+        RETURNS
+        -------
+        ContextCache
+            context cache of this NGram, with its hit and miss counters, None if the cache is disabled.
+        """
+        return self.__context_cache
+
+    def __clearContextCache(self):
+        """
+        Removes all contexts from the context cache, if it is enabled.
+        """
+        if self.__context_cache is not None:
+            self.__context_cache.clear()
+
+    def getVocabulary(self) -> Vocabulary:
+        """
+        RETURNS
+        -------
+        Vocabulary
+            vocabulary of this NGram, mapping each word to the integer symbol used in the NGram tree.
+        """
+        return self.__vocabulary
 
     def getN(self) -> int:
         """
@@ -111,7 +313,9 @@ class NGram:
 
     def setN(self, N: int):
         """
-        Set size of ngram.
+        Set size of ngram. The per-level lists are resized to the new size, the counts of counts are calculated
+        again when they are first needed, and the context cache is cleared, since the contexts whose probabilities
+        are interpolated change with N.
 
         PARAMETERS
         ----------
@@ -119,12 +323,18 @@ class NGram:
             size of ngram
         """
         self.__N = N
+        self.__probability_of_unseen = (list(self.__probability_of_unseen) + N * [0.0])[:N]
+        self.__readLambdas(self.__lambdas)
+        self.__counts_of_counts = None
+        self.__clearContextCache()
 
     def addNGramSentence(self,
                          symbols: list,
                          sentenceCount: int = 1):
         """
-        Adds given sentence to set the vocabulary and create and add ngrams of the sentence to NGramNode the rootNode
+        Adds given sentence to the vocabulary and create and add ngrams of the sentence to NGramNode the rootNode. The
+        words of the sentence are translated to their vocabulary indexes once, the NGram tree is keyed by those
+        indexes.
 
         PARAMETERS
         ----------
@@ -133,23 +343,69 @@ class NGram:
         sentenceCount : int
             Number of times this sentence is added.
         """
-        for s in symbols:
-            self.__vocabulary.add(s)
-        for j in range(len(symbols) - self.__N + 1):
-            self.rootNode.addNGram(symbols, j, self.__N, sentenceCount)
+        self.__requireMutable()
+        indexes = self.__vocabulary.addWords(symbols, self.__dictionary)
+        for j in range(len(indexes) - self.__N + 1):
+            self.rootNode.addNGram(indexes, j, self.__N, sentenceCount, self.__counts_of_counts)
+        self.__clearContextCache()
+
+    def addCorpusFile(self, fileName: str):
+        """
+        Adds the sentences of the given corpus file to this NGram. The file is read line by line, each line is a
+        sentence whose words are separated by whitespace. Only the distinct N-Grams are kept in memory while counting.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the corpus file.
+        """
+        self.addNGramCounter(NGramCounter(self.__N, CorpusFile(fileName), self.__dictionary))
+
+    def addNGramCounter(self, counter: NGramCounter):
+        """
+        Adds the N-Gram counts aggregated by the given counter to this NGram. The words of the counter's vocabulary
+        are added to the vocabulary, and every distinct N-Gram is inserted once into the NGram tree with its total
+        count. If the vocabulary of this NGram is closed, words not in its dictionary are added as the unknown word.
+        The cyclic garbage collector is suspended while the nodes are allocated, since none of them can be garbage and
+        every collection would traverse the whole tree.
+
+        PARAMETERS
+        ----------
+        counter : NGramCounter
+            Counter whose N-Gram counts are added, an NGramCounter or a LossyNGramCounter.
+        """
+        self.__requireMutable()
+        if counter.getN() != self.__N:
+            return
+        if self.vocabularySize() == 0 and (self.__dictionary is None or counter.getDictionary() is self.__dictionary):
+            symbol_map = None
+            for word in counter.getVocabulary():
+                self.__vocabulary.addWord(word)
+        else:
+            # The last item translates the unknown word -1 to itself.
+            symbol_map = self.__vocabulary.addWords(list(counter.getVocabulary()), self.__dictionary) + [-1]
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.rootNode.addNGramCounts(counter.getCounts(), symbol_map, self.__counts_of_counts)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.__clearContextCache()
 
     def addNGram(self, symbols: list):
         """
-        Adds given array of symbols to set the vocabulary and to NGramNode the rootNode
+        Adds given array of symbols to the vocabulary and to NGramNode the rootNode
 
         PARAMETERS
         ----------
         symbols : list
             ngram added.
         """
-        for s in symbols:
-            self.__vocabulary.add(s)
-        self.rootNode.addNGram(symbols, 0, self.__N)
+        self.__requireMutable()
+        self.rootNode.addNGram(self.__vocabulary.addWords(symbols, self.__dictionary), 0, self.__N, 1,
+                               self.__counts_of_counts)
+        self.__clearContextCache()
 
     def vocabularySize(self) -> int:
         """
@@ -158,7 +414,7 @@ class NGram:
         int
             vocabulary size.
         """
-        return len(self.__vocabulary)
+        return self.__vocabulary.size()
 
     def setLambda2(self, lambda1: float):
         """
@@ -171,8 +427,7 @@ class NGram:
             interpolation ratio for bigram probabilities
         """
         if self.__N == 2:
-            self.__interpolated = True
-            self.__lambda1 = lambda1
+            self.setLambdas([lambda1])
 
     def setLambda3(self, lambda1: float, lambda2: float):
         """
@@ -187,9 +442,32 @@ class NGram:
             interpolation ratio for bigram probabilities
         """
         if self.__N == 3:
+            self.setLambdas([lambda1, lambda2])
+
+    def setLambdas(self, lambdas: list):
+        """
+        Sets lambdas, interpolation ratios, for an NGram of any N > 1.
+        ie. lambdas[0] * NGramProbability + lambdas[1] * (N-1)GramProbability + ... + lambdas[N - 2] *
+        bigramProbability + (1 - lambdas[0] - ... - lambdas[N - 2]) * unigramProbability
+
+        PARAMETERS
+        ----------
+        lambdas : list
+            N - 1 interpolation ratios, for N-Gram, (N-1)-Gram, ..., bigram probabilities respectively.
+        """
+        if self.__N > 1 and len(lambdas) == self.__N - 1:
             self.__interpolated = True
-            self.__lambda1 = lambda1
-            self.__lambda2 = lambda2
+            self.__lambdas = list(lambdas)
+            self.__clearContextCache()
+
+    def getLambdas(self) -> list:
+        """
+        RETURNS
+        -------
+        list
+            interpolation ratios for N-Gram, (N-1)-Gram, ..., bigram probabilities respectively.
+        """
+        return list(self.__lambdas)
 
     def calculateNGramProbabilitiesTrained(self,
                                            corpus: list,
@@ -230,6 +508,21 @@ class NGram:
         """
         simpleSmoothing.setProbabilities(self, level)
 
+    def calculateNGramProbabilitiesSimpleLevels(self,
+                                                simpleSmoothing: SimpleSmoothing,
+                                                levels: list):
+        """
+        Calculates NGram probabilities of several levels given simple smoothing. Simple smoothing methods set the
+        probabilities of all levels in a single traversal of the NGram tree where they can.
+
+        PARAMETERS
+        ----------
+        simpleSmoothing : SimpleSmoothing
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        simpleSmoothing.setProbabilitiesOfLevels(self, levels)
+
     def replaceUnknownWords(self, dictionary: set):
         """
         Replaces words not in set given dictionary.
@@ -239,7 +532,15 @@ class NGram:
         dictionary : set
             dictionary of known words.
         """
-        self.rootNode.replaceUnknownWords(dictionary)
+        self.__requireMutable()
+        known_symbols = set()
+        for word in dictionary:
+            index = self.__vocabulary.getIndex(word)
+            if index != -1:
+                known_symbols.add(index)
+        self.rootNode.replaceUnknownWords(known_symbols)
+        self.__counts_of_counts = None
+        self.__clearContextCache()
 
     def constructDictionaryWithNonRareWords(self,
                                             level: int,
@@ -261,111 +562,149 @@ class NGram:
             set of nonrare words.
         """
         result = set()
-        word_counter = CounterHashMap()
-        self.rootNode.countWords(word_counter, level)
-        total = word_counter.sumOfCounts()
-        for symbol in word_counter.keys():
-            if word_counter[symbol] / total > probability:
-                result.add(symbol)
+        for symbol in self.__nonRareSymbols(level, probability):
+            result.add(self.__vocabulary.getWord(symbol))
         return result
 
-    def __getUniGramPerplexity(self, corpus: list) -> float:
+    def __nonRareSymbols(self,
+                         level: int,
+                         probability: float) -> set:
         """
-        Calculates unigram perplexity of given corpus. First sums negative log likelihoods of all unigrams in corpus.
-        Then returns exp of average negative log likelihood.
+        Finds the symbols of the nonrare words with given N-Gram level and probability threshold. The counts of the
+        words are kept in a list indexed by their symbols.
 
         PARAMETERS
         ----------
-        corpus : list
-            corpus whose unigram perplexity is calculated.
+        level : int
+            Level for counting words.
+        probability : float
+            probability threshold for nonrare words.
 
         RETURNS
         -------
-        float
-            unigram perplexity of corpus.
+        set
+            set of the symbols of nonrare words.
         """
-        total = 0
-        count = 0
-        for i in range(len(corpus)):
-            for j in range(len(corpus[i])):
-                p = self.getProbability(corpus[i][j])
-                total -= math.log(p)
-                count += 1
-        return math.exp(total / count)
+        self.__requireMutable()
+        symbol_counts = [0] * self.vocabularySize()
+        self.rootNode.countSymbols(symbol_counts, level)
+        total = sum(symbol_counts)
+        result = set()
+        for symbol in range(len(symbol_counts)):
+            if symbol_counts[symbol] > 0 and symbol_counts[symbol] / total > probability:
+                result.add(symbol)
+        return result
 
-    def __getBiGramPerplexity(self, corpus: list) -> float:
+    def setProbabilityWithNonRareWords(self,
+                                       level: int,
+                                       probability: float):
         """
-        Calculates bigram perplexity of given corpus. First sums negative log likelihoods of all bigrams in corpus.
-        Then returns exp of average negative log likelihood.
+        Replaces the words that are rare in the given level with the unknown word, and sets the probabilities of the
+        level with no smoothing. The words of the level are counted in one traversal of the NGram tree, and the words
+        are replaced and the probabilities are set together in a second traversal.
 
         PARAMETERS
         ----------
-        corpus : list
-            corpus whose bigram perplexity is calculated.
+        level : int
+            Level for counting words and for setting probabilities. If level = 1, N-Gram is treated as UniGram, if
+            level = 2, N-Gram is treated as Bigram, etc.
+        probability : float
+            probability threshold for nonrare words.
+        """
+        self.__requireMutable()
+        known_symbols = self.__nonRareSymbols(level, probability)
+        self.rootNode.replaceUnknownWordsWithPseudoCount(known_symbols, 0.0, level, self.vocabularySize())
+        self.__probability_of_unseen[level - 1] = 0.0
+        self.__counts_of_counts = None
+        self.__clearContextCache()
+
+    def __getWindows(self,
+                     corpus,
+                     chunkSize: int = 65536):
+        """
+        Converts the sentences of the given corpus to vocabulary indexes and yields all N-Grams of the sentences, that
+        is N consecutive indexes not crossing a sentence boundary, as 2-D arrays. The corpus is iterated only once and
+        the N-Grams are yielded in chunks of about chunkSize words, so that the memory used does not depend on the size
+        of the corpus.
+
+        PARAMETERS
+        ----------
+        corpus
+            list, or any other iterable, of sentences.
+        chunkSize : int
+            number of words after which the N-Grams collected so far are yielded.
 
         RETURNS
         -------
-        float
-            bigram perplexity of corpus.
+        generator
+            2-D arrays of vocabulary indexes, each row is an N-Gram.
         """
-        total = 0
-        count = 0
-        for i in range(len(corpus)):
-            for j in range(len(corpus[i]) - 1):
-                p = self.getProbability(corpus[i][j],
-                                        corpus[i][j + 1])
-                total -= math.log(p)
-                count += 1
-        return math.exp(total / count)
-
-    def __getTriGramPerplexity(self, corpus: list) -> float:
+        words = []
+        ends = []
+        for sentence in corpus:
+            words.extend(sentence)
+            ends.append(len(words))
+            if len(words) >= chunkSize:
+                yield self.__windowsOfChunk(self.__vocabulary.getIndexes(words), ends)
+                words = []
+                ends = []
+        if len(words) > 0:
+            yield self.__windowsOfChunk(self.__vocabulary.getIndexes(words), ends)
+
+    def __windowsOfChunk(self,
+                         indexes: list,
+                         ends: list) -> numpy.ndarray:
         """
-        Calculates trigram perplexity of given corpus. First sums negative log likelihoods of all trigrams in corpus.
-        Then returns exp of average negative log likelihood.
+        Gets all N-Grams of consecutive sentences stored one after another.
 
         PARAMETERS
         ----------
-        corpus : list
-            corpus whose trigram perplexity is calculated.
+        indexes : list
+            vocabulary indexes of the words of the sentences.
+        ends : list
+            position after the last word of each sentence in indexes.
 
         RETURNS
         -------
-        float
-            trigram perplexity of corpus.
+        numpy.ndarray
+            2-D array of vocabulary indexes, each row is an N-Gram.
         """
-        total = 0
-        count = 0
-        for i in range(len(corpus)):
-            for j in range(len(corpus[i]) - 2):
-                p = self.getProbability(corpus[i][j],
-                                        corpus[i][j + 1],
-                                        corpus[i][j + 2])
-                total -= math.log(p)
-                count += 1
-        return math.exp(total / count)
-
-    def getPerplexity(self, corpus: list) -> float:
+        flat = numpy.array(indexes, dtype=numpy.int64)
+        if len(flat) < self.__N:
+            return numpy.zeros((0, self.__N), dtype=numpy.int64)
+        ends = numpy.array(ends, dtype=numpy.int64)
+        sentence_ends = numpy.repeat(ends, numpy.diff(ends, prepend=0))
+        windows = numpy.lib.stride_tricks.sliding_window_view(flat, self.__N)
+        return windows[numpy.arange(len(windows)) + self.__N <= sentence_ends[:len(windows)]]
+
+    def getPerplexity(self, corpus) -> float:
         """
-        Calculates the perplexity of given corpus depending on N-Gram model (unigram, bigram, trigram, etc.)
+        Calculates the perplexity of given corpus depending on N-Gram model. All N-Grams of the sentences are scored
+        with getProbabilities in chunks and their negative log likelihoods are summed with NumPy, instead of one lookup
+        and one log per word. If N is 1, 2 or 3, the probabilities are the ones getProbability returns, interpolated if
+        the model is interpolated. For larger N, the N-Gram probabilities are used. Then returns exp of average
+        negative log likelihood. The corpus is iterated only once, sentence by sentence, so it can also be a generator
+        or a CorpusFile.
 
         PARAMETERS
         ----------
-        corpus : list
-            corpus whose perplexity is calculated.
+        corpus
+            list, or any other iterable, of sentences whose perplexity is calculated.
 
         RETURNS
         -------
         float
             perplexity of given corpus
         """
-        if self.__N == 1:
-            return self.__getUniGramPerplexity(corpus)
-        elif self.__N == 2:
-            return self.__getBiGramPerplexity(corpus)
-        elif self.__N == 3:
-            return self.__getTriGramPerplexity(corpus)
-        else:
-            return 0
+        total = 0.0
+        count = 0
+        for windows in self.__getWindows(corpus):
+            probabilities = self.getProbabilities(windows)
+            if (probabilities <= 0).any():
+                raise ValueError("math domain error")
+            total -= float(numpy.log(probabilities).sum())
+            count += len(windows)
+        return math.exp(total / count)
 
     def getProbability(self, *args) -> float:
         """
@@ -374,6 +713,9 @@ class NGram:
         only bigram probability.
         If N is 3, if interpolated is true, then returns interpolated trigram, bigram and unigram probability, otherwise
         returns only trigram probability.
+        In general, if interpolated is true and N symbols are given, the probabilities of all orders are found with a
+        single getInterpolationProbabilities call of the tree and interpolated with the ratios set by setLambdas.
+        Otherwise returns the probability of the given sequence, which may be shorter than N.
 
         PARAMETERS
         ----------
@@ -385,91 +727,355 @@ class NGram:
         float
             probability of given sequence.
         """
-        if self.__N == 1:
-            return self.__getUniGramProbability(args[0])
-        elif self.__N == 2:
-            if len(args) == 1:
-                return self.__getUniGramProbability(args[0])
-            if self.__interpolated:
-                return self.__lambda1 * self.__getBiGramProbability(args[0], args[1]) + (1 - self.__lambda1) \
-                       * self.__getUniGramProbability(args[1])
-            else:
-                return self.__getBiGramProbability(args[0], args[1])
-        elif self.__N == 3:
-            if len(args) == 1:
-                return self.__getUniGramProbability(args[0])
-            elif len(args) == 2:
-                return self.__getBiGramProbability(args[0], args[1])
-            if self.__interpolated:
-                return self.__lambda1 * self.__getTriGramProbability(args[0], args[1], args[2]) + \
-                       self.__lambda2 * self.__getBiGramProbability(args[1], args[2]) + \
-                       (1 - self.__lambda1 - self.__lambda2) * self.__getUniGramProbability(args[2])
+        return self.__getProbability(*self.__vocabulary.getIndexes(args))
+
+    def __getProbability(self, *args) -> float:
+        """
+        Gets probability of sequence of symbol indexes depending on N in N-Gram. See getProbability.
+
+        PARAMETERS
+        ----------
+        args
+            vocabulary indexes of the sequence of symbols.
+
+        RETURNS
+        -------
+        float
+            probability of given sequence.
+        """
+        if self.__context_cache is not None:
+            return self.__getCachedProbability(args)
+        if len(args) == self.__N and self.__interpolated:
+            return self.__interpolate(self.__lookupTree().getInterpolationProbabilities(args))
+        probability = self.__lookupTree().getNGramProbability(args)
+        if probability is None:
+            return self.__probability_of_unseen[len(args) - 1]
+        return probability
+
+    def __getCachedProbability(self, args: tuple) -> float:
+        """
+        Gets probability of sequence of symbol indexes as __getProbability does, taking the context nodes from the
+        context cache. The cache maps the context, all symbols but the last, to the nodes of its suffixes the
+        probability needs: all of them, the longest first, if the probability is interpolated, only the context
+        itself otherwise. If the context is not in the cache, its nodes are searched in the tree and cached.
+
+        PARAMETERS
+        ----------
+        args : tuple
+            vocabulary indexes of the sequence of symbols.
+
+        RETURNS
+        -------
+        float
+            probability of given sequence.
+        """
+        context = args[:-1]
+        interpolated = len(args) == self.__N and self.__interpolated
+        cache = self.__context_cache
+        nodes = cache.get(context, cache)
+        if nodes is cache:
+            if interpolated:
+                nodes = tuple([self.__findContext(context[i:]) for i in range(len(args))])
             else:
-                return self.__getTriGramProbability(args[0], args[1], args[2])
+                nodes = (self.__findContext(context),)
+            cache.put(context, nodes)
+        symbol = args[-1]
+        tree = self.__frozen_tree
+        if tree is None:
+            probabilities = [None if node is None else node.getUniGramProbability(symbol) for node in nodes]
         else:
-            return 0.0
+            level = len(context)
+            probabilities = []
+            for node in nodes:
+                probabilities.append(None if node is None else tree.getChildProbability(level, node, symbol))
+                level -= 1
+        if interpolated:
+            return self.__interpolate(probabilities)
+        if probabilities[0] is None:
+            return self.__probability_of_unseen[len(context)]
+        return probabilities[0]
+
+    def __findContext(self, context: tuple):
+        """
+        Searches the node of the given context in the tree, following the unknown nodes for the symbols not found.
 
-    def __getUniGramProbability(self, w1) -> float:
+        PARAMETERS
+        ----------
+        context : tuple
+            vocabulary indexes of the context.
+
+        RETURNS
+        -------
+        object
+            the NGramNode of the context, or its index in its level for a frozen tree, None if the context is not
+            found.
         """
-        Gets unigram probability of given symbol.
+        if self.__frozen_tree is None:
+            node = self.rootNode
+            for symbol in context:
+                node = node.getChildOrUnknown(symbol)
+                if node is None:
+                    return None
+            return node
+        index = 0
+        for level in range(len(context)):
+            index = self.__frozen_tree.findChildOrUnknown(level, index, context[level])
+            if index == -1:
+                return None
+        return index
+
+    def __interpolate(self, probabilities: list) -> float:
+        """
+        Interpolates the probabilities of a symbol after each suffix of an N - 1 symbol context with the ratios set
+        by setLambdas.
 
         PARAMETERS
         ----------
-        w1
-            a unigram symbol.
+        probabilities : list
+            N probabilities of the highest order first, as returned by getInterpolationProbabilities. None for the
+            contexts that are not found, which get the probability of unseen N-Grams of their order.
 
         RETURNS
         -------
         float
-            probability of given unigram.
+            interpolated probability.
+        """
+        probability = 0.0
+        rest = 1.0
+        order = self.__N
+        for ratio, component in zip(self.__lambdas, probabilities):
+            if component is None:
+                component = self.__probability_of_unseen[order - 1]
+            probability += ratio * component
+            rest -= ratio
+            order -= 1
+        return probability + rest * probabilities[-1]
+
+    def __toIndexArray(self, ngrams) -> numpy.ndarray:
+        """
+        Converts the given N-Grams to a 2-D array of vocabulary indexes.
+
+        PARAMETERS
+        ----------
+        ngrams
+            either a 2-D array of vocabulary indexes, or a list of tuples of words.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            2-D array of vocabulary indexes, words not in the vocabulary are -1.
         """
-        return self.rootNode.getUniGramProbability(w1)
+        if isinstance(ngrams, numpy.ndarray):
+            return ngrams.astype(numpy.int64, copy=False).reshape(len(ngrams), -1)
+        return numpy.array([self.__vocabulary.getIndexes(ngram) for ngram in ngrams],
+                           dtype=numpy.int64).reshape(len(ngrams), -1)
 
-    def __getBiGramProbability(self, w1, w2) -> float:
+    def __getKGramProbabilities(self, ngrams: numpy.ndarray) -> numpy.ndarray:
         """
-        Gets bigram probability of given symbols.
+        Gets the probabilities of N-Grams of the same length k, without interpolation. N-Grams whose context is not
+        found get the probability of unseen k-grams.
 
         PARAMETERS
         ----------
-        w1
-            first gram of bigram
-        w2
-            second gram of bigram
+        ngrams : numpy.ndarray
+            2-D array of vocabulary indexes, each row is a k-gram.
 
         RETURNS
         -------
-        float
-            probability of bigram formed by w1 and w2.
+        numpy.ndarray
+            probabilities of the k-grams.
         """
-        probability = self.rootNode.getBiGramProbability(w1, w2)
-        if probability is not None:
-            return probability
+        k = ngrams.shape[1]
+        if isinstance(self.__frozen_tree, FrozenNGramTree):
+            result = self.__frozen_tree.getProbabilities(ngrams)
+        elif self.__frozen_tree is not None:
+            result = numpy.array([self.__frozen_tree.getNGramProbability(ngram) for ngram in ngrams.tolist()],
+                                 dtype=numpy.float64)
         else:
-            return self.__probability_of_unseen[1]
+            columns = [column.tolist() for column in ngrams.T]
+            result = numpy.array(self.rootNode.getProbabilities(columns), dtype=numpy.float64)
+        result[numpy.isnan(result)] = self.__probability_of_unseen[k - 1]
+        return result
 
-    def __getTriGramProbability(self, w1, w2, w3) -> float:
+    def getProbabilities(self, ngrams) -> numpy.ndarray:
         """
-        Gets trigram probability of given symbols.
+        Gets the probabilities of many N-Grams of the same length at once. The result is the same as calling
+        getProbability for each N-Gram, but every context is resolved only once: N-Grams are grouped by their context
+        for an NGram tree, and all N-Grams descend a frozen tree together, one vectorized binary search per level.
+        If interpolated, the interpolation is applied to whole arrays of component probabilities.
 
         PARAMETERS
         ----------
-        w1
-            first gram of trigram
-        w2
-            second gram of trigram
-        w3
-            third gram of trigram
+        ngrams
+            either a 2-D array of vocabulary indexes (see getVocabulary), or a list of tuples of words. All N-Grams
+            must have the same length, at most N.
 
         RETURNS
         -------
-        float
-            probability of trigram formed by w1, w2, w3.
+        numpy.ndarray
+            probabilities of the N-Grams.
         """
-        probability = self.rootNode.getTriGramProbability(w1, w2, w3)
-        if probability is not None:
-            return probability
+        indexes = self.__toIndexArray(ngrams)
+        k = indexes.shape[1]
+        if k < 1 or k > self.__N:
+            raise ValueError("N-Grams of length " + str(k) + " can not be scored by a " + str(self.__N) + "-Gram")
+        if len(indexes) == 0:
+            return numpy.zeros(0, dtype=numpy.float64)
+        if k == self.__N and self.__interpolated:
+            result = 0.0
+            rest = 1.0
+            for i in range(len(self.__lambdas)):
+                result = result + self.__lambdas[i] * self.__getKGramProbabilities(indexes[:, i:])
+                rest -= self.__lambdas[i]
+            return result + rest * self.__getKGramProbabilities(indexes[:, k - 1:])
+        return self.__getKGramProbabilities(indexes)
+
+    def getComponentProbabilities(self, corpus) -> numpy.ndarray:
+        """
+        Gets the probabilities of all orders of each N-Gram of the given corpus, without interpolation. The N-Grams
+        are the ones getPerplexity scores. Since these probabilities do not depend on the interpolation ratios, the
+        probability of every N-Gram for any ratios is the dot product of its row with the ratios followed by the
+        unigram weight, so ratios can be tuned without looking up the tree again.
+
+        PARAMETERS
+        ----------
+        corpus
+            list, or any other iterable, of sentences.
+
+        RETURNS
+        -------
+        numpy.ndarray
+            2-D array with one row for each N-Gram and N columns. Column i is the probability of the last word after
+            the last N - i - 1 words, so the N-Gram probability comes first and the unigram probability last.
+        """
+        matrices = [numpy.zeros((0, self.__N), dtype=numpy.float64)]
+        for windows in self.__getWindows(corpus):
+            if len(windows) > 0:
+                matrices.append(numpy.stack([self.__getKGramProbabilities(windows[:, i:])
+                                             for i in range(self.__N)], axis=1))
+        return numpy.concatenate(matrices)
+
+    def getCountStatistics(self, corpus) -> tuple:
+        """
+        Gets the count of each N-Gram of the given corpus together with the sum of the counts of the children of its
+        context, which are all that additive smoothing needs to find its probability for any pseudocount. The N-Grams
+        are the ones getPerplexity scores. Words not found in a context are treated as getProbability treats them, the
+        count of the unknown node is used if there is one. The NGram tree must not be frozen.
+
+        PARAMETERS
+        ----------
+        corpus
+            list, or any other iterable, of sentences.
+
+        RETURNS
+        -------
+        tuple
+            counts and childSums arrays with one element for each N-Gram. childSums is NaN for the N-Grams whose
+            context is not found in the tree.
+        """
+        self.__requireMutable()
+        counts = []
+        child_sums = []
+        contexts = {}
+        for windows in self.__getWindows(corpus):
+            for ngram in windows.tolist():
+                context = tuple(ngram[:-1])
+                if context in contexts:
+                    node, child_sum = contexts[context]
+                else:
+                    node = self.__findContext(context)
+                    child_sum = node.childSum() if node is not None else math.nan
+                    contexts[context] = (node, child_sum)
+                child = node.getChildOrUnknown(ngram[-1]) if node is not None else None
+                counts.append(child.getCount() if child is not None else 0)
+                child_sums.append(child_sum)
+        return numpy.array(counts, dtype=numpy.float64), numpy.array(child_sums, dtype=numpy.float64)
+
+    def getInitialState(self, *args) -> NGramState:
+        """
+        Gets the state of a left-to-right decoder that has seen the given words, usually nothing or the sentence start
+        symbol. Words are then scored one at a time with advance.
+
+        PARAMETERS
+        ----------
+        args
+            words already seen.
+
+        RETURNS
+        -------
+        NGramState
+            state after the given words.
+        """
+        if self.__frozen_tree is None:
+            state = NGramState((), (self.rootNode,))
+        elif isinstance(self.__frozen_tree, FrozenNGramTree):
+            state = NGramState((), (0,))
         else:
-            return self.__probability_of_unseen[2]
+            state = NGramState((), ())
+        for word in args:
+            state = self.advance(state, word)[1]
+        return state
+
+    def advance(self,
+                state: NGramState,
+                word: str) -> tuple:
+        """
+        Scores the next word of a hypothesis and extends its state. The probability of the word is the one
+        getProbability returns for the history of the state followed by the word, but the contexts are not searched
+        from the root: the state keeps the context node of each suffix of its history, so the word is looked up as a
+        child of each of these nodes, and the children found become the context nodes of the new state.
+        A lazy NGram keeps no nodes in its states and looks the contexts up in its subtrees.
+
+        PARAMETERS
+        ----------
+        state : NGramState
+            state of the hypothesis, created by getInitialState or advance of this NGram.
+        word : str
+            next word of the hypothesis.
+
+        RETURNS
+        -------
+        tuple
+            natural logarithm of the probability of the word, -inf if the probability is zero, and the new state.
+        """
+        symbol = self.__vocabulary.getIndex(word)
+        history = state.getHistory()
+        nodes = state.getNodes()
+        context_length = len(history)
+        interpolated = self.__interpolated and context_length == self.__N - 1
+        tree = self.__frozen_tree
+        if tree is None:
+            if interpolated:
+                probabilities = [None if node is None else node.getUniGramProbability(symbol) for node in nodes[::-1]]
+            else:
+                node = nodes[context_length]
+                probabilities = [None if node is None else node.getUniGramProbability(symbol)]
+            next_nodes = [self.rootNode]
+            for node in nodes[:self.__N - 1]:
+                next_nodes.append(None if node is None else node.getChildOrUnknown(symbol))
+        elif isinstance(tree, FrozenNGramTree):
+            levels = range(context_length, -1, -1) if interpolated else (context_length,)
+            probabilities = [None if nodes[level] is None else tree.getChildProbability(level, nodes[level], symbol)
+                             for level in levels]
+            next_nodes = [0]
+            for level in range(min(context_length + 1, self.__N - 1)):
+                child = -1 if nodes[level] is None else tree.findChildOrUnknown(level, nodes[level], symbol)
+                next_nodes.append(None if child == -1 else child)
+        else:
+            if interpolated:
+                probabilities = tree.getInterpolationProbabilities(history + (symbol,))
+            else:
+                probabilities = [tree.getNGramProbability(history + (symbol,))]
+            next_nodes = ()
+        if interpolated:
+            probability = self.__interpolate(probabilities)
+        elif probabilities[0] is None:
+            probability = self.__probability_of_unseen[context_length]
+        else:
+            probability = probabilities[0]
+        if self.__N > 1:
+            history = history[len(history) + 2 - self.__N:] + (symbol,)
+        return math.log(probability) if probability > 0 else -math.inf, NGramState(history, tuple(next_nodes))
 
     def getCount(self, symbols: list) -> int:
         """
@@ -485,7 +1091,25 @@ class NGram:
         int
             count of symbols.
         """
-        return self.rootNode.getCountForListItem(symbols, 0)
+        return self.__lookupTree().getCountForListItem(self.__vocabulary.getIndexes(symbols), 0)
+
+    def generateNextString(self, symbols: list) -> str:
+        """
+        Generates the word following the given sequence of symbols, drawn with the probabilities of the words after
+        it. The NGram tree must not be frozen.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of symbols, shorter than N.
+
+        RETURNS
+        -------
+        str
+            generated word.
+        """
+        self.__requireMutable()
+        return self.rootNode.generateNextString(symbols, 0, self.__vocabulary)
 
     def setProbabilityWithPseudoCount(self,
                                       pseudoCount: float,
@@ -501,6 +1125,7 @@ class NGram:
             height for NGram. if height = 1, If level = 1, N-Gram is treated as UniGram, if level = 2, N-Gram is treated
             as Bigram, etc.
         """
+        self.__requireMutable()
         if pseudoCount != 0:
             vocabulary_size = self.vocabularySize() + 1
         else:
@@ -510,40 +1135,66 @@ class NGram:
             self.__probability_of_unseen[height - 1] = 1.0 / vocabulary_size
         else:
             self.__probability_of_unseen[height - 1] = 0.0
+        self.__clearContextCache()
 
-    def __maximumOccurence(self, height: int) -> int:
+    def setProbabilityWithPseudoCounts(self, pseudoCounts: list):
         """
-        Find maximum occurrence in given height.
+        Sets probabilities of several levels by adding pseudocounts, in a single traversal of the NGram tree. The
+        probabilities are the same as the ones set by setProbabilityWithPseudoCount for each level.
 
         PARAMETERS
         ----------
-        height : int
-            height for occurrences. If height = 1, N-Gram is treated as UniGram, if height = 2, N-Gram is treated as
-            Bigram,
-            etc.
-
-        RETURNS
-        -------
-        int
-            maximum occurrence in given height.
+        pseudoCounts : list
+            pseudoCounts[i] is the pseudocount added to the N-Grams of height i + 1, None if the probabilities of that
+            height are not set.
         """
-        return self.rootNode.maximumOccurence(height)
-
-    def __updateCountsOfCounts(self,
-                               countsOfCounts: list,
-                               height: int):
+        self.__requireMutable()
+        levels = []
+        for height in range(1, len(pseudoCounts) + 1):
+            pseudoCount = pseudoCounts[height - 1]
+            if pseudoCount is None:
+                levels.append(None)
+                continue
+            if pseudoCount != 0:
+                vocabulary_size = self.vocabularySize() + 1
+                self.__probability_of_unseen[height - 1] = 1.0 / vocabulary_size
+            else:
+                vocabulary_size = self.vocabularySize()
+                self.__probability_of_unseen[height - 1] = 0.0
+            levels.append((pseudoCount, vocabulary_size))
+        while len(levels) > 0 and levels[-1] is None:
+            levels.pop()
+        if len(levels) > 0:
+            self.rootNode.setProbabilitiesWithPseudoCounts(levels)
+        self.__clearContextCache()
+
+    def getCountsOfCounts(self, height: int) -> dict:
         """
-        Update counts of counts of N-Grams with given counts of counts and given height.
+        Gets the sparse counts of counts of the N-Grams of the given height. Counts of counts are kept for every level
+        and updated while N-Grams are added or merged, so they are read without traversing the NGram tree. After
+        replacing unknown words or pruning, they are calculated again in a single traversal of the NGram tree when
+        they are first needed.
 
         PARAMETERS
         ----------
-        countsOfCounts : list
-            updated counts of counts.
         height : int
             height for NGram. If height = 1, N-Gram is treated as UniGram, if height = 2, N-Gram is treated as Bigram,
             etc.
+
+        RETURNS
+        -------
+        dict
+            number of N-Grams of the given height, keyed by their counts. Counts without N-Grams are not included.
         """
-        self.rootNode.updateCountsOfCounts(countsOfCounts, height)
+        self.__requireMutable()
+        if height < 1 or height > self.__N:
+            raise ValueError("Counts of counts of height " + str(height) + " do not exist in a " + str(self.__N) +
+                             "-Gram")
+        if self.__counts_of_counts is None:
+            counts_of_counts = [{} for _ in range(self.__N)]
+            self.rootNode.addCountsOfCounts(counts_of_counts)
+            self.__counts_of_counts = counts_of_counts
+        return dict(self.__counts_of_counts[height - 1])
 
     def calculateCountsOfCounts(self, height: int) -> list:
         """
@@ -558,11 +1209,12 @@ class NGram:
         RETURNS
         -------
         list
-            counts of counts of NGrams.
+            counts of counts of NGrams, the i'th item is the number of N-Grams occurring i times.
         """
-        max_count = self.__maximumOccurence(height)
-        counts_of_counts = [0] * (max_count + 2)
-        self.__updateCountsOfCounts(counts_of_counts, height)
+        sparse_counts = self.getCountsOfCounts(height)
+        counts_of_counts = [0] * (max(sparse_counts, default=0) + 2)
+        for count, number in sparse_counts.items():
+            counts_of_counts[count] = number
         return counts_of_counts
 
     def setAdjustedProbability(self,
@@ -582,8 +1234,39 @@ class NGram:
         pZero : float
             probability of zero.
         """
+        self.__requireMutable()
         self.rootNode.setAdjustedProbability(countsOfCounts, height, self.vocabularySize() + 1, pZero)
         self.__probability_of_unseen[height - 1] = 1.0 / (self.vocabularySize() + 1)
+        self.__clearContextCache()
+
+    def setAdjustedProbabilities(self,
+                                 countsOfCounts: list,
+                                 pZeros: list):
+        """
+        Sets adjusted probabilities of several levels with given counts of counts and pZeros, in a single traversal of
+        the NGram tree. The probabilities are the same as the ones set by setAdjustedProbability for each level.
+
+        PARAMETERS
+        ----------
+        countsOfCounts : list
+            countsOfCounts[i] is the estimated counts of counts of the N-Grams of height i + 1, None if the
+            probabilities of that height are not set.
+        pZeros : list
+            pZeros[i] is the probability of zero of the N-Grams of height i + 1.
+        """
+        self.__requireMutable()
+        levels = []
+        for height in range(1, len(countsOfCounts) + 1):
+            if countsOfCounts[height - 1] is None:
+                levels.append(None)
+                continue
+            levels.append((countsOfCounts[height - 1], self.vocabularySize() + 1, pZeros[height - 1]))
+            self.__probability_of_unseen[height - 1] = 1.0 / (self.vocabularySize() + 1)
+        while len(levels) > 0 and levels[-1] is None:
+            levels.pop()
+        if len(levels) > 0:
+            self.rootNode.setAdjustedProbabilities(levels)
+        self.__clearContextCache()
 
     def prune(self, threshold: float):
         """
@@ -591,8 +1274,11 @@ class NGram:
         pruned.
         :param threshold: Probability threshold used for pruning.
         """
+        self.__requireMutable()
         if 0.0 < threshold <= 1.0:
             self.rootNode.prune(threshold, self.__N - 1)
+            self.__counts_of_counts = None
+            self.__clearContextCache()
 
     def saveAsText(self, fileName: str):
         """
@@ -603,13 +1289,32 @@ class NGram:
         fileName : str
             String name of file where NGram is saved.
         """
+        self.__requireMutable()
         output_file = open(fileName, mode="w", encoding="utf8")
-        output_file.write(self.__N.__str__() + " " + self.__lambda1.__str__() + " " + self.__lambda2.__str__() + "\n")
+        lambdas = self.__lambdas + (2 - len(self.__lambdas)) * [0.0]
+        output_file.write(self.__N.__str__() + "".join(" " + value.__str__() for value in lambdas) + "\n")
         for p in self.__probability_of_unseen:
             output_file.write(p.__str__() + " ")
         output_file.write("\n")
         output_file.write(self.vocabularySize().__str__() + "\n")
         for symbol in self.__vocabulary:
             output_file.write(symbol.__str__() + "\n")
-        self.rootNode.saveAsText(True, output_file, 0)
+        self.rootNode.saveAsText(True, output_file, 0, self.__vocabulary)
         output_file.close()
+
+    def saveAsBinary(self, fileName: str):
+        """
+        Save this NGram to a binary file, which can be loaded back in near-constant time with NGram(fileName). See
+        NGramBinaryFile for the format.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            String name of file where NGram is saved.
+        """
+        if self.__frozen_tree is not None:
+            tree = self.__frozen_tree
+        else:
+            tree = FrozenNGramTree(self.rootNode)
+        NGramBinaryFile(fileName).save(self.__N, self.__lambdas, self.__probability_of_unseen,
+                                       self.__vocabulary, tree)
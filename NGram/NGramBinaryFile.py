@@ -0,0 +1,204 @@
+import struct
+
+import numpy
+
+from NGram.FrozenNGramTree import FrozenNGramTree
+from NGram.NGramNode import NGramNode
+from NGram.Vocabulary import Vocabulary
+
+
+class NGramBinaryFile:
+
+    MAGIC = b"NGRAMBIN"
+    VERSION = 1
+
+    __file_name: str
+
+    def __init__(self, fileName: str):
+        """
+        Constructor of NGramBinaryFile. The binary N-Gram format consists of
+        - a header: the magic bytes, the format version, N, the first two interpolation ratios, the number of levels
+        and the number of further interpolation ratios, which is nonzero only for interpolated models with N > 3,
+        - the probabilities of unseen N-Grams for each level, followed by the further interpolation ratios,
+        - the vocabulary as a string table in index order: the number of words, the length of the table, the start
+        offsets of the words followed by the end of the last word, and the UTF-8 encoded words one after another,
+        - the number of nodes of each level of the frozen N-Gram tree,
+        - for each level, the symbol, count, probability, probability of unseen and child start arrays of the
+        FrozenNGramTree.
+        All numbers are little endian and every array starts at a multiple of 8 bytes, so that the arrays can be used
+        directly from a memory mapping of the file without parsing any node.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the binary N-Gram file.
+        """
+        self.__file_name = fileName
+
+    def getFileName(self) -> str:
+        """
+        RETURNS
+        -------
+        str
+            name of the binary N-Gram file.
+        """
+        return self.__file_name
+
+    def isBinary(self) -> bool:
+        """
+        Checks whether the file starts with the magic bytes of the binary N-Gram format.
+
+        RETURNS
+        -------
+        bool
+            True if the file is a binary N-Gram file, false otherwise.
+        """
+        try:
+            with open(self.__file_name, mode="rb") as input_file:
+                return input_file.read(len(NGramBinaryFile.MAGIC)) == NGramBinaryFile.MAGIC
+        except OSError:
+            return False
+
+    def __pad(self, outputFile):
+        """
+        Pads the output file with zero bytes up to the next multiple of 8.
+        """
+        remainder = outputFile.tell() % 8
+        if remainder != 0:
+            outputFile.write(b"\0" * (8 - remainder))
+
+    def save(self,
+             N: int,
+             lambdas: list,
+             probabilityOfUnseen: list,
+             vocabulary: Vocabulary,
+             tree: FrozenNGramTree):
+        """
+        Saves an N-Gram model in binary format.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        lambdas : list
+            interpolation ratios of the model.
+        probabilityOfUnseen : list
+            probabilities of unseen N-Grams for each level.
+        vocabulary : Vocabulary
+            vocabulary of the model.
+        tree : FrozenNGramTree
+            frozen N-Gram tree of the model.
+        """
+        levels = tree.getLevels()
+        lambdas = list(lambdas) + [0.0] * (2 - len(lambdas))
+        with open(self.__file_name, mode="wb") as output_file:
+            output_file.write(NGramBinaryFile.MAGIC)
+            output_file.write(struct.pack("<IIddII", NGramBinaryFile.VERSION, N, lambdas[0], lambdas[1], len(levels),
+                                          len(lambdas) - 2))
+            output_file.write(numpy.asarray(probabilityOfUnseen, dtype="<f8").tobytes())
+            output_file.write(numpy.asarray(lambdas[2:], dtype="<f8").tobytes())
+            words = [word.encode("utf-8") for word in vocabulary]
+            offsets = numpy.zeros(len(words) + 1, dtype="<u8")
+            numpy.cumsum([len(word) for word in words], out=offsets[1:])
+            output_file.write(struct.pack("<QQ", len(words), int(offsets[-1])))
+            output_file.write(offsets.tobytes())
+            output_file.write(b"".join(words))
+            self.__pad(output_file)
+            output_file.write(numpy.array([len(level[0]) for level in levels], dtype="<u8").tobytes())
+            for level in levels:
+                for i, dtype in enumerate(("<i4", "<i8", "<f8", "<f8", "<i8")):
+                    if level[i] is not None:
+                        output_file.write(numpy.ascontiguousarray(level[i], dtype=dtype).tobytes())
+                        self.__pad(output_file)
+
+    def readHeader(self) -> tuple:
+        """
+        Reads the header and the vocabulary of the binary N-Gram file, and computes the positions of the arrays of
+        each level without reading them.
+
+        RETURNS
+        -------
+        tuple
+            N, interpolation ratios, probabilities of unseen N-Grams, list of words of the vocabulary, and for each level
+            a list of (dtype, offset, length) triples for its symbol, count, probability, probability of unseen and
+            child start arrays, child start being None for the last level.
+        """
+        with open(self.__file_name, mode="rb") as input_file:
+            if input_file.read(len(NGramBinaryFile.MAGIC)) != NGramBinaryFile.MAGIC:
+                raise ValueError(self.__file_name + " is not a binary N-Gram file")
+            version, N, lambda1, lambda2, number_of_levels, number_of_lambdas = \
+                struct.unpack("<IIddII", input_file.read(32))
+            if version != NGramBinaryFile.VERSION:
+                raise ValueError("Unsupported binary N-Gram file version " + str(version))
+            probability_of_unseen = list(numpy.frombuffer(input_file.read(8 * N), dtype="<f8"))
+            lambdas = [lambda1, lambda2] + numpy.frombuffer(input_file.read(8 * number_of_lambdas), dtype="<f8").tolist()
+            vocabulary_size, length = struct.unpack("<QQ", input_file.read(16))
+            offsets = numpy.frombuffer(input_file.read(8 * (vocabulary_size + 1)), dtype="<u8").tolist()
+            table = input_file.read(length)
+            words = [table[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(vocabulary_size)]
+            offset = input_file.tell()
+            offset = offset + (-offset) % 8
+            input_file.seek(offset)
+            sizes = numpy.frombuffer(input_file.read(8 * number_of_levels), dtype="<u8")
+        offset = offset + 8 * number_of_levels
+        layout = []
+        for k in range(number_of_levels):
+            size = int(sizes[k])
+            arrays = [("<i4", size), ("<i8", size), ("<f8", size), ("<f8", size)]
+            if k < number_of_levels - 1:
+                arrays.append(("<i8", size + 1))
+            level = []
+            for dtype, length in arrays:
+                level.append((dtype, offset, length))
+                offset = offset + numpy.dtype(dtype).itemsize * length
+                offset = offset + (-offset) % 8
+            if k == number_of_levels - 1:
+                level.append(None)
+            layout.append(level)
+        return N, lambdas, probability_of_unseen, words, layout
+
+    def load(self) -> tuple:
+        """
+        Loads the binary N-Gram file. The arrays of the tree are not read, they are views of a read-only memory
+        mapping of the file, so loading time does not depend on the number of nodes.
+
+        RETURNS
+        -------
+        tuple
+            N, interpolation ratios, probabilities of unseen N-Grams, vocabulary and the frozen N-Gram tree.
+        """
+        N, lambdas, probability_of_unseen, words, layout = self.readHeader()
+        mapping = numpy.memmap(self.__file_name, dtype=numpy.uint8, mode="r")
+        levels = []
+        for level in layout:
+            arrays = []
+            for item in level:
+                if item is None:
+                    arrays.append(None)
+                else:
+                    dtype, offset, length = item
+                    size = numpy.dtype(dtype).itemsize * length
+                    arrays.append(mapping[offset:offset + size].view(dtype))
+            levels.append(arrays)
+        return N, lambdas, probability_of_unseen, Vocabulary(words), FrozenNGramTree(levels)
+
+    def convertTextFile(self, textFileName: str):
+        """
+        Converts an N-Gram saved with NGram.saveAsText to the binary format and saves it to this file.
+
+        PARAMETERS
+        ----------
+        textFileName : str
+            Name of the text N-Gram file.
+        """
+        with open(textFileName, mode="r", encoding="utf-8") as input_file:
+            items = input_file.readline().split()
+            N = int(items[0])
+            lambdas = [float(item) for item in items[1:]]
+            probability_of_unseen = [float(item) for item in input_file.readline().split()]
+            vocabulary = Vocabulary()
+            vocabulary_size = int(input_file.readline().strip())
+            for i in range(vocabulary_size):
+                vocabulary.addWord(input_file.readline().strip())
+            root_node = NGramNode(True, input_file, vocabulary)
+        self.save(N, lambdas, probability_of_unseen, vocabulary, FrozenNGramTree(root_node))
@@ -0,0 +1,212 @@
+from collections import Counter
+
+from NGram.CorpusFile import CorpusFile
+from NGram.Vocabulary import Vocabulary
+
+
+class NGramCounter:
+
+    __N: int
+    __vocabulary: Vocabulary
+    __counts: Counter
+    __dictionary: set
+
+    def __init__(self,
+                 N: int,
+                 corpus=None,
+                 dictionary: set = None):
+        """
+        Constructor of NGramCounter class. An NGramCounter counts the N-Grams of a corpus in a single flat pass,
+        keeping one counter entry per distinct N-Gram, keyed by the tuple of the vocabulary indexes of its symbols. An
+        NGram tree can then be built once from the aggregated counts with NGram.addNGramCounter.
+        If a dictionary is given, the vocabulary is closed: words not in the dictionary are counted as the unknown
+        word, whose index is -1, so the N-Grams of different unknown words are counted together.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        corpus
+            optional iterable of sentences whose ngrams are counted.
+        dictionary : set
+            optional set of known words.
+        """
+        self.__N = N
+        self.__vocabulary = Vocabulary()
+        self.__counts = Counter()
+        self.__dictionary = dictionary
+        if corpus is not None:
+            for sentence in corpus:
+                self.addSentence(sentence)
+
+    @staticmethod
+    def constructDictionaryWithMinimumFrequency(corpus,
+                                                minimumFrequency: int) -> set:
+        """
+        Constructs a dictionary of the words occurring at least the given number of times in a corpus, in a single
+        streaming pass over its sentences. Only the word counts are kept in memory.
+
+        PARAMETERS
+        ----------
+        corpus
+            iterable of sentences, such as a list of sentences or a CorpusFile.
+        minimumFrequency : int
+            minimum number of occurrences of a known word.
+
+        RETURNS
+        -------
+        set
+            set of the words occurring at least minimumFrequency times.
+        """
+        word_counts = Counter()
+        for sentence in corpus:
+            word_counts.update(sentence)
+        return {word for word, count in word_counts.items() if count >= minimumFrequency}
+
+    def getN(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            size of ngram.
+        """
+        return self.__N
+
+    def getVocabulary(self) -> Vocabulary:
+        """
+        RETURNS
+        -------
+        Vocabulary
+            vocabulary of the counted sentences. The N-Gram keys are tuples of indexes in this vocabulary.
+        """
+        return self.__vocabulary
+
+    def getDictionary(self) -> set:
+        """
+        RETURNS
+        -------
+        set
+            set of known words, None if the vocabulary is not closed.
+        """
+        return self.__dictionary
+
+    def getCounts(self) -> Counter:
+        """
+        RETURNS
+        -------
+        Counter
+            counts of the N-Grams, keyed by the tuples of the vocabulary indexes of their symbols, in the order the
+            N-Grams are first seen.
+        """
+        return self.__counts
+
+    def size(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of distinct N-Grams counted.
+        """
+        return len(self.__counts)
+
+    def merge(self, toBeMerged):
+        """
+        Adds the counts of the given NGramCounter to this counter. The words of the other counter are added to the
+        vocabulary and its N-Gram keys are translated to the indexes of this vocabulary. If the vocabulary of this
+        counter is closed, the words of the other counter not in its dictionary are translated to the unknown word.
+        If N of the two counters are not same, it does not merge.
+
+        PARAMETERS
+        ----------
+        toBeMerged : NGramCounter
+            Counter to be merged with.
+        """
+        if self.__N != toBeMerged.getN():
+            return
+        if len(self.__counts) == 0 and self.__vocabulary.size() == 0 and self.__dictionary is None:
+            self.__vocabulary = Vocabulary(toBeMerged.getVocabulary())
+            self.__counts.update(toBeMerged.getCounts())
+            return
+        # The last item translates the unknown word -1 to itself.
+        symbol_map = self.__vocabulary.addWords(list(toBeMerged.getVocabulary()), self.__dictionary) + [-1]
+        counts = self.__counts
+        for ngram, count in toBeMerged.getCounts().items():
+            counts[tuple([symbol_map[symbol] for symbol in ngram])] += count
+
+    def subtract(self,
+                 toBeSubtracted,
+                 words=None):
+        """
+        Gets a new counter with the counts of this counter minus the counts of the given counter, which must count a
+        part of the sentences this counter counts. N-Grams whose count drops to zero are removed. Since the words
+        themselves are not counted, the words that no longer occur can not be found from the N-Gram counts; if words
+        is given, the vocabulary of the new counter contains only those words of this vocabulary, in the same order,
+        otherwise it is the vocabulary of this counter.
+
+        PARAMETERS
+        ----------
+        toBeSubtracted : NGramCounter
+            Counter to be subtracted.
+        words
+            optional set of the words kept in the vocabulary of the new counter.
+
+        RETURNS
+        -------
+        NGramCounter
+            counter of the remaining sentences.
+        """
+        result = NGramCounter(self.__N, dictionary=self.__dictionary)
+        counts = Counter(self.__counts)
+        symbol_map = [self.__vocabulary.getIndex(word) for word in toBeSubtracted.getVocabulary()] + [-1]
+        for ngram, count in toBeSubtracted.getCounts().items():
+            ngram = tuple([symbol_map[symbol] for symbol in ngram])
+            remaining = counts[ngram] - count
+            if remaining > 0:
+                counts[ngram] = remaining
+            else:
+                del counts[ngram]
+        if words is None:
+            result.__vocabulary = Vocabulary(self.__vocabulary)
+            result.__counts = counts
+            return result
+        symbol_map = [result.__vocabulary.addWord(word) if word in words else -1 for word in self.__vocabulary] + [-1]
+        result.__counts = Counter({tuple([symbol_map[symbol] for symbol in ngram]): count
+                                   for ngram, count in counts.items()})
+        return result
+
+    def addCorpusFile(self, fileName: str):
+        """
+        Counts the N-Grams of all sentences of the given corpus file, reading the file line by line.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            Name of the corpus file.
+        """
+        for sentence in CorpusFile(fileName):
+            self.addSentence(sentence)
+
+    def addSentence(self,
+                    symbols: list,
+                    sentenceCount: int = 1):
+        """
+        Adds all words of the given sentence to the vocabulary and counts all N-Grams of the sentence. If the
+        vocabulary is closed, words not in the dictionary are counted as the unknown word.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            Sentence whose ngrams are counted.
+        sentenceCount : int
+            Number of times this sentence is added.
+        """
+        indexes = self.__vocabulary.addWords(symbols, self.__dictionary)
+        if len(indexes) < self.__N:
+            return
+        ngrams = zip(*[indexes[i:] for i in range(self.__N)])
+        if sentenceCount == 1:
+            self.__counts.update(ngrams)
+        else:
+            counts = self.__counts
+            for ngram in ngrams:
+                counts[ngram] += sentenceCount
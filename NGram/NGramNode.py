@@ -1,13 +1,43 @@
 from __future__ import annotations
 
 from io import TextIOWrapper
-from DataStructure.CounterHashMap import CounterHashMap
+from itertools import repeat
+from types import MappingProxyType
 from NGram.MultipleFile import MultipleFile
+from NGram.Vocabulary import Vocabulary
 import random
 
+_NO_CHILDREN = MappingProxyType({})
+
+
+def _moveCount(countsOfCounts: dict,
+               oldCount: int,
+               newCount: int):
+    """
+    Moves an N-Gram from oldCount to newCount in the sparse counts of counts of its level.
+
+    PARAMETERS
+    ----------
+    countsOfCounts : dict
+        number of N-Grams of the level, keyed by their counts. Counts without N-Grams are not kept.
+    oldCount : int
+        count of the N-Gram before the change, None if the N-Gram is new.
+    newCount : int
+        count of the N-Gram after the change.
+    """
+    if oldCount is not None:
+        remaining = countsOfCounts[oldCount] - 1
+        if remaining == 0:
+            del countsOfCounts[oldCount]
+        else:
+            countsOfCounts[oldCount] = remaining
+    countsOfCounts[newCount] = countsOfCounts.get(newCount, 0) + 1
+
 
 class NGramNode(object):
 
+    __slots__ = ("__children", "__symbol", "__count", "__probability", "__probability_of_unseen", "__unknown")
+
     __children: dict
     __symbol: object
     __count: int
@@ -20,11 +50,11 @@ class NGramNode(object):
         self.__count = 0
         self.__probability = 0.0
         self.__probability_of_unseen = 0.0
-        self.__children = {}
+        self.__children = _NO_CHILDREN
 
-    def constructor2(self, isRootNode: bool, inputFile: TextIOWrapper):
+    def constructor2(self, isRootNode: bool, inputFile: TextIOWrapper, vocabulary: Vocabulary):
         if not isRootNode:
-            self.__symbol = inputFile.readline().strip()
+            self.__symbol = self.__readSymbol(inputFile.readline().strip(), vocabulary)
         line = inputFile.readline().strip()
         items = line.split()
         self.__count = int(items[0])
@@ -34,14 +64,14 @@ class NGramNode(object):
         if number_of_children > 0:
             self.__children = {}
             for i in range(number_of_children):
-                child_node = NGramNode(False, inputFile)
+                child_node = NGramNode(False, inputFile, vocabulary)
                 self.__children[child_node.__symbol] = child_node
         else:
-            self.__children = {}
+            self.__children = _NO_CHILDREN
 
-    def constructor3(self, isRootNode: bool, inputFile: MultipleFile):
+    def constructor3(self, isRootNode: bool, inputFile: MultipleFile, vocabulary: Vocabulary):
         if not isRootNode:
-            self.__symbol = inputFile.readLine().strip()
+            self.__symbol = self.__readSymbol(inputFile.readLine().strip(), vocabulary)
         line = inputFile.readLine().strip()
         items = line.split()
         self.__count = int(items[0])
@@ -51,21 +81,33 @@ class NGramNode(object):
         if number_of_children > 0:
             self.__children = {}
             for i in range(number_of_children):
-                child_node = NGramNode(False, inputFile)
+                child_node = NGramNode(False, inputFile, vocabulary)
                 self.__children[child_node.__symbol] = child_node
         else:
-            self.__children = {}
+            self.__children = _NO_CHILDREN
+
+    def __readSymbol(self, word: str, vocabulary: Vocabulary) -> object:
+        if vocabulary is None:
+            return word
+        return vocabulary.getIndex(word)
 
     def __init__(self,
                  symbolOrIsRootNode,
-                 inputFile=None):
+                 inputFile=None,
+                 vocabulary: Vocabulary = None):
         """
-        Constructor of NGramNode
+        Constructor of NGramNode. Nodes use slots instead of an instance dictionary, and a node without children
+        shares a single read-only empty mapping; the children dictionary of a node is allocated when its first child
+        is added. Leaves, which are the majority of the nodes of an N-Gram tree, therefore do not own a dictionary.
 
         PARAMETERS
         ----------
         symbolOrIsRootNode
             symbol to be kept in this node.
+        inputFile
+            file from which the node is read.
+        vocabulary : Vocabulary
+            if given, symbols read from the file are translated to their indexes in this vocabulary.
         """
         self.__unknown = None
         if not isinstance(symbolOrIsRootNode, bool):
@@ -73,21 +115,64 @@ class NGramNode(object):
         else:
             if isinstance(symbolOrIsRootNode, bool) and inputFile is not None:
                 if isinstance(inputFile, TextIOWrapper):
-                    self.constructor2(symbolOrIsRootNode, inputFile)
+                    self.constructor2(symbolOrIsRootNode, inputFile, vocabulary)
                 elif isinstance(inputFile, MultipleFile):
-                    self.constructor3(symbolOrIsRootNode, inputFile)
+                    self.constructor3(symbolOrIsRootNode, inputFile, vocabulary)
+
+    def __copy(self, symbolMap: list = None, countsOfCounts: list = None) -> NGramNode:
+        """
+        Deep copies this NGramNode, translating the symbols of the copied nodes with the given symbol map.
+        :param symbolMap: If given, symbolMap[i] is the symbol in the new tree of the symbol i in this tree.
+        :param countsOfCounts: If given, sparse counts of counts of the new tree, countsOfCounts[0] is of the level of
+        this node. The copied nodes are added to them.
+        :return: Copy of this node.
+        """
+        copy = NGramNode(self.__symbol if symbolMap is None else symbolMap[self.__symbol])
+        copy.__probability = self.__probability
+        copy.__probability_of_unseen = self.__probability_of_unseen
+        copy.merge(self, symbolMap, None if countsOfCounts is None else countsOfCounts[1:])
+        if countsOfCounts is not None:
+            _moveCount(countsOfCounts[0], None, copy.__count)
+        return copy
+
+    def __mergeUnknown(self, toBeMerged: NGramNode, symbolMap: list):
+        """
+        Merges the given node of another NGram into the unknown node of this node.
+        :param toBeMerged: Unknown node, or node of a word unknown in this tree, of the parallel NGram tree.
+        :param symbolMap: If given, symbolMap[i] is the symbol in this tree of the symbol i in the other tree.
+        """
+        if self.__unknown is None:
+            self.__unknown = toBeMerged.__copy(symbolMap)
+        else:
+            self.__unknown.merge(toBeMerged, symbolMap)
 
-    def merge(self, toBeMerged: NGramNode):
+    def merge(self, toBeMerged: NGramNode, symbolMap: list = None, countsOfCounts: list = None):
         """
-        Merges this NGramNode with the corresponding NGramNode in another NGram.
+        Merges this NGramNode with the corresponding NGramNode in another NGram. Subtrees only existing in the other
+        tree are deep copied, so that the merged tree never shares nodes with the other tree. Unknown nodes, and
+        nodes whose symbols are translated to the unknown word -1, are merged into the unknown node.
         :param toBeMerged: Parallel NGramNode of the parallel NGram tree.
+        :param symbolMap: If given, symbolMap[i] is the symbol in this tree of the symbol i in the other tree.
+        :param countsOfCounts: If given, sparse counts of counts of this tree, countsOfCounts[0] is of the level of the
+        children of this node. They are updated with the merged counts.
         """
-        for symbol in self.__children:
-            if symbol in toBeMerged.__children:
-                self.__children[symbol].merge(toBeMerged.__children[symbol])
-        for symbol in toBeMerged.__children:
-            if symbol not in self.__children:
-                self.__children[symbol] = toBeMerged.__children[symbol]
+        if len(toBeMerged.__children) > 0 and self.__children is _NO_CHILDREN:
+            self.__children = {}
+        child_counts = None if countsOfCounts is None else countsOfCounts[1:]
+        for symbol, child in toBeMerged.__children.items():
+            mapped = symbol if symbolMap is None else symbolMap[symbol]
+            if mapped in self.__children:
+                node = self.__children[mapped]
+                old_count = node.__count
+                node.merge(child, symbolMap, child_counts)
+                if countsOfCounts is not None:
+                    _moveCount(countsOfCounts[0], old_count, node.__count)
+            elif mapped == -1:
+                self.__mergeUnknown(child, symbolMap)
+            else:
+                self.__children[mapped] = child.__copy(symbolMap, countsOfCounts)
+        if toBeMerged.__unknown is not None:
+            self.__mergeUnknown(toBeMerged.__unknown, symbolMap)
         self.__count = self.__count + toBeMerged.getCount()
 
     def getCount(self) -> int:
@@ -101,6 +186,61 @@ class NGramNode(object):
         """
         return self.__count
 
+    def getSymbol(self) -> object:
+        """
+        Gets symbol of this node.
+
+        RETURNS
+        -------
+        object
+            symbol of this node.
+        """
+        return self.__symbol
+
+    def getProbability(self) -> float:
+        """
+        Gets probability of this node.
+
+        RETURNS
+        -------
+        float
+            probability of this node.
+        """
+        return self.__probability
+
+    def getProbabilityOfUnseen(self) -> float:
+        """
+        Gets probability of the unseen children of this node.
+
+        RETURNS
+        -------
+        float
+            probability of unseen children of this node.
+        """
+        return self.__probability_of_unseen
+
+    def getUnknown(self) -> NGramNode:
+        """
+        Gets the node collecting the unknown words among the children of this node.
+
+        RETURNS
+        -------
+        NGramNode
+            unknown node of this node, None if there is no such node.
+        """
+        return self.__unknown
+
+    def getChildren(self) -> list:
+        """
+        Gets children of this node sorted by their symbols.
+
+        RETURNS
+        -------
+        list
+            children of this node sorted by their symbols.
+        """
+        return [self.__children[symbol] for symbol in sorted(self.__children)]
+
     def size(self) -> int:
         """
         Gets the size of children of this node.
@@ -171,6 +311,24 @@ class NGramNode(object):
             for child in self.__children.values():
                 child.updateCountsOfCounts(countsOfCounts, height - 1)
 
+    def addCountsOfCounts(self, countsOfCounts: list):
+        """
+        Traverses the subtree of this node once, and adds the counts of the nodes of every level to sparse counts of
+        counts.
+
+        PARAMETERS
+        ----------
+        countsOfCounts : list
+            sparse counts of counts of the levels below this node, countsOfCounts[0] is of the level of the children
+            of this node. Each item maps a count to the number of N-Grams having that count. Levels deeper than the
+            given ones are not traversed.
+        """
+        level = countsOfCounts[0]
+        for child in self.__children.values():
+            level[child.__count] = level.get(child.__count, 0) + 1
+            if len(countsOfCounts) > 1 and len(child.__children) > 0:
+                child.addCountsOfCounts(countsOfCounts[1:])
+
     def setProbabilityWithPseudoCount(self,
                                       pseudoCount: float,
                                       height: int,
@@ -189,16 +347,52 @@ class NGramNode(object):
             size of vocabulary
         """
         if height == 1:
-            total = self.childSum() + pseudoCount * vocabularySize
-            for child in self.__children.values():
-                child.__probability = (child.__count + pseudoCount) / total
-            if self.__unknown is not None:
-                self.__unknown.__probability = (self.__unknown.__count + pseudoCount) / total
-            self.__probability_of_unseen = pseudoCount / total
+            self.__setChildProbabilitiesWithPseudoCount(pseudoCount, vocabularySize)
         else:
             for child in self.__children.values():
                 child.setProbabilityWithPseudoCount(pseudoCount, height - 1, vocabularySize)
 
+    def __setChildProbabilitiesWithPseudoCount(self,
+                                               pseudoCount: float,
+                                               vocabularySize: float):
+        """
+        Sets the probabilities of the children of this node, and the probability of unseen children, by adding the
+        pseudocount to each NGram.
+
+        PARAMETERS
+        ----------
+        pseudoCount : float
+            pseudocount added to each NGram.
+        vocabularySize : float
+            size of vocabulary
+        """
+        total = self.childSum() + pseudoCount * vocabularySize
+        for child in self.__children.values():
+            child.__probability = (child.__count + pseudoCount) / total
+        if self.__unknown is not None:
+            self.__unknown.__probability = (self.__unknown.__count + pseudoCount) / total
+        self.__probability_of_unseen = pseudoCount / total
+
+    def setProbabilitiesWithPseudoCounts(self, levels: list):
+        """
+        Sets the probabilities of several levels in a single traversal of the subtree of this node, adding a
+        pseudocount to each NGram as in setProbabilityWithPseudoCount. Since every level only changes the
+        probabilities of its own nodes, setting the levels together gives the same probabilities as setting them one
+        by one.
+
+        PARAMETERS
+        ----------
+        levels : list
+            levels[0] is for the level of the children of this node, levels[i] for the level i below it. Each item
+            is a tuple of the pseudocount and the vocabulary size of the level, or None if the level is not set.
+        """
+        if levels[0] is not None:
+            self.__setChildProbabilitiesWithPseudoCount(levels[0][0], levels[0][1])
+        if len(levels) > 1:
+            lower_levels = levels[1:]
+            for child in self.__children.values():
+                child.setProbabilitiesWithPseudoCounts(lower_levels)
+
     def setAdjustedProbability(self, N: list, height: int, vocabularySize: float, pZero: float):
         """
         Sets adjusted probabilities with counts of counts of NGrams.
@@ -219,33 +413,71 @@ class NGramNode(object):
             probability of zero.
         """
         if height == 1:
-            total = 0
-            for child in self.__children.values():
-                r = child.__count
-                if r <= 5:
-                    newR = ((r + 1) * N[r + 1]) / N[r]
-                    total += newR
-                else:
-                    total += r
-            for child in self.__children.values():
-                r = child.__count
-                if r <= 5:
-                    newR = ((r + 1) * N[r + 1]) / N[r]
-                    child.__probability = (1 - pZero) * (newR / total)
-                else:
-                    child.__probability = (1 - pZero) * (r / total)
-            self.__probability_of_unseen = pZero / (vocabularySize - len(self.__children))
+            self.__setChildAdjustedProbabilities(N, vocabularySize, pZero)
         else:
             for child in self.__children.values():
                 child.setAdjustedProbability(N, height - 1, vocabularySize, pZero)
 
+    def __setChildAdjustedProbabilities(self, N: list, vocabularySize: float, pZero: float):
+        """
+        Sets the adjusted probabilities of the children of this node, and the probability of unseen children, with
+        counts of counts of NGrams.
+
+        PARAMETERS
+        ----------
+        N : list
+            counts of counts of NGrams.
+        vocabularySize : float
+            size of vocabulary.
+        pZero : float
+            probability of zero.
+        """
+        total = 0
+        for child in self.__children.values():
+            r = child.__count
+            if r <= 5:
+                newR = ((r + 1) * N[r + 1]) / N[r]
+                total += newR
+            else:
+                total += r
+        for child in self.__children.values():
+            r = child.__count
+            if r <= 5:
+                newR = ((r + 1) * N[r + 1]) / N[r]
+                child.__probability = (1 - pZero) * (newR / total)
+            else:
+                child.__probability = (1 - pZero) * (r / total)
+        self.__probability_of_unseen = pZero / (vocabularySize - len(self.__children))
+
+    def setAdjustedProbabilities(self, levels: list):
+        """
+        Sets the adjusted probabilities of several levels in a single traversal of the subtree of this node, as in
+        setAdjustedProbability. Since every level only changes the probabilities of its own nodes, setting the levels
+        together gives the same probabilities as setting them one by one.
+
+        PARAMETERS
+        ----------
+        levels : list
+            levels[0] is for the level of the children of this node, levels[i] for the level i below it. Each item
+            is a tuple of the estimated counts of counts, the vocabulary size and the probability of zero of the level,
+            or None if the level is not set.
+        """
+        if levels[0] is not None:
+            self.__setChildAdjustedProbabilities(levels[0][0], levels[0][1], levels[0][2])
+        if len(levels) > 1:
+            lower_levels = levels[1:]
+            for child in self.__children.values():
+                child.setAdjustedProbabilities(lower_levels)
+
     def addNGram(self,
                  s: list,
                  index: int,
                  height: int,
-                 sentenceCount: int = 1):
+                 sentenceCount: int = 1,
+                 countsOfCounts: list = None):
         """
-        Adds NGram given as array of symbols to the node as a child.
+        Adds NGram given as array of symbols to the node as a child. The symbol -1 is the unknown word, which is
+        added to the unknown node.
 
         PARAMETERS
         ----------
@@ -258,17 +490,98 @@ class NGramNode(object):
             as Bigram, etc.
         sentenceCount : int
             Number of times this sentence is added.
+        countsOfCounts : list
+            If given, sparse counts of counts of the levels below this node, countsOfCounts[0] is of the level of the
+            children of this node. They are updated with the added counts.
         """
         if height == 0:
             return
         symbol = s[index]
         if symbol in self.__children:
             child = self.__children[symbol]
+            old_count = child.__count
+        elif symbol == -1:
+            if self.__unknown is None:
+                self.__unknown = NGramNode(-1)
+            child = self.__unknown
+            countsOfCounts = None
         else:
+            if self.__children is _NO_CHILDREN:
+                self.__children = {}
             child = NGramNode(symbol)
             self.__children[symbol] = child
+            old_count = None
         child.__count += sentenceCount
-        child.addNGram(s, index + 1, height - 1, sentenceCount)
+        if countsOfCounts is not None:
+            _moveCount(countsOfCounts[0], old_count, child.__count)
+            countsOfCounts = countsOfCounts[1:]
+        child.addNGram(s, index + 1, height - 1, sentenceCount, countsOfCounts)
+
+    def addNGramCounts(self,
+                       counts: dict,
+                       symbolMap: list = None,
+                       countsOfCounts: list = None):
+        """
+        Adds aggregated N-Gram counts to the tree. Each N-Gram is inserted once with its total count, instead of once
+        for every occurrence as in addNGram. The symbol -1 is the unknown word, whose counts are added to the unknown
+        node, which is not counted in the counts of counts.
+
+        PARAMETERS
+        ----------
+        counts : dict
+            counts of the N-Grams, keyed by tuples of symbols.
+        symbolMap : list
+            If given, symbolMap[i] is the symbol used in this tree for the symbol i in the keys of counts.
+        countsOfCounts : list
+            If given, sparse counts of counts of the levels below this node, countsOfCounts[0] is of the level of the
+            children of this node. They are updated with the added counts.
+        """
+        for ngram, count in counts.items():
+            node = self
+            levels = countsOfCounts
+            depth = 0
+            for symbol in ngram:
+                if symbolMap is not None:
+                    symbol = symbolMap[symbol]
+                children = node.__children
+                if symbol in children:
+                    node = children[symbol]
+                    old_count = node.__count
+                elif symbol == -1:
+                    if node.__unknown is None:
+                        node.__unknown = NGramNode(-1)
+                    node = node.__unknown
+                    levels = None
+                else:
+                    if children is _NO_CHILDREN:
+                        children = {}
+                        node.__children = children
+                    child = NGramNode(symbol)
+                    children[symbol] = child
+                    node = child
+                    old_count = None
+                node.__count += count
+                if levels is not None:
+                    _moveCount(levels[depth], old_count, node.__count)
+                    depth += 1
+
+    def getChildOrUnknown(self, symbol) -> NGramNode:
+        """
+        Gets the child of this node with the given symbol. If there is no such child, the unknown node is returned.
+
+        PARAMETERS
+        ----------
+        symbol
+            symbol of the child.
+
+        RETURNS
+        -------
+        NGramNode
+            child with the given symbol, or the unknown node, None if there is neither.
+        """
+        if symbol in self.__children:
+            return self.__children[symbol]
+        return self.__unknown
 
     def getUniGramProbability(self, w1) -> float:
         """
@@ -291,6 +604,132 @@ class NGramNode(object):
         else:
             return self.__probability_of_unseen
 
+    def getProbabilities(self, columns: list) -> list:
+        """
+        Gets the probabilities of many N-Grams of the same length below this node. Each N-Gram descends from this node
+        through the children of its context symbols, or through the unknown nodes, and gets the unigram probability of
+        its last symbol in the node reached.
+
+        PARAMETERS
+        ----------
+        columns : list
+            k lists of symbols, the i'th list holds the i'th symbol of every N-Gram.
+
+        RETURNS
+        -------
+        list
+            probabilities of the N-Grams, None for the N-Grams whose context is not found.
+        """
+        result = []
+        append = result.append
+        contexts = zip(*columns[:-1]) if len(columns) > 1 else repeat(())
+        for context, symbol in zip(contexts, columns[-1]):
+            node = self
+            for context_symbol in context:
+                children = node.__children
+                if context_symbol in children:
+                    node = children[context_symbol]
+                else:
+                    node = node.__unknown
+                    if node is None:
+                        break
+            if node is None:
+                append(None)
+            elif symbol in node.__children:
+                append(node.__children[symbol].__probability)
+            elif node.__unknown is not None:
+                append(node.__unknown.__probability)
+            else:
+                append(node.__probability_of_unseen)
+        return result
+
+    def getNGramProbability(self, symbols: list) -> float:
+        """
+        Gets the probability of the last symbol of the given sequence after the other symbols, for a sequence of any
+        length. getUniGramProbability, getBiGramProbability and getTriGramProbability are the special cases of
+        sequences of length 1, 2 and 3.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of symbols.
+
+        RETURNS
+        -------
+        float
+            probability of the last symbol after the others, None if the context is not found.
+        """
+        node = self
+        for i in range(len(symbols) - 1):
+            symbol = symbols[i]
+            if symbol in node.__children:
+                node = node.__children[symbol]
+            else:
+                node = node.__unknown
+                if node is None:
+                    return None
+        return node.getUniGramProbability(symbols[-1])
+
+    def getInterpolationProbabilities(self, symbols: list) -> list:
+        """
+        Gets the probabilities of the last symbol of the given sequence after every suffix of its context, as needed
+        by interpolation or backoff, in one call. The contexts symbols[0:k - 1], symbols[1:k - 1], ...,
+        symbols[k - 1:k - 1] are different paths from this node, each one is descended with direct probes of the
+        children dictionaries, without a method call per level. For bigrams and trigrams the descents are unrolled.
+
+        PARAMETERS
+        ----------
+        symbols : list
+            sequence of k symbols.
+
+        RETURNS
+        -------
+        list
+            k probabilities, the i'th being the probability of the last symbol after symbols[i:k - 1], that is the
+            probability of the highest order first and the unigram probability last. None for the contexts that are
+            not found.
+        """
+        last = len(symbols) - 1
+        symbol = symbols[last]
+        children = self.__children
+        if last == 2:
+            w1 = symbols[0]
+            w2 = symbols[1]
+            context = children[w1] if w1 in children else self.__unknown
+            if context is not None:
+                context = context.__children[w2] if w2 in context.__children else context.__unknown
+            suffix = children[w2] if w2 in children else self.__unknown
+            return [None if context is None else context.getUniGramProbability(symbol),
+                    None if suffix is None else suffix.getUniGramProbability(symbol),
+                    self.getUniGramProbability(symbol)]
+        if last == 1:
+            w1 = symbols[0]
+            context = children[w1] if w1 in children else self.__unknown
+            return [None if context is None else context.getUniGramProbability(symbol),
+                    self.getUniGramProbability(symbol)]
+        result = []
+        for i in range(last + 1):
+            node = self
+            for context_symbol in symbols[i:last]:
+                children = node.__children
+                if context_symbol in children:
+                    node = children[context_symbol]
+                else:
+                    node = node.__unknown
+                    if node is None:
+                        break
+            if node is None:
+                result.append(None)
+            else:
+                children = node.__children
+                if symbol in children:
+                    result.append(children[symbol].__probability)
+                elif node.__unknown is not None:
+                    result.append(node.__unknown.__probability)
+                else:
+                    result.append(node.__probability_of_unseen)
+        return result
+
     def getBiGramProbability(self,
                              w1,
                              w2) -> float:
@@ -346,54 +785,116 @@ class NGramNode(object):
         else:
             return None
 
-    def countWords(self,
-                   wordCounter: CounterHashMap,
-                   height: int):
+    def countSymbols(self,
+                     symbolCounts: list,
+                     height: int):
         """
-        Counts words recursively given height and wordCounter.
+        Adds the counts of the N-Grams of the given height to the counts of their last symbols.
 
         PARAMETERS
         ----------
-        wordCounter : CounterHashMap
-            word counter keeping symbols and their counts.
+        symbolCounts : list
+            symbolCounts[i] is the count of the symbol i.
         height : int
             height for NGram. if height = 1, If height = 1, N-Gram is treated as UniGram, if height = 2, N-Gram is
             treated as Bigram, etc.
         """
-        if height == 0:
-            wordCounter.putNTimes(self.__symbol, self.__count)
+        if height == 1:
+            for child in self.__children.values():
+                symbolCounts[child.__symbol] += child.__count
         else:
             for child in self.__children.values():
-                child.countWords(wordCounter, height - 1)
+                child.countSymbols(symbolCounts, height - 1)
 
-    def replaceUnknownWords(self, dictionary: set):
+    def __absorb(self, toBeAbsorbed: NGramNode):
         """
-        Replace words not in given dictionary.
-        Deletes unknown words from children nodes and adds them to NGramNode#unknown unknown node as children
-        recursively.
+        Adds the count and the subtree of the given node to this node. Children with the same symbol are absorbed
+        recursively, so that no count is lost. The nodes of the given subtree are moved, not copied, so the given node
+        must not be used afterwards.
+
+        PARAMETERS
+        ----------
+        toBeAbsorbed : NGramNode
+            node whose count and subtree are added.
+        """
+        self.__count = self.__count + toBeAbsorbed.__count
+        if len(toBeAbsorbed.__children) > 0 and self.__children is _NO_CHILDREN:
+            self.__children = {}
+        for symbol, child in toBeAbsorbed.__children.items():
+            if symbol in self.__children:
+                self.__children[symbol].__absorb(child)
+            else:
+                self.__children[symbol] = child
+
+    def __replaceUnknownChildren(self, dictionary: set):
+        """
+        Deletes the children whose symbols are not in the given dictionary, and adds their counts and subtrees to the
+        unknown node. Subtrees of different unknown words with the same symbols are added together.
 
         PARAMETERS
         ----------
         dictionary : set
-            dictionary of known words.
+            dictionary of known symbols.
         """
         child_list = []
         for symbol in self.__children.keys():
             if symbol not in dictionary:
                 child_list.append(self.__children[symbol])
         if len(child_list) > 0:
-            self.__unknown = NGramNode("")
-            self.__unknown.__children = {}
-            total = 0
+            if self.__unknown is None:
+                self.__unknown = NGramNode(-1)
+                self.__unknown.__children = {}
             for child in child_list:
-                self.__unknown.__children.update(child.__children)
-                total += child.__count
-                del self.__children[child.symbol]
-            self.__unknown.__count = total
+                del self.__children[child.__symbol]
+                self.__unknown.__absorb(child)
+
+    def replaceUnknownWords(self, dictionary: set):
+        """
+        Replace words not in given dictionary.
+        Deletes unknown words from children nodes and adds them to NGramNode#unknown unknown node as children
+        recursively. The counts of the children of unknown words having the same symbol are added together.
+
+        PARAMETERS
+        ----------
+        dictionary : set
+            dictionary of known words.
+        """
+        self.__replaceUnknownChildren(dictionary)
+        if self.__unknown is not None:
             self.__unknown.replaceUnknownWords(dictionary)
         for child in self.__children.values():
             child.replaceUnknownWords(dictionary)
 
+    def replaceUnknownWordsWithPseudoCount(self,
+                                           dictionary: set,
+                                           pseudoCount: float,
+                                           height: int,
+                                           vocabularySize: float):
+        """
+        Replaces words not in given dictionary as in replaceUnknownWords, and sets the probabilities of the given
+        height as in setProbabilityWithPseudoCount, in a single traversal. The children of a node are replaced
+        before their probabilities are set, and replacing words deeper in the tree does not change their counts.
+
+        PARAMETERS
+        ----------
+        dictionary : set
+            dictionary of known words.
+        pseudoCount : float
+            pseudocount added to each NGram.
+        height : int
+            height for NGram whose probabilities are set, relative to this node. If height is less than 1, only the
+            words are replaced.
+        vocabularySize : float
+            size of vocabulary
+        """
+        self.__replaceUnknownChildren(dictionary)
+        if height == 1:
+            self.__setChildProbabilitiesWithPseudoCount(pseudoCount, vocabularySize)
+        if self.__unknown is not None:
+            self.__unknown.replaceUnknownWords(dictionary)
+        for child in self.__children.values():
+            child.replaceUnknownWordsWithPseudoCount(dictionary, pseudoCount, height - 1, vocabularySize)
+
     def getCountForListItem(self,
                             s: list,
                             index: int) -> int:
@@ -422,7 +923,8 @@ class NGramNode(object):
 
     def generateNextString(self,
                            s: list,
-                           index: int) -> object:
+                           index: int,
+                           vocabulary: Vocabulary) -> object:
         """
         Generates next string for given list of symbol and index
         PARAMETERS
@@ -431,6 +933,9 @@ class NGramNode(object):
             array of symbols
         index : int
             index of generated string
+        vocabulary : Vocabulary
+            vocabulary translating the symbols to the indexes the children are keyed by, and the generated index back
+            to its word.
 
         RETURNS
         -------
@@ -442,11 +947,11 @@ class NGramNode(object):
             prob = random.uniform(0, 1)
             for node in self.__children.values():
                 if prob < node.__probability + total:
-                    return node.symbol
+                    return vocabulary.getWord(node.__symbol)
                 else:
                     total += node.__probability
         else:
-            return self.__children[s[index]].generateNextString(s, index + 1)
+            return self.__children[vocabulary.getIndex(s[index])].generateNextString(s, index + 1, vocabulary)
         return None
 
     def prune(self,
@@ -470,7 +975,7 @@ class NGramNode(object):
                     max_node = self.__children[symbol]
             for symbol in to_be_deleted:
                 self.__children.pop(symbol)
-            if len(self.__children) == 0:
+            if len(self.__children) == 0 and max_node is not None:
                 self.__children[max_element] = max_node
         else:
             for node in self.__children.values():
@@ -479,7 +984,8 @@ class NGramNode(object):
     def saveAsText(self,
                    isRootNode: bool,
                    outputFile,
-                   level: int):
+                   level: int,
+                   vocabulary: Vocabulary = None):
         """
         Save this NGramNode to a text file.
 
@@ -491,18 +997,23 @@ class NGramNode(object):
             file where NGram is saved.
         level: int
             Level of this node
+        vocabulary: Vocabulary
+            if given, symbols are written as the words with those indexes in this vocabulary.
         """
         if not isRootNode:
             for i in range(level):
                 outputFile.write("\t")
-            outputFile.write(self.__symbol.__str__() + "\n")
+            if vocabulary is None:
+                outputFile.write(self.__symbol.__str__() + "\n")
+            else:
+                outputFile.write(vocabulary.getWord(self.__symbol) + "\n")
         for i in range(level):
             outputFile.write("\t")
         if len(self.__children) > 0:
             outputFile.write(self.__count.__str__() + " " + self.__probability.__str__() + " " +
                              self.__probability_of_unseen.__str__() + " " + self.size().__str__() + "\n")
             for child in self.__children.values():
-                child.saveAsText(False, outputFile, level + 1)
+                child.saveAsText(False, outputFile, level + 1, vocabulary)
         else:
             outputFile.write(self.__count.__str__() + " " + self.__probability.__str__() + " " +
                              self.__probability_of_unseen.__str__() + " 0\n")
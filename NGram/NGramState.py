@@ -0,0 +1,54 @@
+class NGramState:
+
+    __slots__ = ("__history", "__nodes", "__hash")
+
+    __history: tuple
+    __nodes: tuple
+    __hash: int
+
+    def __init__(self,
+                 history: tuple,
+                 nodes: tuple):
+        """
+        Constructor of NGramState. A state is the context reached by a left-to-right decoder after scoring some
+        words: the vocabulary indexes of the last N - 1 words at most, and the resolved context nodes of the N-Gram
+        tree for each suffix of that history, so that the next word is scored without walking the tree from the root.
+        Two states are equal when their histories are equal, so states can be used as dictionary keys to recombine
+        hypotheses. States are created by NGram.getInitialState and NGram.advance, and are only valid for the NGram
+        that created them as long as its probabilities do not change.
+
+        PARAMETERS
+        ----------
+        history : tuple
+            vocabulary indexes of the last words, at most N - 1 of them.
+        nodes : tuple
+            nodes[k] is the context node of the last k words of the history, None if that context is not in the
+            tree. For a frozen tree, a node is the index of the node in level k.
+        """
+        self.__history = history
+        self.__nodes = nodes
+        self.__hash = hash(history)
+
+    def getHistory(self) -> tuple:
+        """
+        RETURNS
+        -------
+        tuple
+            vocabulary indexes of the last words, at most N - 1 of them.
+        """
+        return self.__history
+
+    def getNodes(self) -> tuple:
+        """
+        RETURNS
+        -------
+        tuple
+            context nodes of the suffixes of the history, the root first.
+        """
+        return self.__nodes
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, NGramState) and self.__history == other.__history
+
+    def __hash__(self) -> int:
+        return self.__hash
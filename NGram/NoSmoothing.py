@@ -13,3 +13,13 @@ class NoSmoothing(SimpleSmoothing):
         :param level: Height of the NGram node.
         """
         nGram.setProbabilityWithPseudoCount(0.0, level)
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Calculates the N-Gram probabilities of the given levels with no smoothing, in a single traversal of the N-Gram.
+        :param nGram: N-Gram for which no smoothing is done.
+        :param levels: Levels for which N-Gram probabilities will be set.
+        """
+        nGram.setProbabilityWithPseudoCounts([0.0 if level in levels else None for level in range(1, nGram.getN() + 1)])
@@ -34,3 +34,21 @@ class NoSmoothingWithDictionary(NoSmoothing):
         """
         nGram.replaceUnknownWords(self.__dictionary)
         super().setProbabilities(nGram, level)
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Wrapper function to set the N-gram probabilities of the given levels with no smoothing and replacing unknown
+        words not found in the dictionary. Unknown words are replaced once, and the probabilities of all levels are
+        set in a single traversal of the N-Gram.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        nGram.replaceUnknownWords(self.__dictionary)
+        super().setProbabilitiesOfLevels(nGram, levels)
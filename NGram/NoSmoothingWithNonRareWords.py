@@ -1,10 +1,10 @@
 from NGram.NGram import NGram
 from NGram.NoSmoothing import NoSmoothing
+from NGram.SimpleSmoothing import SimpleSmoothing
 
 
 class NoSmoothingWithNonRareWords(NoSmoothing):
 
-    __dictionary: set
     __probability: float
 
     def __init__(self, probability: float):
@@ -22,7 +22,8 @@ class NoSmoothingWithNonRareWords(NoSmoothing):
                          level: int):
         """
         Wrapper function to set the N-gram probabilities with no smoothing and replacing unknown words not found in
-        nonrare words.
+        nonrare words. The words are counted in one traversal of the N-Gram, and the unknown words are replaced and
+        the probabilities are set in a second one.
 
         PARAMETERS
         ----------
@@ -33,6 +34,21 @@ class NoSmoothingWithNonRareWords(NoSmoothing):
             set with this function. If level = 1, N-Gram is treated as UniGram, if level = 2, N-Gram is treated as
             Bigram, etc.
         """
-        self.__dictionary = nGram.constructDictionaryWithNonRareWords(level, self.__probability)
-        nGram.replaceUnknownWords(self.__dictionary)
-        super().setProbabilities(nGram, level)
+        nGram.setProbabilityWithNonRareWords(level, self.__probability)
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram: NGram,
+                                 levels: list):
+        """
+        Wrapper function to set the N-gram probabilities of the given levels with no smoothing and replacing unknown
+        words not found in nonrare words. The nonrare words depend on the level, and the unknown words of each level
+        are replaced before its probabilities are set, so the levels are set one by one.
+
+        PARAMETERS
+        ----------
+        nGram : NGram
+            N-Gram for which the probabilities will be set.
+        levels : list
+            Levels for which N-Gram probabilities will be set.
+        """
+        SimpleSmoothing.setProbabilitiesOfLevels(self, nGram, levels)
@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from NGram.CorpusFile import CorpusFile
+from NGram.NGram import NGram
+from NGram.NGramCounter import NGramCounter
+
+
+class ParallelNGramTrainer:
+
+    __worker_count: int
+
+    def __init__(self, workerCount: int = None):
+        """
+        Constructor of ParallelNGramTrainer. The trainer splits a corpus into shards, counts the N-Grams of each shard
+        in a separate worker process, and merges the counts returned by the workers into a single NGram.
+
+        PARAMETERS
+        ----------
+        workerCount : int
+            Number of worker processes. If not given, the number of processors is used.
+        """
+        if workerCount is None or workerCount < 1:
+            workerCount = os.cpu_count() or 1
+        self.__worker_count = workerCount
+
+    def getWorkerCount(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of worker processes.
+        """
+        return self.__worker_count
+
+    def __mergeShards(self,
+                      N: int,
+                      shards: list) -> NGram:
+        """
+        Counts the given shards in worker processes and builds an NGram from the merged counts. Each worker returns an
+        NGramCounter, which only contains the vocabulary and the distinct N-Grams of its shard. The counters are
+        merged in shard order, so that the vocabulary and the NGram tree are the same as counting the shards one
+        after another.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        shards : list
+            list of corpora, each a list of sentences or a CorpusFile.
+
+        RETURNS
+        -------
+        NGram
+            NGram containing the N-Grams of all shards.
+        """
+        counter = NGramCounter(N)
+        if len(shards) == 1 or self.__worker_count == 1:
+            for shard in shards:
+                counter.merge(NGramCounter(N, shard))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.__worker_count, len(shards))) as executor:
+                for shard_counter in executor.map(NGramCounter, [N] * len(shards), shards):
+                    counter.merge(shard_counter)
+        result = NGram(N)
+        result.addNGramCounter(counter)
+        return result
+
+    def train(self,
+              N: int,
+              corpus: list) -> NGram:
+        """
+        Builds an NGram from the given corpus, splitting it into one contiguous shard per worker.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        corpus : list
+            list of sentences whose ngrams are added.
+
+        RETURNS
+        -------
+        NGram
+            NGram containing the N-Grams of the corpus.
+        """
+        shard_count = max(1, min(self.__worker_count, len(corpus)))
+        shards = []
+        for i in range(shard_count):
+            shards.append(corpus[(i * len(corpus)) // shard_count:((i + 1) * len(corpus)) // shard_count])
+        return self.__mergeShards(N, shards)
+
+    def trainWithFiles(self,
+                       N: int,
+                       fileNames: list) -> NGram:
+        """
+        Builds an NGram from the given corpus files. Each file is a shard, which is read line by line by its worker,
+        so the sentences are never sent between processes.
+
+        PARAMETERS
+        ----------
+        N : int
+            size of ngram.
+        fileNames : list
+            names of the corpus files.
+
+        RETURNS
+        -------
+        NGram
+            NGram containing the N-Grams of all files.
+        """
+        return self.__mergeShards(N, [CorpusFile(file_name) for file_name in fileNames])
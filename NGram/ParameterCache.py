@@ -0,0 +1,109 @@
+import hashlib
+import os
+
+
+class ParameterCache:
+
+    __file_name: str
+    __entries: dict
+
+    def __init__(self, fileName: str):
+        """
+        Constructor of ParameterCache. A parameter cache keeps the parameters learned by trained smoothing methods in
+        a text file, so that they are not learned again for the same corpus. For each N and smoothing configuration,
+        the file keeps the fingerprint and the size of the last corpus, and the parameters learned from it, one entry
+        per line. The file is read if it exists.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            name of the cache file.
+        """
+        self.__file_name = fileName
+        self.__entries = {}
+        if os.path.exists(fileName):
+            input_file = open(fileName, mode="r", encoding="utf-8")
+            for line in input_file:
+                items = line.split()
+                if len(items) >= 5:
+                    self.__entries[(int(items[0]), items[1])] = (items[2], int(items[3]),
+                                                                 [float(item) for item in items[4:]])
+            input_file.close()
+
+    @staticmethod
+    def fingerprint(corpus: list) -> tuple:
+        """
+        Calculates the fingerprint of a corpus in a single pass over its sentences. The sentences are hashed one
+        after another with a running hash, since the folds of the cross-validation depend on the order of the
+        sentences. Each sentence is prefixed with its number of words and each word with its length, so that corpora
+        split into sentences and words differently have different fingerprints.
+
+        PARAMETERS
+        ----------
+        corpus : list
+            list of sentences.
+
+        RETURNS
+        -------
+        tuple
+            hexadecimal fingerprint of the sentences, and the number of words.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        word_count = 0
+        for sentence in corpus:
+            digest.update(len(sentence).to_bytes(8, "little"))
+            for word in sentence:
+                encoded = word.encode("utf-8")
+                digest.update(len(encoded).to_bytes(8, "little"))
+                digest.update(encoded)
+            word_count += len(sentence)
+        return digest.hexdigest(), word_count
+
+    def get(self,
+            N: int,
+            configuration: str) -> tuple:
+        """
+        Gets the entry of the last corpus for which the parameters of the given smoothing configuration are learned.
+
+        PARAMETERS
+        ----------
+        N : int
+            N in N-Gram.
+        configuration : str
+            configuration of the smoothing method, without spaces.
+
+        RETURNS
+        -------
+        tuple
+            fingerprint, number of words and parameters, None if there is no such entry.
+        """
+        return self.__entries.get((N, configuration))
+
+    def put(self,
+            N: int,
+            configuration: str,
+            fingerprint: str,
+            wordCount: int,
+            parameters: list):
+        """
+        Replaces the entry of the given smoothing configuration, and saves the cache file.
+
+        PARAMETERS
+        ----------
+        N : int
+            N in N-Gram.
+        configuration : str
+            configuration of the smoothing method, without spaces.
+        fingerprint : str
+            fingerprint of the corpus.
+        wordCount : int
+            number of words of the corpus.
+        parameters : list
+            parameters learned from the corpus.
+        """
+        self.__entries[(N, configuration)] = (fingerprint, wordCount, list(parameters))
+        output_file = open(self.__file_name, mode="w", encoding="utf-8")
+        for (n, key), (digest, count, values) in self.__entries.items():
+            output_file.write(str(n) + " " + key + " " + digest + " " + str(count) +
+                              "".join(" " + repr(value) for value in values) + "\n")
+        output_file.close()
@@ -0,0 +1,89 @@
+from abc import abstractmethod
+
+
+class ParameterOptimizer:
+
+    __evaluations: int
+    __sampled_evaluations: int
+
+    def __init__(self):
+        """
+        Constructor of ParameterOptimizer. An optimizer searches the parameters of a TrainedSmoothing that minimize
+        the perplexity of the test folds of a K-fold cross-validation, and counts the perplexity evaluations it
+        spends, so that different optimizers can be compared.
+        """
+        self.__evaluations = 0
+        self.__sampled_evaluations = 0
+
+    def evaluate(self,
+                 smoothing,
+                 statistics: list,
+                 parameters: list,
+                 sampled: bool = False) -> float:
+        """
+        Calculates the sum of the perplexities of the test folds for the given parameters, and counts the evaluation.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+        statistics : list
+            statistics of the test folds, see TrainedSmoothing.learnFoldStatistics.
+        parameters : list
+            parameters of the smoothing method.
+        sampled : bool
+            True if the statistics are of samples of the test folds, which are counted separately.
+
+        RETURNS
+        -------
+        float
+            sum of the perplexities of the test folds.
+        """
+        if sampled:
+            self.__sampled_evaluations = self.__sampled_evaluations + 1
+        else:
+            self.__evaluations = self.__evaluations + 1
+        return smoothing.getFoldPerplexity(statistics, parameters)
+
+    def getEvaluations(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of perplexity evaluations of the whole test folds spent since the optimizer is created.
+        """
+        return self.__evaluations
+
+    def getSampledEvaluations(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of perplexity evaluations of samples of the test folds spent since the optimizer is created.
+        """
+        return self.__sampled_evaluations
+
+    def canOptimize(self, smoothing) -> bool:
+        """
+        Checks if the optimizer can search the parameters of the given smoothing method.
+
+        PARAMETERS
+        ----------
+        smoothing : TrainedSmoothing
+            smoothing method whose parameters are optimized.
+
+        RETURNS
+        -------
+        bool
+            True, the parameters of any smoothing method can be searched unless an optimizer restricts them.
+        """
+        return True
+
+    @abstractmethod
+    def optimize(self,
+                 smoothing,
+                 statistics: list,
+                 lowerBounds: list,
+                 upperBounds: list,
+                 sampledStatistics: list = None) -> list:
+        pass
@@ -15,3 +15,15 @@ class SimpleSmoothing:
         :param nGram: N-Gram for which simple smoothing calculation is done.
         """
         self.setProbabilities(nGram, nGram.getN())
+
+    def setProbabilitiesOfLevels(self,
+                                 nGram,
+                                 levels: list):
+        """
+        Calculates the N-Gram probabilities of the given levels with simple smoothing. The levels are set one by one,
+        smoothing methods that can set all levels in a single traversal of the N-Gram override this method.
+        :param nGram: N-Gram for which simple smoothing calculation is done.
+        :param levels: Levels for which N-Gram probabilities will be set.
+        """
+        for level in levels:
+            self.setProbabilities(nGram, level)
@@ -1,15 +1,377 @@
 from abc import abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from Sampling.KFoldCrossValidation import KFoldCrossValidation
+
+from NGram.GridSearchOptimizer import GridSearchOptimizer
+from NGram.NGramCounter import NGramCounter
+from NGram.ParameterCache import ParameterCache
+from NGram.ParameterOptimizer import ParameterOptimizer
 from NGram.SimpleSmoothing import SimpleSmoothing
 
 
 class TrainedSmoothing(SimpleSmoothing):
 
+    __worker_count: int
+    __optimizer: ParameterOptimizer
+    __sample_fraction: float
+    __seed: int
+    __parameter_cache: ParameterCache
+    __warm_start_tolerance: float
+    __fingerprint: tuple
+    __warm_start_parameters: list
+
+    def __init__(self):
+        """
+        Constructor of TrainedSmoothing. The fold models of the parameter search are built one after another, see
+        setWorkerCount to build them in worker processes, and the parameters are searched with a GridSearchOptimizer,
+        see setOptimizer.
+        """
+        self.__worker_count = 1
+        self.__optimizer = GridSearchOptimizer()
+        self.__sample_fraction = None
+        self.__seed = 0
+        self.__parameter_cache = None
+        self.__warm_start_tolerance = None
+        self.__fingerprint = None
+        self.__warm_start_parameters = None
+
     @abstractmethod
     def learnParameters(self,
                         corpus: list,
                         N: int):
         pass
 
+    @abstractmethod
+    def getFoldStatistics(self,
+                          trainCounter: NGramCounter,
+                          testFold: list,
+                          N: int):
+        pass
+
+    @abstractmethod
+    def getFoldPerplexity(self,
+                          statistics: list,
+                          parameters: list) -> float:
+        pass
+
+    @abstractmethod
+    def sampleFoldStatistics(self,
+                             statistics,
+                             fraction: float,
+                             generator: numpy.random.Generator):
+        pass
+
+    def isFeasible(self, parameters: list) -> bool:
+        """
+        Checks if the given values of the first parameters can be a part of the parameters of the smoothing method.
+
+        PARAMETERS
+        ----------
+        parameters : list
+            values of the first parameters.
+
+        RETURNS
+        -------
+        bool
+            True, all values are feasible unless a smoothing method restricts them.
+        """
+        return True
+
+    def hasComponentProbabilities(self) -> bool:
+        """
+        RETURNS
+        -------
+        bool
+            True if the fold statistics are the component probabilities of the N-Grams of the test folds, which
+            interpolation weights are learned from. False unless a smoothing method interpolates its components.
+        """
+        return False
+
+    def setOptimizer(self, optimizer: ParameterOptimizer):
+        """
+        Sets the optimizer that searches the parameters of the smoothing method in learnParameters.
+
+        PARAMETERS
+        ----------
+        optimizer : ParameterOptimizer
+            optimizer of the parameters.
+        """
+        if not optimizer.canOptimize(self):
+            raise ValueError(type(optimizer).__name__ + " can not optimize the parameters of " + type(self).__name__)
+        self.__optimizer = optimizer
+
+    def getOptimizer(self) -> ParameterOptimizer:
+        """
+        RETURNS
+        -------
+        ParameterOptimizer
+            optimizer of the parameters, whose getEvaluations gives the number of perplexity evaluations spent.
+        """
+        return self.__optimizer
+
+    def setSampling(self,
+                    fraction: float,
+                    seed: int = 0):
+        """
+        Sets the fraction of the N-Grams of each test fold on which the coarse candidates of the parameter search are
+        evaluated. The N-Grams are sampled randomly with the given seed, and the search switches to the whole test
+        folds for its last rounds.
+
+        PARAMETERS
+        ----------
+        fraction : float
+            fraction of the N-Grams of each test fold in the sample. If None, or not less than 1, all candidates are
+            evaluated on the whole test folds.
+        seed : int
+            seed of the random sample.
+        """
+        if fraction is not None and fraction >= 1:
+            fraction = None
+        self.__sample_fraction = fraction
+        self.__seed = seed
+
+    def getSampleFraction(self) -> float:
+        """
+        RETURNS
+        -------
+        float
+            fraction of the N-Grams of each test fold on which the coarse candidates are evaluated, None if the whole
+            test folds are used.
+        """
+        return self.__sample_fraction
+
+    def optimizeParameters(self,
+                           statistics: list,
+                           lowerBounds: list,
+                           upperBounds: list) -> list:
+        """
+        Searches the parameters that minimize the sum of the perplexities of the test folds with the optimizer set by
+        setOptimizer. If a sample fraction is set with setSampling, a random sample of the statistics of each test fold
+        is taken with sampleFoldStatistics, and the optimizer evaluates the coarse candidates on the samples. If
+        getCachedParameters found the parameters of a slightly different corpus to warm start from, the initial bounds
+        of each parameter are half and twice its previous value, clamped to the given bounds. If the previous value
+        is so far outside the given bounds that nothing is left between the clamped bounds, the given bounds are used.
+
+        PARAMETERS
+        ----------
+        statistics : list
+            statistics of the test folds, see learnFoldStatistics.
+        lowerBounds : list
+            initial lower bounds of the parameters.
+        upperBounds : list
+            initial upper bounds of the parameters.
+
+        RETURNS
+        -------
+        list
+            best parameters.
+        """
+        if self.__warm_start_parameters is not None:
+            warm_lower_bounds = []
+            warm_upper_bounds = []
+            for i in range(len(lowerBounds)):
+                lower_bound = max(lowerBounds[i], self.__warm_start_parameters[i] / 2)
+                upper_bound = min(2 * self.__warm_start_parameters[i], upperBounds[i])
+                if lower_bound < upper_bound:
+                    warm_lower_bounds.append(lower_bound)
+                    warm_upper_bounds.append(upper_bound)
+                else:
+                    warm_lower_bounds.append(lowerBounds[i])
+                    warm_upper_bounds.append(upperBounds[i])
+            lowerBounds = warm_lower_bounds
+            upperBounds = warm_upper_bounds
+            self.__warm_start_parameters = None
+        if self.__sample_fraction is None:
+            return self.__optimizer.optimize(self, statistics, lowerBounds, upperBounds)
+        generator = numpy.random.default_rng(self.__seed)
+        samples = [self.sampleFoldStatistics(fold_statistics, self.__sample_fraction, generator)
+                   for fold_statistics in statistics]
+        return self.__optimizer.optimize(self, statistics, lowerBounds, upperBounds, samples)
+
+    def setParameterCache(self,
+                          fileName: str,
+                          warmStart: bool = False,
+                          tolerance: float = 0.1):
+        """
+        Sets the file in which the learned parameters are cached. If the parameters of the same smoothing
+        configuration are already learned from the same corpus, learnParameters reads them from the file instead of
+        learning them again.
+
+        PARAMETERS
+        ----------
+        fileName : str
+            name of the cache file, None to learn the parameters without a cache.
+        warmStart : bool
+            if True and the corpus has changed, the parameters learned from the previous corpus are used as the
+            initial bounds of the search, provided that the number of words has not changed more than tolerance.
+        tolerance : float
+            largest relative change in the number of words for a warm start.
+        """
+        self.__parameter_cache = ParameterCache(fileName) if fileName is not None else None
+        self.__warm_start_tolerance = tolerance if warmStart else None
+
+    def getConfiguration(self) -> str:
+        """
+        Gets the configuration of the smoothing method that the learned parameters depend on, which is a part of the
+        key of the parameter cache.
+
+        RETURNS
+        -------
+        str
+            name of the smoothing method, the optimizer and the sampling, without spaces.
+        """
+        configuration = type(self).__name__ + "," + type(self.__optimizer).__name__
+        if self.__sample_fraction is not None:
+            configuration = configuration + ",sample=" + str(self.__sample_fraction) + ":" + str(self.__seed)
+        return configuration
+
+    def getCachedParameters(self,
+                            corpus: list,
+                            N: int) -> list:
+        """
+        Searches the parameter cache for the parameters learned from the given corpus. If they are not found and warm
+        start is enabled, the parameters learned from the previous corpus are kept for the next optimizeParameters
+        call, if the corpus has changed only a little.
+
+        PARAMETERS
+        ----------
+        corpus : list
+            Train corpus used to optimize the parameters.
+        N : int
+            N in N-Gram.
+
+        RETURNS
+        -------
+        list
+            cached parameters, None if there is no cache or the corpus has changed.
+        """
+        self.__warm_start_parameters = None
+        if self.__parameter_cache is None:
+            return None
+        self.__fingerprint = ParameterCache.fingerprint(corpus)
+        entry = self.__parameter_cache.get(N, self.getConfiguration())
+        if entry is None:
+            return None
+        if entry[0] == self.__fingerprint[0]:
+            return entry[2]
+        if self.__warm_start_tolerance is not None and \
+                abs(self.__fingerprint[1] - entry[1]) <= self.__warm_start_tolerance * entry[1]:
+            self.__warm_start_parameters = entry[2]
+        return None
+
+    def cacheParameters(self,
+                        N: int,
+                        parameters: list):
+        """
+        Saves the parameters learned from the corpus given to the last getCachedParameters call in the parameter
+        cache.
+
+        PARAMETERS
+        ----------
+        N : int
+            N in N-Gram.
+        parameters : list
+            learned parameters.
+        """
+        if self.__parameter_cache is not None:
+            self.__parameter_cache.put(N, self.getConfiguration(), self.__fingerprint[0], self.__fingerprint[1],
+                                       parameters)
+
+    def setWorkerCount(self, workerCount: int):
+        """
+        Sets the number of worker processes that build the fold models while learning the parameters. The learned
+        parameters do not depend on the number of workers.
+
+        PARAMETERS
+        ----------
+        workerCount : int
+            number of worker processes, 1 to build the fold models in this process.
+        """
+        self.__worker_count = max(1, workerCount)
+
+    def getWorkerCount(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            number of worker processes that build the fold models.
+        """
+        return self.__worker_count
+
+    def learnFoldStatistics(self,
+                            kFoldCrossValidation: KFoldCrossValidation,
+                            K: int,
+                            N: int) -> list:
+        """
+        Builds the model of each train fold of a K-fold cross-validation and gets the statistics of its test fold with
+        getFoldStatistics, from which the perplexity of the test fold is found for any parameter. If there are more
+        than one workers, each fold is handled in a worker process, and only the statistics are sent back, the fold
+        models are not.
+
+        PARAMETERS
+        ----------
+        kFoldCrossValidation : KFoldCrossValidation
+            Cross-validation data.
+        K : int
+            number of folds.
+        N : int
+            N in N-Gram.
+
+        RETURNS
+        -------
+        list
+            K statistics, the i'th one for the i'th fold.
+        """
+        train_counters = self.countTrainFolds(kFoldCrossValidation, K, N)
+        test_folds = [kFoldCrossValidation.getTestFold(i) for i in range(K)]
+        if self.__worker_count == 1:
+            return [self.getFoldStatistics(train_counters[i], test_folds[i], N) for i in range(K)]
+        with ProcessPoolExecutor(max_workers=min(self.__worker_count, K)) as executor:
+            return list(executor.map(self.getFoldStatistics, train_counters, test_folds, [N] * K))
+
+    def countTrainFolds(self,
+                        kFoldCrossValidation: KFoldCrossValidation,
+                        K: int,
+                        N: int) -> list:
+        """
+        Counts the N-Grams of the train folds of a K-fold cross-validation. Instead of counting each train fold, which
+        would count every sentence K - 1 times, each test fold is counted once, the counts of all test folds are
+        merged into the counts of the whole corpus, and the counts of each train fold are found by subtracting the
+        counts of its test fold from them. A word is in the vocabulary of a train fold if it occurs in any other test
+        fold.
+
+        PARAMETERS
+        ----------
+        kFoldCrossValidation : KFoldCrossValidation
+            Cross-validation data.
+        K : int
+            number of folds.
+        N : int
+            N in N-Gram.
+
+        RETURNS
+        -------
+        list
+            K NGramCounters, the i'th one counting the i'th train fold.
+        """
+        test_counters = []
+        total = NGramCounter(N)
+        fold_count = Counter()
+        for i in range(K):
+            test_counters.append(NGramCounter(N, kFoldCrossValidation.getTestFold(i)))
+            total.merge(test_counters[i])
+            fold_count.update(test_counters[i].getVocabulary())
+        train_counters = []
+        for i in range(K):
+            words = {word for word in total.getVocabulary()
+                     if fold_count[word] > 1 or word not in test_counters[i].getVocabulary()}
+            train_counters.append(total.subtract(test_counters[i], words))
+        return train_counters
+
     def newLowerBound(self,
                       current: float,
                       currentLowerBound: float,
@@ -76,8 +438,8 @@ class TrainedSmoothing(SimpleSmoothing):
 
         PARAMETERS
         ----------
-        corpus : list
-            Train corpus used to optimize parameters of the smoothing method.
+        corpus
+            Train corpus, a list or any other iterable of sentences, used to optimize parameters of the smoothing method.
         nGram : NGram
             N-Gram for which the probabilities will be set.
         """
@@ -0,0 +1,133 @@
+from itertools import repeat
+
+
+class Vocabulary:
+
+    __word_to_index: dict
+    __words: list
+
+    def __init__(self, words=None):
+        """
+        Constructor of Vocabulary class. Every word is interned to a small integer index, the first word added gets
+        index 0, the second index 1, etc.
+
+        PARAMETERS
+        ----------
+        words
+            Optional iterable of words to be added in the given order.
+        """
+        self.__word_to_index = {}
+        self.__words = []
+        if words is not None:
+            for word in words:
+                self.addWord(word)
+
+    def addWord(self, word: str) -> int:
+        """
+        Adds given word to the vocabulary if it is not already there.
+
+        PARAMETERS
+        ----------
+        word : str
+            Word to be added.
+
+        RETURNS
+        -------
+        int
+            Index of the word.
+        """
+        index = self.__word_to_index.get(word)
+        if index is None:
+            index = len(self.__words)
+            self.__word_to_index[word] = index
+            self.__words.append(word)
+        return index
+
+    def addWords(self,
+                 words: list,
+                 dictionary: set = None) -> list:
+        """
+        Adds all words of the given sentence to the vocabulary and translates the sentence to a list of indexes. If a
+        dictionary is given, words not in the dictionary are not added, and are translated to -1.
+
+        PARAMETERS
+        ----------
+        words : list
+            Sentence to be added.
+        dictionary : set
+            Optional set of the words that can be added.
+
+        RETURNS
+        -------
+        list
+            Indexes of the words of the sentence.
+        """
+        if dictionary is None:
+            return [self.addWord(word) for word in words]
+        return [self.addWord(word) if word in dictionary else -1 for word in words]
+
+    def getIndex(self, word: str) -> int:
+        """
+        Gets the index of the given word.
+
+        PARAMETERS
+        ----------
+        word : str
+            Word whose index is searched.
+
+        RETURNS
+        -------
+        int
+            Index of the word, -1 if the word is not in the vocabulary.
+        """
+        return self.__word_to_index.get(word, -1)
+
+    def getIndexes(self, words) -> list:
+        """
+        Translates given sequence of words to their indexes. Words not in the vocabulary are translated to -1.
+
+        PARAMETERS
+        ----------
+        words
+            Sequence of words.
+
+        RETURNS
+        -------
+        list
+            Indexes of the words.
+        """
+        return list(map(self.__word_to_index.get, words, repeat(-1)))
+
+    def getWord(self, index: int) -> str:
+        """
+        Gets the word with the given index.
+
+        PARAMETERS
+        ----------
+        index : int
+            Index of the word.
+
+        RETURNS
+        -------
+        str
+            Word with the given index.
+        """
+        return self.__words[index]
+
+    def size(self) -> int:
+        """
+        RETURNS
+        -------
+        int
+            Number of words in the vocabulary.
+        """
+        return len(self.__words)
+
+    def __contains__(self, word) -> bool:
+        return word in self.__word_to_index
+
+    def __iter__(self):
+        return iter(self.__words)
+
+    def __len__(self) -> int:
+        return len(self.__words)
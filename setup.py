@@ -13,7 +13,7 @@ setup(
     author='olcaytaner',
     author_email='olcay.yildiz@ozyegin.edu.tr',
     description='NGram library',
-    install_requires=['NlpToolkit-DataStructure', 'NlpToolkit-Sampling'],
+    install_requires=['NlpToolkit-Sampling', 'numpy'],
     long_description=long_description,
     long_description_content_type='text/markdown'
 )
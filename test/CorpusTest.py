@@ -3,8 +3,7 @@ class CorpusTest:
     def readCorpus(self, fileName: str) -> list:
         corpus = []
         inputFile = open(fileName, "r")
-        lines = inputFile.readlines()
-        for line in lines:
+        for line in inputFile:
             words = line.split(" ")
             corpus.append(words)
         inputFile.close()
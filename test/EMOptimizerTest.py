@@ -0,0 +1,46 @@
+import unittest
+
+from NGram.AdditiveSmoothing import AdditiveSmoothing
+from NGram.EMOptimizer import EMOptimizer
+from NGram.InterpolatedSmoothing import InterpolatedSmoothing
+from NGram.NGram import NGram
+from test.CorpusTest import CorpusTest
+
+
+class EMOptimizerTest(CorpusTest, unittest.TestCase):
+
+    testCorpus: list
+    validationCorpus: list
+
+    def setUp(self) -> None:
+        self.testCorpus = self.readCorpus("../test.txt")
+        self.validationCorpus = self.readCorpus("../validation.txt")
+
+    def test_EMOptimizer(self):
+        corpus = self.validationCorpus[:2000]
+        gridSearch = InterpolatedSmoothing()
+        gridSearch.learnParameters(list(corpus), 3)
+        expectationMaximization = InterpolatedSmoothing()
+        expectationMaximization.setOptimizer(EMOptimizer())
+        expectationMaximization.learnParameters(list(corpus), 3)
+        self.assertLess(expectationMaximization.getOptimizer().getEvaluations(),
+                        gridSearch.getOptimizer().getEvaluations())
+        trigrams = []
+        for smoothing in (gridSearch, expectationMaximization):
+            trigram = NGram(3, corpus)
+            smoothing.setProbabilitiesGeneral(trigram)
+            lambdas = trigram.getLambdas()
+            self.assertTrue(0 < lambdas[0] and 0 < lambdas[1] and lambdas[0] + lambdas[1] < 1)
+            trigrams.append(trigram)
+        self.assertAlmostEqual(1.0, trigrams[1].getPerplexity(self.testCorpus[:2000]) /
+                               trigrams[0].getPerplexity(self.testCorpus[:2000]), 1)
+
+    def test_OnlyInterpolation(self):
+        additiveSmoothing = AdditiveSmoothing()
+        optimizer = additiveSmoothing.getOptimizer()
+        self.assertRaises(ValueError, additiveSmoothing.setOptimizer, EMOptimizer())
+        self.assertIs(optimizer, additiveSmoothing.getOptimizer())
+
+
+if __name__ == '__main__':
+    unittest.main()
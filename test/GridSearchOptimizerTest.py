@@ -0,0 +1,32 @@
+import unittest
+
+from NGram.AdditiveSmoothing import AdditiveSmoothing
+from test.CorpusTest import CorpusTest
+
+
+class GridSearchOptimizerTest(CorpusTest, unittest.TestCase):
+
+    validationCorpus: list
+
+    def setUp(self) -> None:
+        self.validationCorpus = self.readCorpus("../validation.txt")
+
+    def test_SampledTuning(self):
+        corpus = self.validationCorpus[:2000]
+        full = AdditiveSmoothing()
+        full.learnParameters(list(corpus), 2)
+        deltas = []
+        for i in range(2):
+            sampled = AdditiveSmoothing()
+            sampled.setSampling(0.2, 1)
+            self.assertEqual(0.2, sampled.getSampleFraction())
+            sampled.learnParameters(list(corpus), 2)
+            self.assertLess(sampled.getOptimizer().getEvaluations(), full.getOptimizer().getEvaluations())
+            self.assertLess(0, sampled.getOptimizer().getSampledEvaluations())
+            deltas.append(sampled.getDelta())
+        self.assertEqual(deltas[0], deltas[1])
+        self.assertEqual(0, full.getOptimizer().getSampledEvaluations())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
+import math
 import unittest
 
 from NGram.LaplaceSmoothing import LaplaceSmoothing
+from NGram.NGram import NGram
 from test.SimpleSmoothingTest import SimpleSmoothingTest
 
 
@@ -26,6 +28,20 @@ class LaplaceSmoothingTest(SimpleSmoothingTest, unittest.TestCase):
         self.assertAlmostEqual(24763.660225, self.complexBiGram.getPerplexity(self.testCorpus), 4)
         self.assertAlmostEqual(49579.187475, self.complexTriGram.getPerplexity(self.testCorpus), 4)
 
+    def test_PerplexityFourGram(self):
+        fourGram = NGram(4, self.simpleCorpus)
+        fourGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        total = 0
+        count = 0
+        for sentence in self.simpleCorpus:
+            for j in range(len(sentence) - 3):
+                total -= math.log((fourGram.getCount(sentence[j:j + 4]) + 1) /
+                                  (fourGram.getCount(sentence[j:j + 3]) + fourGram.vocabularySize() + 1))
+                count += 1
+        self.assertAlmostEqual(math.exp(total / count), fourGram.getPerplexity(self.simpleCorpus), 6)
+        fourGram.freeze()
+        self.assertAlmostEqual(math.exp(total / count), fourGram.getPerplexity(self.simpleCorpus), 6)
+
     def test_CalculateNGramProbabilitiesSimple(self):
         self.assertEqual((5 + 1) / (35 + self.simpleUniGram.vocabularySize() + 1), self.simpleUniGram.getProbability("<s>"))
         self.assertEqual((0 + 1) / (35 + self.simpleUniGram.vocabularySize() + 1), self.simpleUniGram.getProbability("mahmut"))
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from NGram.LazyNGramTree import LazyNGramTree
+from NGram.NGram import NGram
+from NGram.NGramBinaryFile import NGramBinaryFile
+from NGram.Vocabulary import Vocabulary
+
+
+class LazyNGramTreeTest(unittest.TestCase):
+
+    simpleBiGram: NGram
+    simpleTriGram: NGram
+    simpleCorpus: list
+
+    def setUp(self) -> None:
+        self.simpleCorpus = [["<s>", "ali", "topu", "at", "mehmet", "ayşeye", "gitti", "</s>"],
+                             ["<s>", "ali", "top", "at", "ayşe", "eve", "gitti", "</s>"],
+                             ["<s>", "ayşe", "kitabı", "ver", "</s>"],
+                             ["<s>", "ali", "topu", "mehmete", "at", "</s>"],
+                             ["<s>", "ali", "topu", "at", "mehmet", "ayşeyle", "gitti", "</s>"]]
+        self.simpleBiGram = NGram(2, self.simpleCorpus)
+        self.simpleTriGram = NGram(3, self.simpleCorpus)
+
+    def test_LoadLazy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.simpleBiGram.saveAsBinary(os.path.join(directory, "simple2.bin"))
+            self.simpleTriGram.saveAsBinary(os.path.join(directory, "simple3.bin"))
+            lazyBiGram = NGram(2)
+            lazyBiGram.initWithLazyFile(os.path.join(directory, "simple2.bin"), 2)
+            lazyTriGram = NGram(3)
+            lazyTriGram.initWithLazyFile(os.path.join(directory, "simple3.bin"), 2)
+            with lazyBiGram, lazyTriGram:
+                self.assertTrue(lazyTriGram.isFrozen())
+                self.assertRaises(ValueError, lazyTriGram.prune, 0.5)
+                self.assertEqual(4, lazyBiGram.getCount(["<s>", "ali"]))
+                self.assertEqual(0, lazyBiGram.getCount(["ayşe", "ali"]))
+                self.assertEqual(0, lazyBiGram.getCount(["mahmut", "ali"]))
+                self.assertEqual(2, lazyBiGram.getCount(["at", "mehmet"]))
+                self.assertEqual(1, lazyTriGram.getCount(["<s>", "ali", "top"]))
+                self.assertEqual(0, lazyTriGram.getCount(["ayşe", "kitabı", "at"]))
+                self.assertEqual(0, lazyTriGram.getCount(["ayşe", "topu", "at"]))
+                self.assertEqual(0, lazyTriGram.getCount(["mahmut", "evde", "kal"]))
+                self.assertEqual(2, lazyTriGram.getCount(["ali", "topu", "at"]))
+            self.assertRaises(ValueError, lazyTriGram.getCount, ["topu", "at", "mehmet"])
+
+    def test_Eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "simple3.bin")
+            self.simpleTriGram.saveAsBinary(fileName)
+            binaryFile = NGramBinaryFile(fileName)
+            N, lambdas, probabilityOfUnseen, words, layout = binaryFile.readHeader()
+            vocabulary = Vocabulary(words)
+            tree = LazyNGramTree(binaryFile, layout, 2)
+            self.assertLess(2, len(words))
+            self.assertEqual(0, tree.residentSubtrees())
+            self.assertEqual(1, tree.getCountForListItem(vocabulary.getIndexes(["<s>", "ali", "top"]), 0))
+            self.assertEqual(2, tree.getCountForListItem(vocabulary.getIndexes(["ali", "topu", "at"]), 0))
+            self.assertEqual(2, tree.getCountForListItem(vocabulary.getIndexes(["topu", "at", "mehmet"]), 0))
+            self.assertEqual(2, tree.residentSubtrees())
+            self.assertEqual(3, tree.subtreeLoads())
+            self.assertEqual(2, tree.getCountForListItem(vocabulary.getIndexes(["topu", "at", "mehmet"]), 0))
+            self.assertEqual(3, tree.subtreeLoads())
+            self.assertEqual(1, tree.getCountForListItem(vocabulary.getIndexes(["<s>", "ali", "top"]), 0))
+            self.assertEqual(4, tree.subtreeLoads())
+            self.assertEqual(2, tree.residentSubtrees())
+            tree.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import math
+import unittest
+
+from NGram.LaplaceSmoothing import LaplaceSmoothing
+from NGram.LossyNGramCounter import LossyNGramCounter
+from NGram.NGram import NGram
+from NGram.NGramCounter import NGramCounter
+from test.CorpusTest import CorpusTest
+
+
+class LossyNGramCounterTest(CorpusTest, unittest.TestCase):
+
+    trainCorpus: list
+    testCorpus: list
+
+    def setUp(self) -> None:
+        self.trainCorpus = self.readCorpus("../train.txt")
+        self.testCorpus = self.readCorpus("../test.txt")
+
+    def test_ExactWithinBudget(self):
+        exact = NGramCounter(2, self.trainCorpus)
+        lossy = LossyNGramCounter(2, 10000000, self.trainCorpus)
+        self.assertEqual(0, lossy.getErrorBound())
+        self.assertEqual(exact.getCounts(), lossy.getCounts())
+
+    def test_ErrorBound(self):
+        exact = NGramCounter(2, self.trainCorpus)
+        lossy = LossyNGramCounter(2, 20000, self.trainCorpus)
+        self.assertEqual(list(exact.getVocabulary()), list(lossy.getVocabulary()))
+        self.assertEqual(sum(exact.getCounts().values()), lossy.getTotal())
+        bound = lossy.getErrorBound()
+        self.assertGreater(bound, 0)
+        counts = lossy.getCounts()
+        for ngram, count in exact.getCounts().items():
+            if ngram in counts:
+                self.assertTrue(counts[ngram] <= count <= counts[ngram] + bound)
+            else:
+                self.assertLessEqual(count, bound)
+
+    def test_Budget(self):
+        lossy = LossyNGramCounter(3, 5000)
+        pruned = False
+        for sentence in self.trainCorpus[:5000]:
+            bound = lossy.getErrorBound()
+            lossy.addSentence(sentence)
+            self.assertLessEqual(lossy.size(), 5000)
+            pruned = pruned or lossy.getErrorBound() > bound
+        self.assertTrue(pruned)
+
+    def test_NGram(self):
+        lossy = LossyNGramCounter(2, 20000, self.trainCorpus)
+        counts = lossy.getCounts()
+        lossyBiGram = NGram(2)
+        lossyBiGram.addNGramCounter(lossy)
+        vocabulary = list(lossy.getVocabulary())
+        for ngram, count in counts.most_common(10):
+            self.assertEqual(count, lossyBiGram.getCount([vocabulary[index] for index in ngram]))
+        lossyBiGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        self.assertTrue(math.isfinite(lossyBiGram.getPerplexity(self.testCorpus[:1000])))
+
+
+if __name__ == '__main__':
+    unittest.main()
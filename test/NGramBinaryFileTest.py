@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from NGram.NGram import NGram
+from NGram.NGramBinaryFile import NGramBinaryFile
+
+
+class NGramBinaryFileTest(unittest.TestCase):
+
+    simpleUniGram: NGram
+    simpleBiGram: NGram
+    simpleCorpus: list
+
+    def setUp(self) -> None:
+        self.simpleCorpus = [["<s>", "ali", "topu", "at", "mehmet", "ayşeye", "gitti", "</s>"],
+                             ["<s>", "ali", "top", "at", "ayşe", "eve", "gitti", "</s>"],
+                             ["<s>", "ayşe", "kitabı", "ver", "</s>"],
+                             ["<s>", "ali", "topu", "mehmete", "at", "</s>"],
+                             ["<s>", "ali", "topu", "at", "mehmet", "ayşeyle", "gitti", "</s>"]]
+        self.simpleUniGram = NGram(1, self.simpleCorpus)
+        self.simpleBiGram = NGram(2, self.simpleCorpus)
+
+    def test_SaveAsBinary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertFalse(NGramBinaryFile("simple3.txt").isBinary())
+            self.simpleUniGram.saveAsBinary(os.path.join(directory, "simple1.bin"))
+            self.simpleBiGram.saveAsBinary(os.path.join(directory, "simple2.bin"))
+            NGramBinaryFile(os.path.join(directory, "simple3.bin")).convertTextFile("simple3.txt")
+            self.assertTrue(NGramBinaryFile(os.path.join(directory, "simple3.bin")).isBinary())
+            uniGram = NGram(os.path.join(directory, "simple1.bin"))
+            biGram = NGram(os.path.join(directory, "simple2.bin"))
+            triGram = NGram(os.path.join(directory, "simple3.bin"))
+            self.assertTrue(triGram.isFrozen())
+            self.assertEqual(15, uniGram.vocabularySize())
+            self.assertEqual(5, uniGram.getCount(["<s>"]))
+            self.assertEqual(0, uniGram.getCount(["mahmut"]))
+            self.assertEqual(1, uniGram.getCount(["kitabı"]))
+            self.assertEqual(4, biGram.getCount(["<s>", "ali"]))
+            self.assertEqual(0, biGram.getCount(["ayşe", "ali"]))
+            self.assertEqual(2, biGram.getCount(["at", "mehmet"]))
+            self.assertEqual(1, triGram.getCount(["<s>", "ali", "top"]))
+            self.assertEqual(0, triGram.getCount(["ayşe", "topu", "at"]))
+            self.assertEqual(0, triGram.getCount(["mahmut", "evde", "kal"]))
+            self.assertEqual(2, triGram.getCount(["ali", "topu", "at"]))
+            self.assertRaises(ValueError, triGram.addNGram, ["ali", "topu", "at"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,21 @@
+import math
+import os
+import shutil
+import tempfile
 import unittest
 
+from Sampling.KFoldCrossValidation import KFoldCrossValidation
+
+from NGram.AdditiveSmoothing import AdditiveSmoothing
+from NGram.CorpusFile import CorpusFile
+from NGram.GoodTuringSmoothing import GoodTuringSmoothing
+from NGram.LaplaceSmoothing import LaplaceSmoothing
 from NGram.NGram import NGram
+from NGram.NGramCounter import NGramCounter
+from NGram.NoSmoothing import NoSmoothing
+from NGram.NoSmoothingWithDictionary import NoSmoothingWithDictionary
+from NGram.NoSmoothingWithNonRareWords import NoSmoothingWithNonRareWords
+from NGram.ParallelNGramTrainer import ParallelNGramTrainer
 from test.CorpusTest import CorpusTest
 
 
@@ -55,6 +70,12 @@ class NGramTest(CorpusTest, unittest.TestCase):
         self.assertEqual(1, self.complexTriGram.getCount(["<s>", "mustafa", "kemal"]), 0.0)
         self.assertEqual(1, self.complexTriGram.getCount(["mustafa", "kemal", "atatürk"]), 0.0)
 
+    def test_GenerateNextString(self):
+        self.simpleTriGram.calculateNGramProbabilitiesSimple(NoSmoothing())
+        self.assertEqual("at", self.simpleTriGram.generateNextString(["topu", "mehmete"]))
+        for i in range(10):
+            self.assertIn(self.simpleTriGram.generateNextString(["ali", "topu"]), {"at", "mehmete"})
+
     def test_VocabularySizeSimple(self):
         self.assertEqual(15, self.simpleUniGram.vocabularySize())
 
@@ -95,6 +116,202 @@ class NGramTest(CorpusTest, unittest.TestCase):
         self.simpleBiGram.saveAsText("simple2.txt")
         self.simpleTriGram.saveAsText("simple3.txt")
 
+    def test_AddNGramSentence(self):
+        self.simpleUniGram = NGram(1)
+        self.simpleBiGram = NGram(2)
+        self.simpleTriGram = NGram(3)
+        for sentence in self.simpleCorpus:
+            self.simpleUniGram.addNGramSentence(sentence)
+            self.simpleBiGram.addNGramSentence(sentence)
+            self.simpleTriGram.addNGramSentence(sentence)
+        self.test_GetCountSimple()
+        self.test_VocabularySizeSimple()
+
+    def test_AddCorpusFile(self):
+        self.complexTriGram = NGram(3)
+        self.complexTriGram.addCorpusFile("../train.txt")
+        self.assertEqual(57625, self.complexTriGram.vocabularySize())
+        self.assertEqual(1, self.complexTriGram.getCount(["<s>", "mustafa", "kemal"]))
+        self.assertEqual(1, self.complexTriGram.getCount(["mustafa", "kemal", "atatürk"]))
+        self.complexBiGram = NGram(2, CorpusFile("../train.txt"))
+        self.assertEqual(11, self.complexBiGram.getCount(["<s>", "mustafa"]))
+        self.assertEqual(3, self.complexBiGram.getCount(["mustafa", "kemal"]))
+
+    def test_ParallelTrainer(self):
+        trainer = ParallelNGramTrainer(2)
+        self.simpleUniGram = trainer.train(1, self.simpleCorpus)
+        self.simpleBiGram = trainer.train(2, self.simpleCorpus)
+        self.simpleTriGram = trainer.train(3, self.simpleCorpus)
+        self.test_GetCountSimple()
+        self.test_VocabularySizeSimple()
+
+    def test_Freeze(self):
+        self.simpleUniGram.freeze()
+        self.simpleBiGram.freeze()
+        self.simpleTriGram.freeze()
+        self.assertTrue(self.simpleTriGram.isFrozen())
+        self.test_GetCountSimple()
+        counts = [self.complexTriGram.getCount(["<s>"]), self.complexTriGram.getCount(["<s>", "mustafa"])]
+        self.complexTriGram.freeze()
+        self.assertEqual(1, self.complexTriGram.getCount(["<s>", "mustafa", "kemal"]))
+        self.assertEqual(1, self.complexTriGram.getCount(["mustafa", "kemal", "atatürk"]))
+        self.assertEqual(counts, [self.complexTriGram.getCount(["<s>"]),
+                                  self.complexTriGram.getCount(["<s>", "mustafa"])])
+        self.assertRaises(ValueError, self.simpleTriGram.addNGramSentence, ["<s>", "ali", "topu", "at", "</s>"])
+        self.assertRaises(ValueError, self.simpleTriGram.addNGram, ["ali", "topu", "at"])
+        self.assertRaises(ValueError, self.simpleTriGram.merge, NGram(3, self.simpleCorpus))
+        self.assertRaises(ValueError, NGram(3, self.simpleCorpus).merge, self.simpleTriGram)
+        self.assertRaises(ValueError, self.simpleTriGram.prune, 0.5)
+        self.assertRaises(ValueError, self.simpleTriGram.getCountsOfCounts, 2)
+        self.assertRaises(ValueError, self.simpleTriGram.replaceUnknownWords, {"ali"})
+        self.assertRaises(ValueError, self.simpleTriGram.setProbabilityWithPseudoCount, 1.0, 3)
+        self.assertRaises(ValueError, self.simpleTriGram.calculateNGramProbabilitiesSimple, LaplaceSmoothing())
+        self.test_GetCountSimple()
+
+    def test_SaveAsTextVocabularyOrder(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "simple3.txt")
+            self.simpleTriGram.saveAsText(fileName)
+            loaded = NGram(fileName)
+        self.assertEqual(list(self.simpleTriGram.getVocabulary()), list(loaded.getVocabulary()))
+        self.assertEqual("<s>", loaded.getVocabulary().getWord(0))
+        self.assertEqual(2, loaded.getCount(["ali", "topu", "at"]))
+        self.assertEqual(0, loaded.getCount(["mahmut", "evde", "kal"]))
+
+    def test_InterpolatedFourGram(self):
+        fourGram = NGram(4, self.simpleCorpus)
+        fourGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        components = [fourGram.getProbability("ali", "topu", "at", "mehmet"),
+                      fourGram.getProbability("topu", "at", "mehmet"),
+                      fourGram.getProbability("at", "mehmet"),
+                      fourGram.getProbability("mehmet")]
+        fourGram.setLambdas([0.4, 0.3, 0.2])
+        self.assertEqual([0.4, 0.3, 0.2], fourGram.getLambdas())
+        expected = 0.4 * components[0] + 0.3 * components[1] + 0.2 * components[2] + \
+                   (1 - 0.4 - 0.3 - 0.2) * components[3]
+        self.assertAlmostEqual(expected, fourGram.getProbability("ali", "topu", "at", "mehmet"), 12)
+        self.assertAlmostEqual(expected, fourGram.getProbabilities([("ali", "topu", "at", "mehmet")])[0], 12)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        fourGram.saveAsText(os.path.join(directory, "simple4.txt"))
+        fourGram.saveAsBinary(os.path.join(directory, "simple4.bin"))
+        fourGram.freeze()
+        self.assertAlmostEqual(expected, fourGram.getProbability("ali", "topu", "at", "mehmet"), 12)
+        for fileName in ("simple4.txt", "simple4.bin"):
+            loaded = NGram(os.path.join(directory, fileName))
+            self.assertEqual([0.4, 0.3, 0.2], loaded.getLambdas())
+            loaded.setLambdas(loaded.getLambdas())
+            self.assertAlmostEqual(expected, loaded.getProbability("ali", "topu", "at", "mehmet"), 12)
+        lazy = NGram(4)
+        lazy.initWithLazyFile(os.path.join(directory, "simple4.bin"))
+        with lazy:
+            lazy.setLambdas(lazy.getLambdas())
+            self.assertAlmostEqual(expected, lazy.getProbability("ali", "topu", "at", "mehmet"), 12)
+
+    def test_ComponentProbabilities(self):
+        self.simpleTriGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        components = self.simpleTriGram.getComponentProbabilities(self.simpleCorpus)
+        self.assertEqual((25, 3), components.shape)
+        self.assertAlmostEqual(self.simpleTriGram.getProbability("<s>", "ali", "topu"), components[0][0], 12)
+        self.assertAlmostEqual(self.simpleTriGram.getProbability("ali", "topu"), components[0][1], 12)
+        self.assertAlmostEqual(self.simpleTriGram.getProbability("topu"), components[0][2], 12)
+        self.simpleTriGram.setLambda3(0.5, 0.3)
+        perplexity = math.exp(-sum(math.log(0.5 * row[0] + 0.3 * row[1] + 0.2 * row[2]) for row in components)
+                              / len(components))
+        self.assertAlmostEqual(self.simpleTriGram.getPerplexity(self.simpleCorpus), perplexity, 9)
+
+    def test_CountStatistics(self):
+        corpus = self.simpleCorpus + [["<s>", "mahmut", "topu", "at", "</s>"]]
+        counts, childSums = self.simpleBiGram.getCountStatistics(corpus)
+        self.assertEqual([4, 3, 2, 2, 1, 1], counts[:6].tolist())
+        self.assertEqual([5, 4, 3, 4, 2, 1], childSums[:6].tolist())
+        self.assertTrue(math.isnan(childSums[-3]))
+        self.simpleBiGram.setProbabilityWithPseudoCount(0.5, 2)
+        vocabularySize = self.simpleBiGram.vocabularySize() + 1
+        perplexity = math.exp(-sum(math.log(1.0 / vocabularySize if math.isnan(childSum) else
+                                            (count + 0.5) / (childSum + 0.5 * vocabularySize))
+                                   for count, childSum in zip(counts, childSums)) / len(counts))
+        self.assertAlmostEqual(self.simpleBiGram.getPerplexity(corpus), perplexity, 9)
+
+    def test_CountTrainFolds(self):
+        corpus = self.simpleCorpus + [["<s>", "mahmut", "topu", "at", "</s>"]]
+        kFoldCrossValidation = KFoldCrossValidation(corpus, 3, 0)
+        trainCounters = AdditiveSmoothing().countTrainFolds(kFoldCrossValidation, 3, 3)
+        for i in range(3):
+            trainFold = kFoldCrossValidation.getTrainFold(i)
+            expected = NGram(3, trainFold)
+            nGram = NGram(3)
+            nGram.addNGramCounter(trainCounters[i])
+            self.assertEqual(expected.vocabularySize(), nGram.vocabularySize())
+            for sentence in corpus:
+                for j in range(len(sentence) - 2):
+                    self.assertEqual(expected.getCount(sentence[j:j + 3]), nGram.getCount(sentence[j:j + 3]))
+
+    def test_ParallelTuning(self):
+        corpus = self.validationCorpus[:2000]
+        serial = AdditiveSmoothing()
+        serial.learnParameters(list(corpus), 2)
+        parallel = AdditiveSmoothing()
+        parallel.setWorkerCount(2)
+        self.assertEqual(2, parallel.getWorkerCount())
+        parallel.learnParameters(list(corpus), 2)
+        self.assertEqual(serial.getDelta(), parallel.getDelta())
+
+    def test_Advance(self):
+        self.simpleTriGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        self.simpleTriGram.setLambda3(0.5, 0.3)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.simpleTriGram.saveAsBinary(os.path.join(directory, "simple3.bin"))
+        lazyTriGram = NGram(3)
+        lazyTriGram.initWithLazyFile(os.path.join(directory, "simple3.bin"))
+        self.addCleanup(lazyTriGram.close)
+        lazyTriGram.setLambda3(0.5, 0.3)
+        for nGram in (self.simpleTriGram, self.simpleTriGram, lazyTriGram):
+            for sentence in self.simpleCorpus + [["<s>", "mahmut", "topu", "at", "</s>"]]:
+                state = nGram.getInitialState()
+                for i in range(len(sentence)):
+                    logProbability, state = nGram.advance(state, sentence[i])
+                    probability = nGram.getProbability(*sentence[max(0, i - 2):i + 1])
+                    self.assertEqual(math.log(probability) if probability > 0 else -math.inf, logProbability)
+            self.simpleTriGram.freeze()
+        self.assertEqual(self.simpleTriGram.getInitialState("<s>", "ali"),
+                         self.simpleTriGram.getInitialState("ayşe", "<s>", "ali"))
+        self.assertEqual(1, len({self.simpleTriGram.getInitialState("topu", "at"),
+                                 self.simpleTriGram.advance(self.simpleTriGram.getInitialState("ali", "topu"), "at")[1]}))
+
+    def test_ContextCache(self):
+        self.simpleTriGram.calculateNGramProbabilitiesSimple(LaplaceSmoothing())
+        self.simpleTriGram.setLambda3(0.5, 0.3)
+        trigrams = [sentence[i:i + 3] for sentence in self.simpleCorpus for i in range(len(sentence) - 2)]
+        expected = [self.simpleTriGram.getProbability(*trigram) for trigram in trigrams]
+        self.simpleTriGram.setContextCacheSize(4)
+        for i in range(2):
+            self.assertEqual(expected, [self.simpleTriGram.getProbability(*trigram) for trigram in trigrams])
+        cache = self.simpleTriGram.getContextCache()
+        self.assertEqual(2 * len(trigrams), cache.getHits() + cache.getMisses())
+        self.assertTrue(cache.getHits() > 0)
+        self.assertEqual(4, cache.size())
+        self.simpleTriGram.calculateNGramProbabilitiesSimple(GoodTuringSmoothing())
+        self.assertEqual(0, cache.size())
+        self.simpleTriGram.setContextCacheSize(0)
+        expected = [self.simpleTriGram.getProbability(*trigram) for trigram in trigrams]
+        self.simpleTriGram.setContextCacheSize(4)
+        self.assertEqual(expected, [self.simpleTriGram.getProbability(*trigram) for trigram in trigrams])
+        self.simpleTriGram.freeze()
+        self.assertEqual(0, self.simpleTriGram.getContextCache().size())
+        self.assertEqual(expected, [self.simpleTriGram.getProbability(*trigram) for trigram in trigrams])
+
+    def test_ContextCacheSetN(self):
+        self.simpleTriGram.setProbabilityWithPseudoCounts([1, 1, 1])
+        self.simpleTriGram.setLambdas([0.2, 0.3])
+        self.simpleTriGram.setContextCacheSize(100)
+        self.simpleTriGram.getProbability("ali", "topu")
+        self.simpleTriGram.setN(2)
+        cached = self.simpleTriGram.getProbability("ali", "topu")
+        self.simpleTriGram.setContextCacheSize(0)
+        self.assertEqual(self.simpleTriGram.getProbability("ali", "topu"), cached)
+
     def test_Merge(self):
         self.simpleUniGram = NGram("simple1a.txt")
         self.simpleUniGram.merge(NGram("simple1b.txt"))
@@ -109,6 +326,94 @@ class NGramTest(CorpusTest, unittest.TestCase):
         self.simpleTriGram.merge(NGram("simple3c.txt"))
         self.assertEqual(20, self.simpleTriGram.vocabularySize())
 
+    def traverseCountsOfCounts(self, nGram: NGram, height: int) -> dict:
+        counts_of_counts = [0] * (nGram.rootNode.maximumOccurence(height) + 1)
+        nGram.rootNode.updateCountsOfCounts(counts_of_counts, height)
+        return {count: number for count, number in enumerate(counts_of_counts) if number != 0}
+
+    def test_CountsOfCounts(self):
+        self.simpleTriGram = NGram(3)
+        for sentence in self.simpleCorpus:
+            self.simpleTriGram.addNGramSentence(sentence)
+        for level in range(1, 4):
+            self.assertEqual(self.traverseCountsOfCounts(self.simpleTriGram, level),
+                             self.simpleTriGram.getCountsOfCounts(level))
+        self.assertEqual({1: 6, 2: 2, 3: 2, 4: 1, 5: 1}, self.simpleTriGram.getCountsOfCounts(1))
+        self.assertEqual([0, 6, 2, 2, 1, 1, 0], self.simpleTriGram.calculateCountsOfCounts(1))
+        merged = NGram("simple3a.txt")
+        merged.merge(NGram("simple3b.txt"))
+        merged.merge(NGram("simple3c.txt"))
+        for level in range(1, 4):
+            self.assertEqual(self.traverseCountsOfCounts(merged, level), merged.getCountsOfCounts(level))
+        for level in range(1, 3):
+            self.assertEqual(self.traverseCountsOfCounts(self.complexBiGram, level),
+                             self.complexBiGram.getCountsOfCounts(level))
+        self.complexBiGram.replaceUnknownWords(self.complexBiGram.constructDictionaryWithNonRareWords(1, 0.0001))
+        self.assertEqual(self.traverseCountsOfCounts(self.complexBiGram, 2), self.complexBiGram.getCountsOfCounts(2))
+
+    def test_SetN(self):
+        self.simpleTriGram.setN(2)
+        self.assertEqual(self.traverseCountsOfCounts(self.simpleTriGram, 2), self.simpleTriGram.getCountsOfCounts(2))
+        self.assertRaises(ValueError, self.simpleTriGram.getCountsOfCounts, 3)
+        self.assertRaises(ValueError, self.simpleTriGram.getCountsOfCounts, 0)
+        self.simpleBiGram.setN(3)
+        self.assertEqual(self.traverseCountsOfCounts(self.simpleBiGram, 2), self.simpleBiGram.getCountsOfCounts(2))
+        self.assertEqual({}, self.simpleBiGram.getCountsOfCounts(3))
+        self.simpleBiGram.setProbabilityWithPseudoCount(1.0, 3)
+        self.assertAlmostEqual(1.0 / 16, self.simpleBiGram.getProbability("ali", "topu", "at"), 12)
+        self.simpleBiGram.setProbabilityWithPseudoCount(1.0, 2)
+        self.assertAlmostEqual((3 + 1.0) / (4 + 16), self.simpleBiGram.getProbability("ali", "topu"), 12)
+
+    def test_SmoothingLevels(self):
+        for simpleSmoothing in [LaplaceSmoothing(), GoodTuringSmoothing()]:
+            byLevel = NGram(3, self.trainCorpus)
+            for level in [2, 3, 1]:
+                byLevel.calculateNGramProbabilitiesSimpleLevel(simpleSmoothing, level)
+            self.complexTriGram.calculateNGramProbabilitiesSimpleLevels(simpleSmoothing, [2, 3, 1])
+            self.assertEqual(byLevel.getComponentProbabilities(self.testCorpus[:1000]).tolist(),
+                             self.complexTriGram.getComponentProbabilities(self.testCorpus[:1000]).tolist())
+
+    def test_ReplaceUnknownWords(self):
+        dictionary = {"<s>", "</s>", "ali", "topu", "top", "at", "mehmet", "ayşe", "eve", "gitti", "kitabı", "ver",
+                      "mehmete"}
+        self.simpleTriGram.replaceUnknownWords(dictionary)
+        unknown = self.simpleTriGram.rootNode.getUnknown()
+        self.assertEqual(2, unknown.getCount())
+        self.assertEqual([2], [child.getCount() for child in unknown.getChildren()])
+        self.assertEqual([2], [child.getCount() for child in unknown.getChildren()[0].getChildren()])
+
+    def test_NonRareWords(self):
+        threePass = NGram(2, self.trainCorpus)
+        threePass.replaceUnknownWords(threePass.constructDictionaryWithNonRareWords(2, 0.00001))
+        threePass.calculateNGramProbabilitiesSimpleLevel(NoSmoothing(), 2)
+        self.complexBiGram.calculateNGramProbabilitiesSimpleLevel(NoSmoothingWithNonRareWords(0.00001), 2)
+        self.assertEqual(threePass.getComponentProbabilities(self.testCorpus[:1000]).tolist(),
+                         self.complexBiGram.getComponentProbabilities(self.testCorpus[:1000]).tolist())
+
+    def test_ClosedVocabulary(self):
+        dictionary = NGramCounter.constructDictionaryWithMinimumFrequency(self.simpleCorpus, 2)
+        self.assertEqual({"<s>", "</s>", "ali", "topu", "at", "mehmet", "ayşe", "gitti"}, dictionary)
+        self.simpleTriGram.replaceUnknownWords(dictionary)
+        closedTriGram = NGram(3, self.simpleCorpus, minimumFrequency=2)
+        self.assertEqual(8, closedTriGram.vocabularySize())
+        self.assertEqual(self.simpleTriGram.rootNode.getUnknown().getCount(),
+                         closedTriGram.rootNode.getUnknown().getCount())
+        self.assertEqual(2, closedTriGram.getCount(["ali", "topu", "at"]))
+        sentenceTriGram = NGram(3, dictionary=dictionary)
+        for sentence in self.simpleCorpus:
+            sentenceTriGram.addNGramSentence(sentence)
+        sentenceTriGram.merge(closedTriGram)
+        self.assertEqual(4, sentenceTriGram.getCount(["ali", "topu", "at"]))
+        self.assertEqual(2 * closedTriGram.rootNode.getUnknown().getCount(),
+                         sentenceTriGram.rootNode.getUnknown().getCount())
+        self.assertEqual(sentenceTriGram.getCountsOfCounts(2), self.traverseCountsOfCounts(sentenceTriGram, 2))
+        dictionary = NGramCounter.constructDictionaryWithMinimumFrequency(self.trainCorpus, 3)
+        self.complexBiGram.calculateNGramProbabilitiesSimpleLevel(NoSmoothingWithDictionary(dictionary), 2)
+        closedBiGram = NGram(2, self.trainCorpus, dictionary)
+        closedBiGram.calculateNGramProbabilitiesSimpleLevel(NoSmoothing(), 2)
+        self.assertEqual(self.complexBiGram.getComponentProbabilities(self.testCorpus[:1000]).tolist(),
+                         closedBiGram.getComponentProbabilities(self.testCorpus[:1000]).tolist())
+
     def test_LoadMultiPart(self):
         self.simpleUniGram = NGram(1)
         self.simpleUniGram.initWithMultipleFile("simple1part1.txt", "simple1part2.txt")
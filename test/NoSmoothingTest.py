@@ -1,5 +1,7 @@
 import unittest
 
+from NGram.CorpusFile import CorpusFile
+from NGram.NGram import NGram
 from NGram.NoSmoothing import NoSmoothing
 from test.SimpleSmoothingTest import SimpleSmoothingTest
 
@@ -26,6 +28,31 @@ class NoSmoothingTest(SimpleSmoothingTest, unittest.TestCase):
         self.assertAlmostEqual(32.362912, self.complexBiGram.getPerplexity(self.trainCorpus), 4)
         self.assertAlmostEqual(2.025259, self.complexTriGram.getPerplexity(self.trainCorpus), 4)
 
+    def test_PerplexityCorpusFile(self):
+        self.complexBiGram = NGram(2, CorpusFile("../train.txt"))
+        self.complexBiGram.calculateNGramProbabilitiesSimple(NoSmoothing())
+        self.assertAlmostEqual(32.362912, self.complexBiGram.getPerplexity(CorpusFile("../train.txt")), 4)
+
+    def test_GetProbabilitiesSimple(self):
+        bigrams = [("<s>", "ali"), ("ayşe", "ali"), ("mahmut", "ali"), ("at", "mehmet")]
+        trigrams = [("<s>", "ali", "top"), ("ayşe", "kitabı", "at"), ("mahmut", "evde", "kal"), ("ali", "topu", "at")]
+        for i in range(2):
+            self.assertEqual([self.simpleBiGram.getProbability(*bigram) for bigram in bigrams],
+                             list(self.simpleBiGram.getProbabilities(bigrams)))
+            self.assertEqual([self.simpleTriGram.getProbability(*trigram) for trigram in trigrams],
+                             list(self.simpleTriGram.getProbabilities(trigrams)))
+            self.assertEqual([self.simpleTriGram.getProbability(*trigram[1:]) for trigram in trigrams],
+                             list(self.simpleTriGram.getProbabilities([trigram[1:] for trigram in trigrams])))
+            self.simpleBiGram.freeze()
+            self.simpleTriGram.freeze()
+
+    def test_FrozenProbabilitiesSimple(self):
+        self.simpleUniGram.freeze()
+        self.simpleBiGram.freeze()
+        self.simpleTriGram.freeze()
+        self.test_PerplexitySimple()
+        self.test_CalculateNGramProbabilitiesSimple()
+
     def test_CalculateNGramProbabilitiesSimple(self):
         self.assertEqual(5 / 35.0, self.simpleUniGram.getProbability("<s>"))
         self.assertEqual(0.0, self.simpleUniGram.getProbability("mahmut"))
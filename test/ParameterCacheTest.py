@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+from NGram.AdditiveSmoothing import AdditiveSmoothing
+from NGram.GridSearchOptimizer import GridSearchOptimizer
+from NGram.InterpolatedSmoothing import InterpolatedSmoothing
+from NGram.ParameterCache import ParameterCache
+from test.CorpusTest import CorpusTest
+
+
+class BoundsRecorder(GridSearchOptimizer):
+
+    lowerBounds: list
+    upperBounds: list
+
+    def optimize(self,
+                 smoothing,
+                 statistics: list,
+                 lowerBounds: list,
+                 upperBounds: list,
+                 sampledStatistics: list = None) -> list:
+        self.lowerBounds = lowerBounds
+        self.upperBounds = upperBounds
+        return super().optimize(smoothing, statistics, lowerBounds, upperBounds, sampledStatistics)
+
+
+class ParameterCacheTest(CorpusTest, unittest.TestCase):
+
+    validationCorpus: list
+
+    def setUp(self) -> None:
+        self.validationCorpus = self.readCorpus("../validation.txt")
+
+    def test_Fingerprint(self):
+        corpus = [["<s>", "ali", "topu", "at", "</s>"], ["<s>", "ayşe", "gitti", "</s>"]]
+        copy = [list(sentence) for sentence in corpus]
+        self.assertEqual(ParameterCache.fingerprint(corpus), ParameterCache.fingerprint(copy))
+        self.assertEqual(9, ParameterCache.fingerprint(corpus)[1])
+        self.assertNotEqual(ParameterCache.fingerprint([["a b"]])[0], ParameterCache.fingerprint([["a", "b"]])[0])
+        self.assertNotEqual(ParameterCache.fingerprint([["a"], ["b"]])[0], ParameterCache.fingerprint([["a", "b"]])[0])
+        self.assertNotEqual(ParameterCache.fingerprint(corpus)[0], ParameterCache.fingerprint(corpus[::-1])[0])
+
+    def test_SameList(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "parameters.txt")
+            corpus = self.validationCorpus[:2000]
+            original = list(corpus)
+            learned = AdditiveSmoothing()
+            learned.setParameterCache(fileName)
+            learned.learnParameters(corpus, 2)
+            self.assertEqual(original, corpus)
+            cached = AdditiveSmoothing()
+            cached.setParameterCache(fileName)
+            cached.learnParameters(corpus, 2)
+            self.assertEqual(0, cached.getOptimizer().getEvaluations())
+            self.assertEqual(learned.getDelta(), cached.getDelta())
+
+    def test_ParameterCache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "parameters.txt")
+            corpus = self.validationCorpus[:2000]
+            learned = AdditiveSmoothing()
+            learned.setParameterCache(fileName)
+            learned.learnParameters(list(corpus), 2)
+            self.assertLess(0, learned.getOptimizer().getEvaluations())
+            cached = AdditiveSmoothing()
+            cached.setParameterCache(fileName)
+            cached.learnParameters(list(corpus), 2)
+            self.assertEqual(0, cached.getOptimizer().getEvaluations())
+            self.assertEqual(learned.getDelta(), cached.getDelta())
+            reordered = AdditiveSmoothing()
+            reordered.setParameterCache(fileName)
+            reordered.learnParameters(list(reversed(corpus)), 2)
+            self.assertLess(0, reordered.getOptimizer().getEvaluations())
+            warmStarted = AdditiveSmoothing()
+            warmStarted.setParameterCache(fileName, True)
+            warmStarted.learnParameters(list(corpus[:1950]), 2)
+            self.assertLess(0, warmStarted.getOptimizer().getEvaluations())
+            cached = AdditiveSmoothing()
+            cached.setParameterCache(fileName)
+            cached.learnParameters(list(corpus[:1950]), 2)
+            self.assertEqual(0, cached.getOptimizer().getEvaluations())
+            self.assertEqual(warmStarted.getDelta(), cached.getDelta())
+
+
+    def test_WarmStartBounds(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "parameters.txt")
+            corpus = self.validationCorpus[:2000]
+            warmStarted = InterpolatedSmoothing()
+            warmStarted.setOptimizer(BoundsRecorder())
+            fingerprint, wordCount = ParameterCache.fingerprint(corpus)
+            ParameterCache(fileName).put(2, warmStarted.getConfiguration(), "0" * 32, wordCount, [0.15])
+            warmStarted.setParameterCache(fileName, True)
+            warmStarted.learnParameters(corpus, 2)
+            self.assertEqual([0.1], warmStarted.getOptimizer().lowerBounds)
+            self.assertEqual([0.3], warmStarted.getOptimizer().upperBounds)
+
+
+if __name__ == '__main__':
+    unittest.main()